@@ -0,0 +1,145 @@
+"""Benchmark concurrent interview submissions against a SQLite database.
+
+Each simulated flow writes its session once per answered question, as the
+interview views do, then creates its InterviewResult. Flows run on separate
+threads, each with its own connection, against a fresh database file.
+Reports throughput and how many writes failed with "database is locked".
+
+    python benchmarks/bench_db_concurrency.py [--flows 16] [--questions 5] [--untuned]
+
+--untuned drops the SQLITE_PRAGMAS init command and IMMEDIATE transactions
+from the connection settings, for comparison with the defaults.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'interview_mocker.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+
+def configure(path, tuned):
+    database = settings.DATABASES['default']
+    if database['ENGINE'] != 'django.db.backends.sqlite3':
+        raise SystemExit('This benchmark targets the SQLite backend.')
+    database['NAME'] = path
+    if not tuned:
+        database['OPTIONS'] = {}
+    django.setup()
+
+
+def flow(index, questions, user_id, stats, barrier):
+    from django.contrib.sessions.backends.db import SessionStore
+    from django.db import OperationalError, connection, transaction
+    from feedback.models import InterviewResult
+
+    def write(func):
+        started = time.perf_counter()
+        try:
+            func()
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            stats.record(time.perf_counter() - started, locked=True)
+            return
+        stats.record(time.perf_counter() - started)
+
+    barrier.wait()
+    try:
+        session = SessionStore()
+        answers = []
+        for idx in range(questions):
+            answers.append(f'Answer {idx} from flow {index}. ' * 20)
+            session['interview_data'] = {'current_question_idx': idx + 1, 'answers': list(answers)}
+            write(session.save)
+
+        def submit():
+            with transaction.atomic():
+                InterviewResult.objects.get_or_create(
+                    interview_id=f'bench{index:027d}',
+                    defaults={
+                        'user_id': user_id, 'name': 'Bench', 'role': 'Developer', 'experience': 3,
+                        'mode': 'text', 'questions': [f'Q{i}' for i in range(questions)],
+                        'answers': answers, 'ai_feedback': {},
+                    },
+                )
+                session.flush()
+        write(submit)
+    finally:
+        connection.close()
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.writes = 0
+        self.locked = 0
+        self.latencies = []
+
+    def record(self, seconds, locked=False):
+        with self.lock:
+            self.writes += 1
+            self.locked += locked
+            self.latencies.append(seconds)
+
+
+def run(flows=16, questions=5, tuned=True):
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command('migrate', verbosity=0)
+    user_id = User.objects.create_user('bench@example.com').pk
+    connection.close()
+
+    stats = Stats()
+    barrier = threading.Barrier(flows)
+    threads = [
+        threading.Thread(target=flow, args=(i, questions, user_id, stats, barrier))
+        for i in range(flows)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    from feedback.models import InterviewResult
+    latencies = sorted(stats.latencies)
+    return {
+        'benchmark': 'db_concurrency',
+        'tuned': tuned,
+        'journal_mode': connection.cursor().execute('PRAGMA journal_mode').fetchone()[0],
+        'flows': flows,
+        'questions': questions,
+        'total_seconds': round(elapsed, 4),
+        'writes': stats.writes,
+        'writes_per_second': round(stats.writes / elapsed, 1) if elapsed else None,
+        'locked_errors': stats.locked,
+        'results_created': InterviewResult.objects.count(),
+        'p50_write_ms': round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+        'p99_write_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--flows', type=int, default=16)
+    parser.add_argument('--questions', type=int, default=5)
+    parser.add_argument('--untuned', action='store_true')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        configure(os.path.join(directory, 'bench.sqlite3'), tuned=not args.untuned)
+        print(json.dumps(run(args.flows, args.questions, tuned=not args.untuned)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark webcam interaction analysis for one interview's worth of frames.
+
+Encodes synthetic 640x480 JPEG frames, then times decoding them to
+thumbnails, the batched analysis and the per-interview summary.
+
+    python benchmarks/bench_interaction.py [--frames 240] [--batch 8]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from users.services.frame_service import analyze_frames, decode_frames, summarize  # noqa: E402
+
+
+def synthetic_frames(count, size=(640, 480), seed=0):
+    """A bright subject drifting over a noisy background, as JPEG bytes."""
+    rng = np.random.default_rng(seed)
+    w, h = size
+    yy, xx = np.mgrid[0:h, 0:w]
+    payloads = []
+    for i in range(count):
+        background = rng.integers(40, 90, size=(h, w), dtype=np.uint8)
+        cx, cy = w / 2 + 20 * np.sin(i / 10), h / 2 + 10 * np.cos(i / 7)
+        face = ((xx - cx) ** 2 / 90 ** 2 + (yy - cy) ** 2 / 120 ** 2) < 1
+        background[face] = 200
+        buffer = BytesIO()
+        Image.fromarray(background).convert('RGB').save(buffer, format='JPEG', quality=80)
+        payloads.append(buffer.getvalue())
+    return payloads
+
+
+def run(frames=240, batch=8):
+    payloads = synthetic_frames(frames)
+    started = time.perf_counter()
+    decode_seconds = analyze_seconds = 0.0
+    metrics, previous = [], None
+    for start in range(0, frames, batch):
+        t0 = time.perf_counter()
+        stack = decode_frames(payloads[start:start + batch])
+        t1 = time.perf_counter()
+        metrics.extend(analyze_frames(stack, previous))
+        analyze_seconds += time.perf_counter() - t1
+        decode_seconds += t1 - t0
+        previous = stack[-1]
+    t2 = time.perf_counter()
+    summary = summarize(metrics)
+    summarize_seconds = time.perf_counter() - t2
+    return {
+        'benchmark': 'interaction_analysis',
+        'frames': frames,
+        'batch_size': batch,
+        'total_seconds': round(time.perf_counter() - started, 4),
+        'decode_seconds': round(decode_seconds, 4),
+        'analyze_seconds': round(analyze_seconds, 4),
+        'summarize_seconds': round(summarize_seconds, 4),
+        'presence_rate': summary['presence_rate'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=240)
+    parser.add_argument('--batch', type=int, default=8)
+    args = parser.parse_args()
+    print(json.dumps(run(args.frames, args.batch)))
+
+
+if __name__ == '__main__':
+    main()
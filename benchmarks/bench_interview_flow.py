@@ -0,0 +1,426 @@
+"""Benchmark the interview flow end to end, offline, against a fresh SQLite database.
+
+Times the question bank (generate_fallback_questions), question and feedback
+generation (MistralService), transcription of a synthetic clip, a full
+interview walkthrough through interview_run_view, and the results and stats
+pages with a large history of results.
+
+    python benchmarks/bench_interview_flow.py [--iterations 20] [--results 10000]
+        [--only results_view,stats_view] [--output run.json] [--baseline previous.json]
+
+No network or model download is needed. MistralService runs a tiny randomly
+initialised GPT-2 with a byte-level tokenizer, so generation timings track
+this code's batching and decoding overhead rather than distilgpt2's speed.
+When the whisper package is not installed, a stand-in that segments the clip
+by energy replaces it, so the transcription timings cover decoding, caching
+and delivery metrics but not a Whisper pass. The JSON written to stdout (and
+to --output) records which models were used; --baseline compares each
+timing's mean with an earlier run and exits with status 1 when one has got
+slower than --threshold allows.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+import uuid
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'interview_mocker.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+BENCHMARKS = (
+    'fallback_questions', 'generate_questions', 'generate_feedback',
+    'transcribe', 'interview_walkthrough', 'results_view', 'stats_view',
+)
+SAMPLE_RATE = 16000
+ROLE = 'Backend Engineer'
+ANSWER = ('I would start by measuring where the time goes, then fix the slowest part first '
+          'and check the change with the same measurement. ') * 3
+
+
+def timings(samples):
+    """Summary statistics, in milliseconds, of a list of durations in seconds."""
+    ordered = sorted(samples)
+    return {
+        'iterations': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+        'p50_ms': round(ordered[len(ordered) // 2] * 1000, 3),
+        'p95_ms': round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000, 3),
+        'min_ms': round(ordered[0] * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
+
+
+def measure(func, iterations, warmup=1):
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return timings(samples)
+
+
+def synthetic_clip(seconds=20, seed=0):
+    """WAV bytes of voiced bursts separated by pauses, like a spoken answer."""
+    rng = np.random.default_rng(seed)
+    audio = np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+    t, position = np.arange(SAMPLE_RATE * 3) / SAMPLE_RATE, 0.8
+    while position < seconds - 1:
+        length = rng.uniform(0.8, 2.5)
+        n = int(length * SAMPLE_RATE)
+        start = int(position * SAMPLE_RATE)
+        pitch = rng.uniform(110, 220)
+        burst = 0.3 * np.sin(2 * np.pi * pitch * t[:n]) + 0.05 * rng.standard_normal(n)
+        audio[start:start + n] = burst[:len(audio) - start]
+        position += length + rng.choice([0.2, 0.5, 1.0, 2.5])
+    audio += 0.005 * rng.standard_normal(len(audio)).astype(np.float32)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((np.clip(audio, -1, 1) * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+class EnergySegmenter:
+    """Stand-in Whisper model: one segment per voiced stretch of the clip."""
+
+    def transcribe(self, audio, language=None, frame=0.02, threshold=0.05):
+        size = int(frame * SAMPLE_RATE)
+        frames = audio[:len(audio) // size * size].reshape(-1, size)
+        voiced = np.sqrt((frames ** 2).mean(axis=1)) > threshold
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+        segments = [
+            {'start': start * frame, 'end': end * frame, 'text': ' um answer' * max(1, int((end - start) * frame * 2.5))}
+            for start, end in zip(edges[::2], edges[1::2])
+        ]
+        return {'text': ''.join(s['text'] for s in segments), 'segments': segments}
+
+
+def stand_in_whisper():
+    def load_audio(path):
+        with wave.open(path, 'rb') as wav:
+            pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2')
+        return pcm.astype(np.float32) / 32768
+
+    module = types.ModuleType('whisper')
+    module.load_audio = load_audio
+    module.load_model = lambda name: EnergySegmenter()
+    return module
+
+
+def use_whisper():
+    """'whisper' if the real package is installed; otherwise installs the stand-in."""
+    if importlib.util.find_spec('whisper') is not None:
+        return 'whisper'
+    sys.modules['whisper'] = stand_in_whisper()
+    return 'stand-in'
+
+
+def tiny_mistral_service(seed=0):
+    """A MistralService around a two-layer random GPT-2 and a byte-level tokenizer."""
+    import torch
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers
+    from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+    from users.services.mistral_service import MistralService
+
+    eos = '<|endoftext|>'
+    vocab = {token: i for i, token in enumerate(sorted(pre_tokenizers.ByteLevel.alphabet()))}
+    vocab[eos] = len(vocab)
+    backend = Tokenizer(models.BPE(vocab, []))
+    backend.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    backend.decoder = decoders.ByteLevel()
+
+    torch.manual_seed(seed)
+    service = MistralService.__new__(MistralService)
+    service.model_name = 'tiny-gpt2'
+    service.tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, eos_token=eos, pad_token=eos)
+    service.tokenizer.padding_side = 'left'
+    service.model = GPT2LMHeadModel(GPT2Config(
+        vocab_size=len(vocab), n_positions=4096, n_embd=64, n_layer=2, n_head=2,
+        bos_token_id=vocab[eos], eos_token_id=vocab[eos],
+    )).eval()
+    return service
+
+
+def bench_fallback_questions(context):
+    from users.services.question_bank import INTERVIEW_TYPES, LEVELS
+    from users.views import generate_fallback_questions
+
+    specs = [(level, kind) for level in LEVELS for kind in INTERVIEW_TYPES]
+
+    def run():
+        for level, kind in specs:
+            generate_fallback_questions(ROLE, level, kind)
+
+    result = measure(run, context['iterations'])
+    result['calls_per_iteration'] = len(specs)
+    return result
+
+
+def bench_generate_questions(context):
+    service = context['mistral']
+    return measure(lambda: service.generate_questions(ROLE, 3, 'technical'), context['model_iterations'])
+
+
+def bench_generate_feedback(context):
+    from users.views import generate_fallback_questions
+
+    service = context['mistral']
+    questions = generate_fallback_questions(ROLE, 3, 'technical')
+    answers = [ANSWER] * len(questions)
+    return measure(lambda: service.generate_feedback(ROLE, 'technical', questions, answers),
+                   context['model_iterations'])
+
+
+def bench_transcribe(context):
+    from users.services.transcription_service import delivery_metrics, get_transcript_cache, transcribe
+
+    clip = synthetic_clip()
+
+    def run():
+        spoken = transcribe(clip, suffix='.wav')
+        delivery_metrics(spoken['segments'], spoken['duration'])
+
+    cache = get_transcript_cache()
+    cold = []
+    run()
+    for _ in range(context['iterations']):
+        cache.clear()
+        started = time.perf_counter()
+        run()
+        cold.append(time.perf_counter() - started)
+    return {'clip_seconds': len(clip[44:]) / 2 / SAMPLE_RATE, 'uncached': timings(cold),
+            'cached': measure(run, context['iterations'])}
+
+
+def bench_interview_walkthrough(context):
+    from django.urls import reverse
+
+    from feedback.models import InterviewResult
+    from users.services.transcription_service import get_transcript_cache
+
+    client = context['client']
+    clips = [synthetic_clip(seed=i) for i in range(5)]
+    steps, totals, feedback = {}, [], []
+
+    def timed_request(name, method, *args, **kwargs):
+        started = time.perf_counter()
+        response = getattr(client, method)(*args, **kwargs)
+        steps.setdefault(name, []).append(time.perf_counter() - started)
+        return response
+
+    for _ in range(context['walkthroughs'] + 1):
+        get_transcript_cache().clear()
+        started = time.perf_counter()
+        timed_request('start', 'post', reverse('mock_interview'), {
+            'name': 'Bench', 'role': ROLE, 'experience': 'Mid',
+            'interview_type': 'technical', 'mode': context['mode'],
+        })
+        timed_request('render_question', 'get', reverse('interview_run'))
+        for idx, clip in enumerate(clips):
+            data = {'answer': ANSWER, 'question_idx': idx}
+            if context['mode'] == 'voice':
+                data['audio_file'] = io.BytesIO(clip)
+                data['audio_file'].name = f'answer-{idx}.wav'
+            response = timed_request('final_submit' if idx == len(clips) - 1 else 'answer', 'post',
+                                     reverse('interview_run'), data)
+        submitted = time.perf_counter()
+        totals.append(submitted - started)
+        pk = int(response.url.rstrip('/').rsplit('/', 1)[-1])
+        while InterviewResult.objects.filter(pk=pk, feedback_status=InterviewResult.FEEDBACK_PENDING).exists():
+            time.sleep(0.002)
+        feedback.append(time.perf_counter() - submitted)
+    # The first walkthrough warms caches and the inference pool.
+    return {
+        'mode': context['mode'],
+        'questions': len(clips),
+        'walkthrough': timings(totals[1:]),
+        'feedback_ready': timings(feedback[1:]),
+        'steps': {name: timings(samples[1:] if name != 'answer' else samples[len(clips) - 1:])
+                  for name, samples in steps.items()},
+    }
+
+
+def seed_results(user, count, batch_size=1000):
+    from feedback.models import InterviewResult
+    from users.services.feedback_jobs import score_answers
+    from users.views import generate_fallback_questions
+
+    questions = generate_fallback_questions(ROLE, 3, 'technical')
+    answers = [ANSWER] * len(questions)
+    feedback = score_answers(questions, answers, [''] * len(questions), None)
+    InterviewResult.objects.bulk_create((
+        InterviewResult(
+            user=user, interview_id=uuid.uuid4().hex, name='Bench', role=ROLE, experience=3,
+            interview_type='technical', mode='text', questions=questions, answers=answers,
+            voice_transcripts=[''] * len(questions), ai_feedback=feedback,
+            overall_score=feedback.get('overall_score'), grade_label=feedback.get('grade_label'),
+        ) for _ in range(count)
+    ), batch_size=batch_size)
+
+
+def query_count(client, url):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    return len(queries), len(response.content)
+
+
+def bench_results_view(context):
+    from django.urls import reverse
+
+    client, url = context['client'], reverse('results')
+    result = measure(lambda: client.get(url), context['page_iterations'])
+    result['results'], (result['queries'], result['response_bytes']) = context['results'], query_count(client, url)
+    return result
+
+
+def bench_stats_view(context):
+    from django.urls import reverse
+
+    client, url = context['client'], reverse('stats')
+    result = measure(lambda: client.get(url), context['iterations'])
+    result['results'], (result['queries'], _) = context['results'], query_count(client, url)
+    return result
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import torch
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'torch': torch.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def run(only=BENCHMARKS, iterations=20, model_iterations=3, page_iterations=5, walkthroughs=5,
+        results=10000, mode='voice'):
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    call_command('migrate', verbosity=0)
+    context = {
+        'iterations': iterations, 'model_iterations': model_iterations, 'page_iterations': page_iterations,
+        'walkthroughs': walkthroughs, 'results': results, 'mode': mode,
+        'transcription_model': use_whisper(),
+    }
+    if {'generate_questions', 'generate_feedback'} & set(only):
+        context['mistral'] = tiny_mistral_service()
+    # Limits would turn repeated requests into 429s; relevance scoring needs a model download.
+    with override_settings(ALLOWED_HOSTS=['testserver'], RATE_LIMITS={}, ANSWER_RELEVANCE_ENABLED=False,
+                           PROFILING_ENABLED=False):
+        user = User.objects.create_user('bench', password='bench-password')
+        context['client'] = Client()
+        context['client'].force_login(user)
+        measured = {}
+        for name in only:
+            if name in ('results_view', 'stats_view') and not context.get('seeded'):
+                seed_results(user, results)
+                context['seeded'] = True
+            measured[name] = globals()[f'bench_{name}'](context)
+    return {
+        'benchmark': 'interview_flow',
+        'environment': environment(),
+        'models': {
+            'generation': 'tiny-gpt2' if 'mistral' in context else None,
+            'transcription': context['transcription_model'],
+        },
+        'results': measured,
+    }
+
+
+def mean_timings(results, prefix=''):
+    """Flatten a run's results to {'name.sub': mean_ms} for comparison."""
+    means = {}
+    for name, value in results.items():
+        if isinstance(value, dict):
+            if 'mean_ms' in value:
+                means[prefix + name] = value['mean_ms']
+            means.update(mean_timings(value, f'{prefix}{name}.'))
+    return means
+
+
+def compare(current, baseline, threshold=0.2):
+    """Timings whose mean grew by more than ``threshold`` (a fraction) since ``baseline``."""
+    before = mean_timings(baseline.get('results', {}))
+    regressions = []
+    for name, mean in mean_timings(current['results']).items():
+        previous = before.get(name)
+        if previous and mean > previous * (1 + threshold):
+            regressions.append({'timing': name, 'baseline_ms': previous, 'mean_ms': mean,
+                                'ratio': round(mean / previous, 2)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', default=','.join(BENCHMARKS),
+                        help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}.")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--model-iterations', type=int, default=3)
+    parser.add_argument('--page-iterations', type=int, default=5)
+    parser.add_argument('--walkthroughs', type=int, default=5)
+    parser.add_argument('--results', type=int, default=10000, help='Results seeded for the results and stats pages.')
+    parser.add_argument('--mode', choices=('text', 'voice'), default='voice')
+    parser.add_argument('--output', help='Also write the JSON report to this file.')
+    parser.add_argument('--baseline', help='JSON report of an earlier run to compare against.')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed slowdown against --baseline, as a fraction (default 0.2).')
+    args = parser.parse_args()
+    only = [name.strip() for name in args.only.split(',') if name.strip()]
+    unknown = set(only) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.DATABASES['default']['NAME'] = os.path.join(directory, 'bench.sqlite3')
+        settings.TRANSCRIPT_CACHE_DIR = None
+        django.setup()
+        # The views print progress; keep stdout for the report.
+        with contextlib.redirect_stdout(sys.stderr):
+            report = run(only, args.iterations, args.model_iterations, args.page_iterations,
+                         args.walkthroughs, args.results, args.mode)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as fh:
+            report['regressions'] = compare(report, json.load(fh), args.threshold)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+    print(json.dumps(report))
+    if report.get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark session storage backends over simulated interview steps.
+
+Each step does what an interview request does to its session: load it,
+record an answer and the step's metadata, and save it. Reports database
+statements and latency per step for each SESSION_BACKEND (see
+interview_mocker/cache.py), against a fresh SQLite database file.
+
+    python benchmarks/bench_sessions.py [--interviews 50] [--questions 5] [--redis redis://127.0.0.1:6379/15]
+
+The cache backend is measured with the local-memory and file caches, and
+with a Redis-compatible server when --redis is given.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'interview_mocker.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+class StatementCounter:
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        verb = sql.lstrip().split(None, 1)[0].upper()
+        if verb == 'SELECT':
+            self.reads += 1
+        elif verb in ('INSERT', 'UPDATE', 'DELETE'):
+            self.writes += 1
+        return execute(sql, params, many, context)
+
+
+def run_backend(session_backend, cache_backend, interviews, questions, directory, redis_url=None):
+    from importlib import import_module
+
+    from django.core.cache import caches
+    from django.db import connection
+    from django.test.utils import override_settings
+
+    from interview_mocker.cache import SESSION_ENGINES, cache_config
+
+    env = {'CACHE_BACKEND': cache_backend,
+           'CACHE_LOCATION': redis_url or os.path.join(directory, 'cache')}
+    engine = SESSION_ENGINES[session_backend]
+    with override_settings(CACHES=cache_config(env), SESSION_ENGINE=engine):
+        caches['sessions'].clear()
+        store_class = import_module(engine).SessionStore
+        counter = StatementCounter()
+        latencies = []
+        for interview in range(interviews):
+            session = store_class()
+            session['interview_questions'] = [f'Question {i}?' for i in range(questions)]
+            session['interview_data'] = {'interview_id': f'{interview:032x}', 'mode': 'voice'}
+            session['interview_answers'] = []
+            session.save()
+            key = session.session_key
+            with connection.execute_wrapper(counter):
+                for idx in range(questions):
+                    started = time.perf_counter()
+                    session = store_class(key)
+                    answers = session.get('interview_answers', [])
+                    answers.append(f'Answer {idx}. ' * 40)
+                    session['interview_answers'] = answers
+                    session['current_question_idx'] = idx + 1
+                    session.setdefault('step_outcomes', {})[str(idx)] = '/interview-run/'
+                    session.modified = True
+                    session.save()
+                    latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        'session_backend': session_backend,
+        'cache_backend': cache_backend if session_backend != 'db' else None,
+        'steps': len(latencies),
+        'db_writes_per_step': round(counter.writes / len(latencies), 2),
+        'db_reads_per_step': round(counter.reads / len(latencies), 2),
+        'mean_step_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'p95_step_ms': round(latencies[int(len(latencies) * 0.95)] * 1000, 3),
+    }
+
+
+def run(interviews=50, questions=5, redis_url=None):
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    combinations = [('db', 'locmem'), ('cached_db', 'locmem'), ('cache', 'locmem'), ('cache', 'file')]
+    if redis_url:
+        combinations += [('cached_db', 'redis'), ('cache', 'redis')]
+    with tempfile.TemporaryDirectory() as directory:
+        return {
+            'benchmark': 'sessions',
+            'interviews': interviews,
+            'questions': questions,
+            'backends': [
+                run_backend(session_backend, cache_backend, interviews, questions, directory, redis_url)
+                for session_backend, cache_backend in combinations
+            ],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--interviews', type=int, default=50)
+    parser.add_argument('--questions', type=int, default=5)
+    parser.add_argument('--redis', help='URL of a Redis-compatible server to include.')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        settings.DATABASES['default']['NAME'] = os.path.join(directory, 'bench.sqlite3')
+        django.setup()
+        print(json.dumps(run(args.interviews, args.questions, args.redis)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,30 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .models import BlogPost
+from .views import POSTS_PER_PAGE
+
+
+class BlogViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author@example.com', password='pw')
+
+    def test_list_is_paginated(self):
+        for i in range(POSTS_PER_PAGE + 3):
+            BlogPost.objects.create(title=f'Post {i}', content='word ' * 200, author=self.author)
+        response = self.client.get(reverse('blog_list'))
+        self.assertEqual(len(response.context['posts']), POSTS_PER_PAGE)
+        response = self.client.get(reverse('blog_list'), {'page': 2})
+        self.assertEqual(len(response.context['posts']), 3)
+
+    def test_detail_cache_invalidates_on_edit(self):
+        post = BlogPost.objects.create(title='Hello', content='First version', author=self.author)
+        self.assertContains(self.client.get(reverse('blog_detail', args=[post.pk])), 'First version')
+        post.content = 'Second version'
+        post.save()
+        response = self.client.get(reverse('blog_detail', args=[post.pk]))
+        self.assertContains(response, 'Second version')
+        self.assertNotContains(response, 'First version')
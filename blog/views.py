@@ -1,10 +1,22 @@
+from django.core.paginator import Paginator
+from django.db.models.functions import Substr
 from django.shortcuts import render, get_object_or_404
 from .models import BlogPost
 
+POSTS_PER_PAGE = 10
+# Characters of content pulled for the listing; the template trims to words.
+EXCERPT_LENGTH = 400
+
 def blog_list(request):
-    posts = BlogPost.objects.all().order_by('-created_at')
-    return render(request, 'blog/list.html', {'posts': posts})
+    posts = (
+        BlogPost.objects.select_related('author')
+        .defer('content')
+        .annotate(excerpt=Substr('content', 1, EXCERPT_LENGTH))
+        .order_by('-created_at')
+    )
+    page_obj = Paginator(posts, POSTS_PER_PAGE).get_page(request.GET.get('page'))
+    return render(request, 'blog/list.html', {'posts': page_obj, 'page_obj': page_obj})
 
 def blog_detail(request, pk):
-    post = get_object_or_404(BlogPost, pk=pk)
+    post = get_object_or_404(BlogPost.objects.select_related('author'), pk=pk)
     return render(request, 'blog/detail.html', {'post': post})
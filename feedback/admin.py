@@ -1,11 +1,13 @@
 from django.contrib import admin
 from .models import InterviewResult
+from .search import get_search_backend
 
 @admin.register(InterviewResult)
 class InterviewResultAdmin(admin.ModelAdmin):
     list_display = ('user', 'name', 'role', 'interview_type', 'overall_score', 'created_at')
     list_filter = ('interview_type', 'mode', 'webcam_enabled', 'created_at')
     search_fields = ('user__username', 'name', 'role')
+    search_help_text = 'Searches username, name and role, plus questions, answers, transcripts and feedback text.'
     readonly_fields = ('created_at', 'questions', 'answers', 'voice_transcripts', 'ai_feedback')
     
     fieldsets = (
@@ -23,3 +25,11 @@ class InterviewResultAdmin(admin.ModelAdmin):
             'fields': ('ai_feedback', 'interaction_feedback', 'overall_score', 'grade_label')
         }),
     )
+
+    def get_search_results(self, request, queryset, search_term):
+        filtered, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            ids = get_search_backend().search(search_term, limit=1000)
+            if ids:
+                filtered = filtered | queryset.filter(pk__in=ids)
+        return filtered, may_have_duplicates
@@ -0,0 +1,155 @@
+"""Streaming export of InterviewResults for analytics pipelines.
+
+Rows are read in (created_at, id) order with keyset pagination, a chunk at a
+time, and encoded one line at a time, so memory stays flat however many rows
+are exported. Under ASGI the view streams through ``aiter_rows``/``aencode``:
+Django would buffer a sync iterator into a list there before sending it. The (created_at, id) of the last row
+written is the cursor: passing it back as ``after`` resumes the export
+exactly where it stopped, even if new results arrived in the meantime.
+"""
+import csv
+import datetime
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import InterviewResult
+
+FORMATS = ('ndjson', 'csv')
+CHUNK_SIZE = 1000
+EXPORT_FIELDS = (
+    'id', 'created_at', 'username', 'name', 'role', 'experience', 'interview_type',
+    'mode', 'webcam_enabled', 'feedback_status', 'overall_score', 'grade_label',
+    'questions', 'answers', 'voice_transcripts', 'voice_metrics',
+    'interaction_feedback', 'ai_feedback',
+)
+# Structured fields; CSV carries them as JSON text.
+JSON_FIELDS = frozenset([
+    'questions', 'answers', 'voice_transcripts', 'voice_metrics', 'interaction_feedback', 'ai_feedback',
+])
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def _parse_timestamp(value, end_of_day=False):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Invalid date or datetime: {value!r}')
+        parsed = datetime.datetime.combine(day, datetime.time.max if end_of_day else datetime.time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, timezone.get_current_timezone())
+    return parsed
+
+
+def format_timestamp(value):
+    """ISO 8601 at full precision (DjangoJSONEncoder rounds to milliseconds, which would break cursors)."""
+    value = value.isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def format_cursor(created_at, pk):
+    return f'{format_timestamp(created_at)},{pk}'
+
+
+def parse_cursor(value):
+    """``'<created_at>,<id>'`` -> (datetime, int)."""
+    created_at, sep, pk = value.rpartition(',')
+    parsed = parse_datetime(created_at) if sep else None
+    if parsed is None or not pk.isdigit():
+        raise ValueError(f'Invalid cursor: {value!r}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, datetime.timezone.utc)
+    return parsed, int(pk)
+
+
+def filtered_results(since=None, until=None, role=None, interview_type=None):
+    """Results matching the export filters; dates are inclusive, raw strings accepted."""
+    queryset = InterviewResult.objects.all()
+    if since:
+        queryset = queryset.filter(created_at__gte=_parse_timestamp(since))
+    if until:
+        queryset = queryset.filter(created_at__lte=_parse_timestamp(until, end_of_day=True))
+    if role:
+        queryset = queryset.filter(role__iexact=role)
+    if interview_type:
+        queryset = queryset.filter(interview_type=interview_type)
+    return queryset
+
+
+def iter_chunks(queryset, after=None, chunk_size=CHUNK_SIZE):
+    """Yield lists of export rows (dicts) in cursor order, one keyset query per chunk."""
+    columns = [('user__username' if f == 'username' else f) for f in EXPORT_FIELDS]
+    queryset = queryset.order_by('created_at', 'id').values_list(*columns)
+    cursor = after
+    while True:
+        chunk = queryset
+        if cursor is not None:
+            created_at, pk = cursor
+            chunk = chunk.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+        rows = [dict(zip(EXPORT_FIELDS, values)) for values in chunk[:chunk_size]]
+        if rows:
+            cursor = (rows[-1]['created_at'], rows[-1]['id'])
+            yield rows
+        if len(rows) < chunk_size:
+            break
+
+
+def iter_rows(queryset, after=None, chunk_size=CHUNK_SIZE):
+    """Yield export rows (dicts) in cursor order, starting after ``after``."""
+    for rows in iter_chunks(queryset, after=after, chunk_size=chunk_size):
+        yield from rows
+
+
+async def aiter_rows(queryset, after=None, chunk_size=CHUNK_SIZE):
+    """Async ``iter_rows``: each chunk is queried in a worker thread as the consumer reaches it."""
+    chunks = iter_chunks(queryset, after=after, chunk_size=chunk_size)
+    fetch = sync_to_async(next)
+    while (rows := await fetch(chunks, None)) is not None:
+        for row in rows:
+            yield row
+
+
+def ndjson_line(row):
+    return json.dumps({**row, 'created_at': format_timestamp(row['created_at'])}, cls=DjangoJSONEncoder) + '\n'
+
+
+def _csv_line(values):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+def csv_line(row):
+    return _csv_line([
+        json.dumps(row[f], cls=DjangoJSONEncoder) if f in JSON_FIELDS and row[f] is not None
+        else format_timestamp(row[f]) if f == 'created_at'
+        else row[f]
+        for f in EXPORT_FIELDS
+    ])
+
+
+def encode(rows, fmt, header=True):
+    """Encode export rows as lines of ``fmt`` ('ndjson' or 'csv')."""
+    if fmt == 'csv' and header:
+        yield _csv_line(EXPORT_FIELDS)
+    line = csv_line if fmt == 'csv' else ndjson_line
+    for row in rows:
+        yield line(row)
+
+
+async def aencode(rows, fmt, header=True):
+    """``encode`` for the async rows of ``aiter_rows``."""
+    if fmt == 'csv' and header:
+        yield _csv_line(EXPORT_FIELDS)
+    line = csv_line if fmt == 'csv' else ndjson_line
+    async for row in rows:
+        yield line(row)
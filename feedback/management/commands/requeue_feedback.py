@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.services.feedback_jobs import STALE_PENDING_SECONDS, generate_feedback, stale_pending_results
+
+
+class Command(BaseCommand):
+    help = ('Generate feedback for results left pending by a worker that was restarted or crashed. '
+            'Run it periodically, e.g. from cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=STALE_PENDING_SECONDS,
+                            help='Only results pending for at least this many seconds.')
+        parser.add_argument('--limit', type=int, help='At most this many results per run.')
+        parser.add_argument('--dry-run', action='store_true', help='List the stale results without processing them.')
+
+    def handle(self, *args, **options):
+        if options['older_than'] < 0:
+            raise CommandError('--older-than must not be negative.')
+        pks = stale_pending_results(options['older_than'])[:options['limit']]
+        if options['dry_run']:
+            self.stdout.write(f'{len(pks)} stale pending results: {", ".join(map(str, pks))}')
+            return
+        for pk in pks:
+            generate_feedback(pk)
+        self.stdout.write(self.style.SUCCESS(f'Generated feedback for {len(pks)} stale pending results.'))
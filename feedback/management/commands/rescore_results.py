@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from feedback.models import InterviewResult
+from feedback.search import get_search_backend
+from users.services.scoring_service import merge_feedback, score_batch
+
+UPDATE_FIELDS = ('ai_feedback', 'overall_score', 'grade_label', 'feedback_status')
+# Rows per bulk_update() statement; keeps each CASE expression small.
+WRITE_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = ('Re-score stored InterviewResults with the current scoring engine. Results still pending '
+            'feedback are left to their job (or requeue_feedback); failed ones become ready.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows fetched from the database per query.')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Rows scored per worker task and written per transaction.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Scoring processes; 0 scores in this process.')
+        parser.add_argument('--checkpoint', help='JSON file recording the last re-scored pk.')
+        parser.add_argument('--reset', action='store_true', help='Ignore an existing checkpoint.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        checkpoint = options['checkpoint']
+        if batch_size < 1 or options['chunk_size'] < 1:
+            raise CommandError('--batch-size and --chunk-size must be positive.')
+
+        start_pk, done = 0, 0
+        if checkpoint and os.path.exists(checkpoint) and not options['reset']:
+            with open(checkpoint, encoding='utf-8') as fh:
+                state = json.load(fh)
+            start_pk, done = state['last_pk'], state['processed']
+            self.stdout.write(f'Resuming after pk {start_pk} ({done} rows already re-scored).')
+
+        self.started = time.monotonic()
+        self.processed = 0
+        self.checkpoint = checkpoint
+        self.total_done = done
+        batches = self.stream_batches(start_pk, options['chunk_size'], batch_size)
+
+        if options['workers'] > 0:
+            with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+                # Bounded in-flight window keeps memory flat; FIFO order keeps
+                # the checkpoint monotonic.
+                pending = deque()
+                for batch in batches:
+                    pending.append((batch, pool.submit(score_batch, self.score_rows(batch))))
+                    if len(pending) >= options['workers'] * 2:
+                        self.write_back(*self.wait(pending.popleft()))
+                while pending:
+                    self.write_back(*self.wait(pending.popleft()))
+        else:
+            for batch in batches:
+                self.write_back(batch, score_batch(self.score_rows(batch)))
+
+        elapsed = time.monotonic() - self.started
+        rate = self.processed / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f'Re-scored {self.processed} results in {elapsed:.1f}s ({rate:.0f} rows/s).'
+        ))
+
+    def stream_batches(self, start_pk, chunk_size, batch_size):
+        """Yield lists of results in pk order, reading chunk_size rows per query.
+
+        Keyset pagination on pk rather than one long-lived cursor: SQLite does
+        not isolate a running SELECT from writes made on the same connection.
+        Results still pending feedback are skipped, so this does not race the
+        job that will write it.
+        """
+        fields = ('pk', 'questions', 'answers', 'voice_transcripts', 'voice_metrics', 'ai_feedback')
+        last_pk = start_pk
+        batch = []
+        while True:
+            chunk = (InterviewResult.objects.filter(pk__gt=last_pk)
+                     .exclude(feedback_status=InterviewResult.FEEDBACK_PENDING)
+                     .order_by('pk').only(*fields)[:chunk_size])
+            rows = 0
+            for result in chunk.iterator(chunk_size=chunk_size):
+                rows += 1
+                last_pk = result.pk
+                batch.append(result)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if rows < chunk_size:
+                break
+        if batch:
+            yield batch
+
+    @staticmethod
+    def score_rows(batch):
+        return [
+            (r.pk, r.questions, r.answers, r.voice_transcripts,
+             [(m or {}).get('speaking_seconds') for m in r.voice_metrics or []])
+            for r in batch
+        ]
+
+    @staticmethod
+    def wait(item):
+        batch, future = item
+        return batch, future.result()
+
+    def write_back(self, batch, scored):
+        by_pk = {r.pk: r for r in batch}
+        for pk, feedback in scored:
+            result = by_pk[pk]
+            result.ai_feedback = merge_feedback(result.ai_feedback, feedback)
+            result.overall_score = feedback['overall_score']
+            result.grade_label = feedback['grade_label']
+            result.feedback_status = InterviewResult.FEEDBACK_READY
+
+        search = get_search_backend()
+        with transaction.atomic():
+            InterviewResult.objects.bulk_update(batch, UPDATE_FIELDS, batch_size=WRITE_BATCH_SIZE)
+            # bulk_update() skips post_save, so refresh the search index here.
+            for result in batch:
+                search.index(result)
+
+        self.processed += len(batch)
+        self.total_done += len(batch)
+        if self.checkpoint:
+            tmp = self.checkpoint + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                json.dump({'last_pk': batch[-1].pk, 'processed': self.total_done}, fh)
+            os.replace(tmp, self.checkpoint)
+
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(f'  {self.processed} rows, {self.processed / max(elapsed, 1e-9):.0f} rows/s, last pk {batch[-1].pk}')
@@ -0,0 +1,74 @@
+import json
+
+from django.db import migrations
+
+
+FTS_TABLE = 'feedback_interviewresult_fts'
+
+
+# Frozen copy of feedback.search.document_for as of this migration, so later
+# changes to the live index code cannot alter what this backfill does.
+def _flatten(value):
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [s for v in value.values() for s in _flatten(v)]
+    if isinstance(value, (list, tuple)):
+        return [s for v in value for s in _flatten(v)]
+    return []
+
+
+def _document(result):
+    feedback = result.ai_feedback
+    if isinstance(feedback, str):
+        try:
+            feedback = json.loads(feedback) if feedback else {}
+        except json.JSONDecodeError:
+            feedback = {'summary': feedback}
+    feedback = feedback or {}
+    feedback_text = _flatten({k: v for k, v in feedback.items() if k != 'questions'})
+    for item in feedback.get('questions') or []:
+        if isinstance(item, dict):
+            feedback_text.extend(_flatten(item.get('feedback')))
+    return [
+        '\n'.join(_flatten(result.questions)),
+        '\n'.join(_flatten(result.answers)),
+        '\n'.join(_flatten(result.voice_transcripts)),
+        '\n'.join(feedback_text),
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "questions, answers, transcripts, feedback, tokenize='porter unicode61')"
+    )
+    InterviewResult = apps.get_model('feedback', 'InterviewResult')
+    results = InterviewResult.objects.using(schema_editor.connection.alias)
+    with schema_editor.connection.cursor() as cursor:
+        for result in results.iterator(chunk_size=500):
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [result.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, questions, answers, transcripts, feedback) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [result.pk, *_document(result)],
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0006_remove_media_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,67 @@
+import json
+
+from django.db import migrations, models
+
+
+def parse_feedback_text(apps, schema_editor):
+    InterviewResult = apps.get_model('feedback', 'InterviewResult')
+    pending = []
+    for result in InterviewResult.objects.only('pk', 'ai_feedback').iterator(chunk_size=500):
+        text = result.ai_feedback or ''
+        try:
+            data = json.loads(text) if text else {}
+        except json.JSONDecodeError:
+            data = {'summary': text}
+        if not isinstance(data, dict):
+            data = {'summary': text}
+        result.ai_feedback_data = data
+        pending.append(result)
+        if len(pending) >= 500:
+            InterviewResult.objects.bulk_update(pending, ['ai_feedback_data'])
+            pending = []
+    if pending:
+        InterviewResult.objects.bulk_update(pending, ['ai_feedback_data'])
+
+
+def dump_feedback_text(apps, schema_editor):
+    InterviewResult = apps.get_model('feedback', 'InterviewResult')
+    pending = []
+    for result in InterviewResult.objects.only('pk', 'ai_feedback_data').iterator(chunk_size=500):
+        result.ai_feedback = json.dumps(result.ai_feedback_data) if result.ai_feedback_data else ''
+        pending.append(result)
+        if len(pending) >= 500:
+            InterviewResult.objects.bulk_update(pending, ['ai_feedback'])
+            pending = []
+    if pending:
+        InterviewResult.objects.bulk_update(pending, ['ai_feedback'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0007_interviewresult_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewresult',
+            name='ai_feedback_data',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(parse_feedback_text, dump_feedback_text),
+        # Give the text column a default so reversing the removal can re-add it.
+        migrations.AlterField(
+            model_name='interviewresult',
+            name='ai_feedback',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RemoveField(
+            model_name='interviewresult',
+            name='ai_feedback',
+        ),
+        migrations.RenameField(
+            model_name='interviewresult',
+            old_name='ai_feedback_data',
+            new_name='ai_feedback',
+        ),
+    ]
@@ -0,0 +1,62 @@
+import json
+
+from django.db import migrations, models
+
+
+def text_to_json(apps, schema_editor):
+    InterviewResult = apps.get_model('feedback', 'InterviewResult')
+    pending = []
+    for result in InterviewResult.objects.exclude(interaction_feedback__isnull=True).exclude(
+        interaction_feedback=''
+    ).only('pk', 'interaction_feedback').iterator(chunk_size=500):
+        try:
+            data = json.loads(result.interaction_feedback)
+        except json.JSONDecodeError:
+            data = {'summary': result.interaction_feedback}
+        result.interaction_feedback_data = data
+        pending.append(result)
+        if len(pending) >= 500:
+            InterviewResult.objects.bulk_update(pending, ['interaction_feedback_data'])
+            pending = []
+    if pending:
+        InterviewResult.objects.bulk_update(pending, ['interaction_feedback_data'])
+
+
+def json_to_text(apps, schema_editor):
+    InterviewResult = apps.get_model('feedback', 'InterviewResult')
+    pending = []
+    for result in InterviewResult.objects.exclude(interaction_feedback_data__isnull=True).only(
+        'pk', 'interaction_feedback_data'
+    ).iterator(chunk_size=500):
+        result.interaction_feedback = json.dumps(result.interaction_feedback_data)
+        pending.append(result)
+        if len(pending) >= 500:
+            InterviewResult.objects.bulk_update(pending, ['interaction_feedback'])
+            pending = []
+    if pending:
+        InterviewResult.objects.bulk_update(pending, ['interaction_feedback'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0008_interviewresult_ai_feedback_json'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewresult',
+            name='interaction_feedback_data',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(text_to_json, json_to_text),
+        migrations.RemoveField(
+            model_name='interviewresult',
+            name='interaction_feedback',
+        ),
+        migrations.RenameField(
+            model_name='interviewresult',
+            old_name='interaction_feedback_data',
+            new_name='interaction_feedback',
+        ),
+    ]
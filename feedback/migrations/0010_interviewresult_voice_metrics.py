@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0009_interviewresult_interaction_feedback_json'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewresult',
+            name='voice_metrics',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
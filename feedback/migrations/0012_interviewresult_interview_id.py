@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 14:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0011_interviewresult_feedback_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewresult',
+            name='interview_id',
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True),
+        ),
+    ]
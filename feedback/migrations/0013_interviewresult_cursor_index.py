@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 14:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0012_interviewresult_interview_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interviewresult',
+            index=models.Index(fields=['created_at', 'id'], name='interview_result_cursor_idx'),
+        ),
+    ]
@@ -1,8 +1,20 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
 class InterviewResult(models.Model):
+    FEEDBACK_PENDING = 'pending'
+    FEEDBACK_READY = 'ready'
+    FEEDBACK_FAILED = 'failed'
+    FEEDBACK_STATUS_CHOICES = [
+        (FEEDBACK_PENDING, 'Pending'),
+        (FEEDBACK_READY, 'Ready'),
+        (FEEDBACK_FAILED, 'Failed'),
+    ]
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
+    interview_id = models.CharField(max_length=32, unique=True, null=True, blank=True)  # Session interview this result came from
     name = models.CharField(max_length=150)
     role = models.CharField(max_length=100)
     experience = models.PositiveSmallIntegerField()
@@ -12,13 +24,35 @@ class InterviewResult(models.Model):
     questions = models.JSONField()  # List of questions
     answers = models.JSONField()  # List of answers
     voice_transcripts = models.JSONField(null=True, blank=True)  # For voice mode
-    interaction_feedback = models.TextField(null=True, blank=True)  # From webcam analysis
-    ai_feedback = models.TextField()
+    voice_metrics = models.JSONField(null=True, blank=True)  # Per-question delivery metrics from Whisper segments
+    interaction_feedback = models.JSONField(null=True, blank=True)  # Summary of webcam frame metrics
+    ai_feedback = models.JSONField(default=dict, blank=True)  # Structured feedback: summary, strengths, per-question items
+    feedback_status = models.CharField(max_length=10, choices=FEEDBACK_STATUS_CHOICES, default=FEEDBACK_READY)  # Generated in the background after submit
     # Audio and video are processed in real-time and are not stored.
     overall_score = models.IntegerField(null=True, blank=True)
     grade_label = models.CharField(max_length=20, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination for the streaming export.
+            models.Index(fields=['created_at', 'id'], name='interview_result_cursor_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.role} Interview"
 
+
+@receiver(post_save, sender=InterviewResult)
+def index_interview_result(sender, instance, raw=False, **kwargs):
+    """Keep the full-text search index in step with each saved result."""
+    if raw:
+        return
+    from .search import get_search_backend
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=InterviewResult)
+def unindex_interview_result(sender, instance, **kwargs):
+    from .search import get_search_backend
+    get_search_backend().remove(instance.pk)
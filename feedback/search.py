@@ -0,0 +1,155 @@
+"""Full-text search over interview content.
+
+Questions, answers, voice transcripts and the feedback text of each
+InterviewResult are kept in an inverted index so results can be found by
+what a candidate said without scanning the JSON columns. SQLite deployments
+use an FTS5 virtual table; other databases fall back to a LIKE scan behind
+the same interface.
+"""
+import json
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'feedback_interviewresult_fts'
+
+
+def _flatten(value):
+    """Collect every string inside a (possibly nested) JSON value."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [s for v in value.values() for s in _flatten(v)]
+    if isinstance(value, (list, tuple)):
+        return [s for v in value for s in _flatten(v)]
+    return []
+
+
+def _feedback_payload(result):
+    feedback = result.ai_feedback
+    if isinstance(feedback, str):
+        try:
+            return json.loads(feedback) if feedback else {}
+        except json.JSONDecodeError:
+            return {'summary': feedback}
+    return feedback or {}
+
+
+def document_for(result):
+    """Return the indexed text columns for an InterviewResult."""
+    feedback = _feedback_payload(result)
+    # The per-question items repeat the question/answer text; only index what
+    # the feedback itself adds.
+    feedback_text = _flatten({k: v for k, v in feedback.items() if k != 'questions'})
+    for item in feedback.get('questions') or []:
+        if isinstance(item, dict):
+            feedback_text.extend(_flatten(item.get('feedback')))
+    return {
+        'questions': '\n'.join(_flatten(result.questions)),
+        'answers': '\n'.join(_flatten(result.answers)),
+        'transcripts': '\n'.join(_flatten(result.voice_transcripts)),
+        'feedback': '\n'.join(feedback_text),
+    }
+
+
+class SearchBackend(ABC):
+    """Interface every search backend implements."""
+
+    @abstractmethod
+    def index(self, result):
+        """Add or replace ``result`` in the index."""
+
+    @abstractmethod
+    def remove(self, pk):
+        """Drop the result with primary key ``pk`` from the index."""
+
+    @abstractmethod
+    def search(self, query, limit=50):
+        """Return matching InterviewResult primary keys, best match first."""
+
+    def rebuild(self, queryset):
+        for result in queryset.iterator(chunk_size=500):
+            self.index(result)
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """FTS5 index keyed by InterviewResult.pk (the table's rowid)."""
+
+    def index(self, result):
+        doc = document_for(result)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [result.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, questions, answers, transcripts, feedback) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [result.pk, doc['questions'], doc['answers'], doc['transcripts'], doc['feedback']],
+            )
+
+    def remove(self, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+    def search(self, query, limit=50):
+        match = self.build_match(query)
+        if not match:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s',
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def build_match(query):
+        """Quote each term so user input can never be parsed as FTS syntax."""
+        terms = [t.replace('"', '""') for t in (query or '').split()]
+        return ' '.join(f'"{t}"' for t in terms if t)
+
+
+class LikeSearchBackend(SearchBackend):
+    """Fallback for databases without FTS5: a LIKE scan over the JSON columns."""
+
+    fields = ('questions', 'answers', 'voice_transcripts', 'ai_feedback')
+
+    def index(self, result):
+        pass
+
+    def remove(self, pk):
+        pass
+
+    def search(self, query, limit=50):
+        from .models import InterviewResult
+
+        terms = (query or '').split()
+        if not terms:
+            return []
+        qs = InterviewResult.objects.all()
+        for term in terms:
+            match = Q()
+            for field in self.fields:
+                match |= Q(**{f'{field}__icontains': term})
+            qs = qs.filter(match)
+        return list(qs.order_by('-created_at').values_list('pk', flat=True)[:limit])
+
+
+_backend = None
+
+
+def get_search_backend():
+    """Return the configured backend, defaulting on the database vendor."""
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'FEEDBACK_SEARCH_BACKEND', None)
+        if path:
+            _backend = import_string(path)()
+        elif connection.vendor == 'sqlite':
+            _backend = SQLiteFTSBackend()
+        else:
+            _backend = LikeSearchBackend()
+    return _backend
@@ -0,0 +1,11 @@
+from rest_framework import serializers
+from .models import InterviewResult
+
+
+class InterviewResultSearchSerializer(serializers.ModelSerializer):
+    """Serializer for a single full-text search hit."""
+    username = serializers.CharField(source='user.username')
+
+    class Meta:
+        model = InterviewResult
+        fields = ['id', 'username', 'name', 'role', 'interview_type', 'overall_score', 'grade_label', 'created_at']
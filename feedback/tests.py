@@ -1,3 +1,247 @@
-from django.test import TestCase
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import InterviewResult
+from .search import get_search_backend
+
+
+def make_result(user, **overrides):
+    fields = {
+        'user': user,
+        'name': 'Candidate',
+        'role': 'Backend Developer',
+        'experience': 3,
+        'mode': 'voice',
+        'questions': ['Describe a challenging technical problem you have solved.'],
+        'answers': [''],
+        'voice_transcripts': ['We migrated the billing service to Kubernetes.'],
+        'ai_feedback': {'summary': 'Solid answers', 'strengths': ['Clear on observability']},
+    }
+    fields.update(overrides)
+    return InterviewResult.objects.create(**fields)
+
+
+class InterviewResultSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='cand@example.com', password='pw')
+        self.staff = User.objects.create_user(username='staff@example.com', password='pw', is_staff=True)
+
+    def test_index_follows_save_and_delete(self):
+        backend = get_search_backend()
+        result = make_result(self.user)
+        self.assertEqual(backend.search('kubernetes'), [result.pk])
+        self.assertEqual(backend.search('observability'), [result.pk])
+
+        result.voice_transcripts = ['We rewrote it in Rust.']
+        result.save()
+        self.assertEqual(backend.search('kubernetes'), [])
+        self.assertEqual(backend.search('rust'), [result.pk])
+
+        pk = result.pk
+        result.delete()
+        self.assertEqual(backend.search('rust'), [])
+        self.assertNotIn(pk, backend.search('rewrote'))
+
+    def test_query_syntax_is_escaped(self):
+        make_result(self.user)
+        self.assertEqual(get_search_backend().search('billing AND "OR ('), [])
+
+    def test_staff_api(self):
+        result = make_result(self.user)
+        url = reverse('interview_result_search')
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url, {'q': 'billing'}).status_code, 403)
+
+        self.client.force_login(self.staff)
+        data = self.client.get(url, {'q': 'billing'}).json()
+        self.assertEqual([r['id'] for r in data['results']], [result.pk])
+        for limit in ('0', '-1', 'many'):
+            self.assertEqual(self.client.get(url, {'q': 'billing', 'limit': limit}).status_code, 400)
+
+    def test_admin_search_includes_content_matches(self):
+        result = make_result(self.user)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = self.client.get(reverse('admin:feedback_interviewresult_changelist'), {'q': 'kubernetes'})
+        self.assertEqual([r.pk for r in response.context['cl'].result_list], [result.pk])
+
+
+class RescoreResultsCommandTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='cand@example.com', password='pw')
+
+    def run_command(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command('rescore_results', *args, stdout=out)
+        return out.getvalue()
+
+    def test_rescore_overwrites_static_scores_and_keeps_extra_keys(self):
+        results = [
+            make_result(self.user, overall_score=75, grade_label='B',
+                        ai_feedback={'summary': 'Static', 'answer_relevance': 0.5})
+            for _ in range(5)
+        ]
+        output = self.run_command('--workers', '0', '--batch-size', '2', '--chunk-size', '3')
+        self.assertIn('Re-scored 5 results', output)
+        for result in results:
+            result.refresh_from_db()
+            self.assertNotEqual((result.overall_score, result.grade_label), (75, 'B'))
+            self.assertEqual(result.ai_feedback['answer_relevance'], 0.5)
+            self.assertEqual(result.ai_feedback['questions'][0]['answer'], result.voice_transcripts[0])
+
+    def test_skips_pending_and_readies_failed_results(self):
+        pending = make_result(self.user, overall_score=75, feedback_status=InterviewResult.FEEDBACK_PENDING)
+        failed = make_result(self.user, overall_score=75, feedback_status=InterviewResult.FEEDBACK_FAILED)
+        output = self.run_command('--workers', '0')
+        self.assertIn('Re-scored 1 results', output)
+        pending.refresh_from_db()
+        failed.refresh_from_db()
+        self.assertEqual((pending.overall_score, pending.feedback_status), (75, InterviewResult.FEEDBACK_PENDING))
+        self.assertEqual(failed.feedback_status, InterviewResult.FEEDBACK_READY)
+        self.assertNotEqual(failed.overall_score, 75)
+
+    def test_resumes_from_checkpoint(self):
+        import tempfile
+
+        first, second = make_result(self.user, overall_score=75), make_result(self.user, overall_score=75)
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = f'{directory}/rescore.json'
+            with open(checkpoint, 'w') as fh:
+                json.dump({'last_pk': first.pk, 'processed': 1}, fh)
+            output = self.run_command('--workers', '2', '--checkpoint', checkpoint)
+            with open(checkpoint) as fh:
+                self.assertEqual(json.load(fh), {'last_pk': second.pk, 'processed': 2})
+        self.assertIn('Re-scored 1 results', output)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.overall_score, 75)
+        self.assertNotEqual(second.overall_score, 75)
+
+
+@override_settings(ANSWER_RELEVANCE_ENABLED=False)
+class RequeueFeedbackCommandTests(TestCase):
+    def test_requeues_only_stale_pending_results(self):
+        from datetime import timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+
+        from users.services.events import EventBroker
+
+        user = User.objects.create_user(username='cand@example.com', password='pw')
+        stale = make_result(user, feedback_status=InterviewResult.FEEDBACK_PENDING, ai_feedback={})
+        fresh = make_result(user, feedback_status=InterviewResult.FEEDBACK_PENDING, ai_feedback={})
+        InterviewResult.objects.filter(pk=stale.pk).update(created_at=timezone.now() - timedelta(hours=1))
+
+        out = StringIO()
+        # A private broker keeps these events out of the shared one other tests inspect.
+        with mock.patch('users.services.feedback_jobs.get_event_broker', return_value=EventBroker()):
+            call_command('requeue_feedback', '--older-than', '600', stdout=out)
+        self.assertIn('Generated feedback for 1 stale', out.getvalue())
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.feedback_status, InterviewResult.FEEDBACK_READY)
+        self.assertTrue(stale.ai_feedback['questions'])
+        self.assertEqual(fresh.feedback_status, InterviewResult.FEEDBACK_PENDING)
+
+        self.client.force_login(user)
+        fragment = self.client.get(reverse('result_detail', args=[fresh.pk]), {'fragment': 1})
+        self.assertEqual(fragment['X-Feedback-Status'], 'pending')
+
+
+class InterviewResultExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='cand@example.com', password='pw')
+        self.staff = User.objects.create_user(username='staff@example.com', password='pw', is_staff=True)
+        self.results = [
+            make_result(self.user, role='Backend Developer', interview_type='technical'),
+            make_result(self.user, role='Data Scientist', interview_type='behavioral'),
+            make_result(self.user, role='backend developer', interview_type='technical'),
+        ]
+
+    def export(self, **params):
+        response = self.client.get(reverse('interview_result_export'), params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_staff_only(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('interview_result_export')).status_code, 403)
+
+    def test_ndjson_filters_and_resume(self):
+        from .export import format_cursor
+
+        self.client.force_login(self.staff)
+        response, body = self.export(role='Backend Developer', interview_type='technical')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([r['id'] for r in rows], [self.results[0].pk, self.results[2].pk])
+        self.assertEqual(rows[0]['username'], 'cand@example.com')
+        self.assertEqual(rows[0]['ai_feedback']['summary'], 'Solid answers')
+
+        first = self.results[0]
+        _, body = self.export(after=format_cursor(first.created_at, first.pk))
+        self.assertEqual([json.loads(line)['id'] for line in body.splitlines()],
+                         [self.results[1].pk, self.results[2].pk])
+
+    def test_csv_and_bad_params(self):
+        import csv
+
+        self.client.force_login(self.staff)
+        _, body = self.export(export_format='csv', interview_type='behavioral')
+        header, row = list(csv.reader(body.splitlines()))
+        self.assertEqual(row[header.index('role')], 'Data Scientist')
+        self.assertEqual(json.loads(row[header.index('questions')]), self.results[1].questions)
+        self.assertEqual(self.client.get(reverse('interview_result_export'), {'since': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('interview_result_export'), {'after': '42'}).status_code, 400)
+
+    async def test_async_export_fetches_chunks_as_consumed(self):
+        from unittest import mock
+        from . import export
+
+        fetched = []
+        real_iter_chunks = export.iter_chunks
+
+        def iter_chunks(queryset, after=None, chunk_size=export.CHUNK_SIZE):
+            for rows in real_iter_chunks(queryset, after=after, chunk_size=1):
+                fetched.append(len(rows))
+                yield rows
+
+        await self.async_client.aforce_login(self.staff)
+        with mock.patch.object(export, 'iter_chunks', iter_chunks):
+            response = await self.async_client.get(reverse('interview_result_export'))
+            self.assertTrue(response.is_async)
+            self.assertEqual(fetched, [])
+            lines = aiter(response.streaming_content)
+            first = json.loads(await anext(lines))
+            self.assertEqual(first['id'], self.results[0].pk)
+            self.assertEqual(fetched, [1])
+            rest = [json.loads(line)['id'] async for line in lines]
+        self.assertEqual(rest, [self.results[1].pk, self.results[2].pk])
+        self.assertEqual(fetched, [1, 1, 1])
+
+    def test_command_resumes_from_checkpoint(self):
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+
+        with tempfile.TemporaryDirectory() as directory:
+            output, checkpoint = f'{directory}/results.ndjson', f'{directory}/export.json'
+            args = ['--output', output, '--checkpoint', checkpoint, '--chunk-size', '2']
+            call_command('export_results', *args, stderr=StringIO())
+            make_result(self.user, role='SRE')
+            err = StringIO()
+            call_command('export_results', *args, stderr=err)
+            with open(output) as fh:
+                ids = [json.loads(line)['id'] for line in fh]
+            with open(checkpoint) as fh:
+                state = json.load(fh)
+        self.assertIn('Exported 1 results', err.getvalue())
+        self.assertEqual(ids, sorted(InterviewResult.objects.values_list('pk', flat=True)))
+        self.assertEqual(state['exported'], 4)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import InterviewResultExportAPIView, InterviewResultSearchAPIView
+
+urlpatterns = [
+    path('api/search/', InterviewResultSearchAPIView.as_view(), name='interview_result_search'),
+    path('api/export/', InterviewResultExportAPIView.as_view(), name='interview_result_export'),
+]
@@ -1,3 +1,76 @@
-from django.shortcuts import render
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from rest_framework import status
+from . import export
+from .models import InterviewResult
+from .search import get_search_backend
+from .serializers import InterviewResultSearchSerializer
 
-# Create your views here.
+
+class InterviewResultSearchAPIView(APIView):
+    """Staff-only full-text search over interview questions, answers and feedback."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'Query parameter q is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', 50))
+        except ValueError:
+            limit = 0
+        # SQLite reads a negative LIMIT as no limit at all.
+        if limit < 1:
+            return Response({'error': 'limit must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(limit, 200)
+
+        ids = get_search_backend().search(query, limit=limit)
+        by_pk = InterviewResult.objects.select_related('user').in_bulk(ids)
+        results = [by_pk[pk] for pk in ids if pk in by_pk]
+        return Response({
+            'query': query,
+            'count': len(results),
+            'results': InterviewResultSearchSerializer(results, many=True).data,
+        })
+
+
+class InterviewResultExportAPIView(APIView):
+    """Staff-only streaming export of interview results as NDJSON or CSV.
+
+    Filters: ``since``/``until`` (inclusive dates or datetimes), ``role`` and
+    ``interview_type``. Resume an interrupted export by passing the
+    ``created_at`` and ``id`` of the last row received as ``after=<created_at>,<id>``.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        params = request.query_params
+        # Not ``format``: DRF reserves that parameter for renderer selection.
+        fmt = params.get('export_format', 'ndjson')
+        if fmt not in export.FORMATS:
+            return Response({'error': f'export_format must be one of {", ".join(export.FORMATS)}.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            queryset = export.filtered_results(
+                since=params.get('since'), until=params.get('until'),
+                role=params.get('role'), interview_type=params.get('interview_type'),
+            )
+            after = export.parse_cursor(params['after']) if params.get('after') else None
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # A resumed CSV export continues the earlier file, so it has no header row.
+        header = after is None
+        # Under ASGI Django reads a sync iterator into a list before sending; stream an async one.
+        if isinstance(request._request, ASGIRequest):
+            lines = export.aencode(export.aiter_rows(queryset, after=after), fmt, header=header)
+        else:
+            lines = export.encode(export.iter_rows(queryset, after=after), fmt, header=header)
+        response = StreamingHttpResponse(lines, content_type=export.CONTENT_TYPES[fmt])
+        filename = f'interview-results-{timezone.now():%Y%m%d%H%M%S}.{fmt}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -0,0 +1,74 @@
+"""Cache and session settings from the environment (and .env, via load_dotenv()).
+
+``CACHE_BACKEND`` selects the cache: ``locmem`` (the default; per process),
+``file`` (shared by the processes on one machine, under ``CACHE_LOCATION``,
+default ``<project>/cache``) or ``redis`` (any Redis-compatible server, such
+as a local Redis or Valkey, at ``CACHE_LOCATION``). Two caches are defined:
+``default`` and ``sessions``, so session entries are not evicted by other
+cached data.
+
+``SESSION_BACKEND`` selects where sessions live:
+
+* ``db`` (the default) - the database only; every request that modifies the
+  session writes it.
+* ``cached_db`` - written through to the database, read from the cache.
+  Removes the session reads from the database.
+* ``cache`` - the cache only, so interview steps do not write to the database
+  at all.
+
+The cache-backed engines need a cache every worker process shares, so they
+are refused with ``locmem``: under ``uvicorn --workers N`` each worker would
+read its own stale copy of the session (``cached_db``) or none at all
+(``cache``). Use ``file`` or ``redis`` with them.
+"""
+import os
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+}
+# Entries kept per cache before culling (locmem and file backends).
+MAX_ENTRIES = {'default': 1000, 'sessions': 10000}
+
+
+def _choice(env, name, choices, default):
+    value = env.get(name, default).strip().lower()
+    if value not in choices:
+        raise ValueError(f"{name} must be one of {', '.join(choices)}, not {value!r}")
+    return value
+
+
+def cache_config(env=None, base_dir=''):
+    """The ``CACHES`` dict described by ``env`` (defaults to os.environ)."""
+    env = os.environ if env is None else env
+    backend = _choice(env, 'CACHE_BACKEND', CACHE_BACKENDS, 'locmem')
+    location = env.get('CACHE_LOCATION')
+    caches = {}
+    for alias, max_entries in MAX_ENTRIES.items():
+        config = {'BACKEND': CACHE_BACKENDS[backend]}
+        if backend == 'locmem':
+            config['LOCATION'] = alias
+        elif backend == 'file':
+            config['LOCATION'] = os.path.join(location or os.path.join(base_dir, 'cache'), alias)
+        else:
+            config['LOCATION'] = location or 'redis://127.0.0.1:6379/0'
+            config['KEY_PREFIX'] = alias
+        if backend != 'redis':
+            config['OPTIONS'] = {'MAX_ENTRIES': max_entries}
+        caches[alias] = config
+    return caches
+
+
+def session_engine(env=None):
+    """``SESSION_ENGINE`` for the ``SESSION_BACKEND`` in ``env``."""
+    env = os.environ if env is None else env
+    backend = _choice(env, 'SESSION_BACKEND', SESSION_ENGINES, 'db')
+    if backend != 'db' and _choice(env, 'CACHE_BACKEND', CACHE_BACKENDS, 'locmem') == 'locmem':
+        raise ValueError(f'SESSION_BACKEND={backend} needs a shared cache; set CACHE_BACKEND to file or redis')
+    return SESSION_ENGINES[backend]
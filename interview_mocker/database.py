@@ -0,0 +1,98 @@
+"""Database settings from the environment (and .env, via load_dotenv()).
+
+``DB_ENGINE`` selects the backend: ``sqlite`` (the default) or ``postgres``.
+
+SQLite settings: ``DB_NAME`` (a path; defaults to db.sqlite3 in the project).
+
+PostgreSQL settings: ``DB_NAME``, ``DB_USER``, ``DB_PASSWORD``, ``DB_HOST``,
+``DB_PORT`` and, for Django's native connection pool (psycopg 3 with
+psycopg_pool), ``DB_POOL`` (on by default), ``DB_POOL_MIN_SIZE``,
+``DB_POOL_MAX_SIZE`` and ``DB_POOL_TIMEOUT``. The pool opens its minimum
+connections in the background, so requests borrow an open connection rather
+than connecting.
+
+Both: ``DB_CONN_MAX_AGE`` (seconds to keep a connection between requests;
+``none`` keeps it indefinitely) and ``DB_CONN_HEALTH_CHECKS``, which checks a
+reused connection before the request uses it. Django's pool manages its own
+connections, so persistent connections are switched off while it is in use.
+Under ASGI each request's database work runs on a fresh thread, so persistent
+connections are not reused there; serve PostgreSQL through the pool instead.
+
+Run the test suite against a local PostgreSQL with e.g.:
+
+    DB_ENGINE=postgres DB_NAME=interview_mocker DB_USER=postgres python manage.py test
+"""
+import os
+
+# Applied to every new SQLite connection. WAL lets reads proceed alongside the
+# single writer; with WAL, synchronous=NORMAL only fsyncs at checkpoints.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms to wait for the write lock before "database is locked"
+    'cache_size': -20000,  # negative means KiB, so ~20 MB of page cache
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+ENGINES = {
+    'sqlite': 'django.db.backends.sqlite3',
+    'postgres': 'django.db.backends.postgresql',
+}
+# Seconds a connection is kept between requests.
+DEFAULT_CONN_MAX_AGE = 60
+
+
+def _flag(value):
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _conn_max_age(value, default):
+    if value is None or value == '':
+        return default
+    if value.strip().lower() == 'none':
+        return None  # unlimited
+    return int(value)
+
+
+def database_config(env=None, base_dir=''):
+    """The ``DATABASES['default']`` dict described by ``env`` (defaults to os.environ)."""
+    env = os.environ if env is None else env
+    engine = env.get('DB_ENGINE', 'sqlite').strip().lower()
+    if engine in ('postgresql', 'psql'):
+        engine = 'postgres'
+    if engine not in ENGINES:
+        raise ValueError(f"DB_ENGINE must be one of {', '.join(ENGINES)}, not {engine!r}")
+
+    config = {
+        'ENGINE': ENGINES[engine],
+        'CONN_MAX_AGE': _conn_max_age(env.get('DB_CONN_MAX_AGE'), DEFAULT_CONN_MAX_AGE),
+        'CONN_HEALTH_CHECKS': _flag(env.get('DB_CONN_HEALTH_CHECKS', 'true')),
+    }
+    if engine == 'sqlite':
+        config['NAME'] = env.get('DB_NAME') or os.path.join(base_dir, 'db.sqlite3')
+        config['OPTIONS'] = {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            # Take the write lock when a transaction starts, so busy_timeout can wait
+            # for it; a deferred transaction that upgrades to a write fails at once.
+            'transaction_mode': 'IMMEDIATE',
+        }
+        return config
+
+    config.update({
+        'NAME': env.get('DB_NAME', 'interview_mocker'),
+        'USER': env.get('DB_USER', ''),
+        'PASSWORD': env.get('DB_PASSWORD', ''),
+        'HOST': env.get('DB_HOST', ''),
+        'PORT': env.get('DB_PORT', ''),
+        'OPTIONS': {},
+    })
+    if _flag(env.get('DB_POOL', 'true')):
+        config['OPTIONS']['pool'] = {
+            'min_size': int(env.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(env.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': float(env.get('DB_POOL_TIMEOUT', 10)),
+        }
+        # Pooled connections are returned to the pool after each request.
+        config['CONN_MAX_AGE'] = 0
+    return config
@@ -1,6 +1,12 @@
 import os
 from dotenv import load_dotenv
 
+from .cache import cache_config, session_engine
+from .database import database_config
+
+# Read .env before any setting that depends on the environment.
+load_dotenv()
+
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -38,6 +44,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'users.middleware.RequestMetricsMiddleware',
+    'users.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -66,18 +74,24 @@ TEMPLATES = [
     },
 ]
 
+# Serve with an ASGI server (uvicorn interview_mocker.asgi:application): the
+# interview views are async and the event streams are long-lived. Under WSGI
+# each async view runs on a worker thread, and the event streams answer 204.
+ASGI_APPLICATION = 'interview_mocker.asgi.application'
 WSGI_APPLICATION = 'interview_mocker.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+    'default': database_config(base_dir=BASE_DIR),
 }
 
+# Caches and sessions (see interview_mocker/cache.py)
+CACHES = cache_config(base_dir=BASE_DIR)
+SESSION_ENGINE = session_engine()
+SESSION_CACHE_ALIAS = 'sessions'
+
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
 
@@ -119,6 +133,59 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Answer relevance embeddings (see users/services/embedding_service.py)
+ANSWER_RELEVANCE_ENABLED = True
+EMBEDDING_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+EMBEDDING_INDEX_DIR = os.path.join(BASE_DIR, 'embeddings')
+# After the model fails to load, seconds before loading is retried.
+EMBEDDING_RETRY_SECONDS = 300
+
+# Seconds before a process reloads the question bank to pick up imported questions
+# (see users/services/question_bank.py).
+QUESTION_BANK_TTL = 300
+
+# Speech-to-text (see users/services/transcription_service.py)
+WHISPER_MODEL_NAME = 'base'
+# Both transcription call sites share one language so their cache keys agree.
+WHISPER_LANGUAGE = 'en'
+TRANSCRIPT_CACHE_SIZE = 128
+# Set to a directory to persist transcripts across restarts and processes.
+TRANSCRIPT_CACHE_DIR = None
+# Threads for transcription, embedding and generation (see users/services/inference.py).
+# Defaults to the CPU count, capped at 4.
+INFERENCE_WORKERS = None
+# Requests' inference jobs allowed running or queued at once; beyond this they
+# get 429 with Retry-After: INFERENCE_RETRY_AFTER. Defaults to 4 per worker.
+INFERENCE_MAX_CONCURRENCY = None
+INFERENCE_RETRY_AFTER = 5
+
+# Prometheus metrics at /metrics/ (see users/services/metrics.py): staff, or
+# this bearer token for scrapers.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN') or None
+
+# Request profiling (see users/services/profiling.py). Saved profiles are listed
+# at /admin/profiles/.
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED') == 'True'
+# 'cprofile' traces only the request's own thread, so async views (such as
+# interview_run) are always sampled instead.
+PROFILING_MODE = os.getenv('PROFILING_MODE', 'sample')  # or 'cprofile'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+# Keep the profile of any captured request slower than this many seconds.
+PROFILING_SLOW_SECONDS = float(os.getenv('PROFILING_SLOW_SECONDS')) if os.getenv('PROFILING_SLOW_SECONDS') else None
+PROFILING_VIEWS = ['interview_run']  # View names to profile; empty for all
+PROFILING_INTERVAL = 0.005
+PROFILING_DIR = os.path.join(BASE_DIR, 'profiles')
+PROFILING_MAX_FILES = 100
+
+# Token-bucket rate limits per user, or per IP when anonymous (see
+# users/services/rate_limit.py).
+RATE_LIMITS = {
+    'inference_api': '30/min',  # Interview start and feedback API, one token per interview
+    'clip_upload': '30/min',
+    'frame_upload': '30/min',  # The page sends a frame every 5 seconds
+    'stats': '60/min',
+}
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -135,9 +202,6 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:3000",
 ]
 
-load_dotenv()
-
-
 DEBUG = os.getenv("DEBUG") == "True"
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "").split(",")
 
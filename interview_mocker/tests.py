@@ -0,0 +1,94 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from .cache import SESSION_ENGINES, cache_config, session_engine
+from .database import database_config
+
+
+class DatabaseConfigTests(SimpleTestCase):
+    def test_sqlite_default(self):
+        config = database_config({}, base_dir='/srv/app')
+        self.assertEqual(config['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(config['NAME'], '/srv/app/db.sqlite3')
+        self.assertEqual(config['CONN_MAX_AGE'], 60)
+        self.assertIn('PRAGMA journal_mode=WAL', config['OPTIONS']['init_command'])
+
+    def test_postgres_pool_disables_persistent_connections(self):
+        config = database_config({
+            'DB_ENGINE': 'postgresql', 'DB_NAME': 'interviews', 'DB_HOST': 'db',
+            'DB_POOL_MAX_SIZE': '20', 'DB_CONN_MAX_AGE': '600',
+        })
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(config['OPTIONS']['pool'], {'min_size': 2, 'max_size': 20, 'timeout': 10.0})
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+
+    def test_postgres_without_pool(self):
+        config = database_config({'DB_ENGINE': 'postgres', 'DB_POOL': 'off', 'DB_CONN_MAX_AGE': 'none'})
+        self.assertNotIn('pool', config['OPTIONS'])
+        self.assertIsNone(config['CONN_MAX_AGE'])
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            database_config({'DB_ENGINE': 'mysql'})
+
+
+class CacheConfigTests(SimpleTestCase):
+    def test_defaults(self):
+        caches = cache_config({})
+        self.assertEqual(set(caches), {'default', 'sessions'})
+        self.assertEqual(caches['sessions']['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+        self.assertNotEqual(caches['default']['LOCATION'], caches['sessions']['LOCATION'])
+        self.assertEqual(session_engine({}), 'django.contrib.sessions.backends.db')
+
+    def test_file_and_redis(self):
+        caches = cache_config({'CACHE_BACKEND': 'file'}, base_dir='/srv/app')
+        self.assertEqual(caches['sessions']['LOCATION'], '/srv/app/cache/sessions')
+        caches = cache_config({'CACHE_BACKEND': 'redis', 'CACHE_LOCATION': 'redis://cache:6379/1'})
+        self.assertEqual(caches['sessions']['LOCATION'], 'redis://cache:6379/1')
+        self.assertEqual(caches['sessions']['KEY_PREFIX'], 'sessions')
+        with self.assertRaises(ValueError):
+            session_engine({'SESSION_BACKEND': 'signed_cookies'})
+
+    def test_cache_sessions_need_a_shared_cache(self):
+        for backend in ('cache', 'cached_db'):
+            with self.assertRaises(ValueError):
+                session_engine({'SESSION_BACKEND': backend})
+            with self.assertRaises(ValueError):
+                session_engine({'SESSION_BACKEND': backend, 'CACHE_BACKEND': 'locmem'})
+            self.assertEqual(session_engine({'SESSION_BACKEND': backend, 'CACHE_BACKEND': 'redis'}),
+                             SESSION_ENGINES[backend])
+        self.assertEqual(session_engine({'SESSION_BACKEND': 'cached_db', 'CACHE_BACKEND': 'file'}),
+                         SESSION_ENGINES['cached_db'])
+
+
+@override_settings(SESSION_ENGINE=SESSION_ENGINES['cache'], ANSWER_RELEVANCE_ENABLED=False)
+class CacheSessionTests(TestCase):
+    def test_interview_steps_do_not_write_sessions_to_the_database(self):
+        from django.contrib.auth.models import User
+        from django.contrib.sessions.models import Session
+
+        self.client.force_login(User.objects.create_user(username='cand@example.com', password='pw'))
+        self.client.post(reverse('mock_interview'), {
+            'name': 'Candidate', 'role': 'Developer', 'experience': 'Mid',
+            'interview_type': 'technical', 'mode': 'text',
+        })
+        interview_id = self.client.session['interview_data']['interview_id']
+        self.client.post(reverse('interview_run'), {
+            'answer': 'First answer.', 'interview_id': interview_id, 'question_idx': 0,
+        })
+        self.assertEqual(self.client.session['interview_answers'], ['First answer.'])
+        self.assertFalse(Session.objects.exists())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Runs with DB_ENGINE=postgres against a local server.')
+class PostgresPoolTests(TestCase):
+    def test_queries_run_on_pooled_connections(self):
+        from django.contrib.auth.models import User
+
+        User.objects.create_user(username='pool@example.com')
+        self.assertIsNotNone(connection.pool)
+        self.assertEqual(User.objects.filter(username='pool@example.com').count(), 1)
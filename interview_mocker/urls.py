@@ -20,10 +20,15 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from users.admin import request_profile_download, request_profiles_view
+
 urlpatterns = [
+    path('admin/profiles/', admin.site.admin_view(request_profiles_view), name='request_profiles'),
+    path('admin/profiles/<str:name>', admin.site.admin_view(request_profile_download), name='request_profile_download'),
     path('admin/', admin.site.urls),
     path('', include('users.urls')),
     path('blog/', include('blog.urls')),
+    path('feedback/', include('feedback.urls')),
 ]
 
 
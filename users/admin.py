@@ -1,7 +1,19 @@
 
 # Register your models here.
-from django.contrib import admin
-from .models import Profile
+import io
+
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from .models import Profile, Question
+from .services.profiling import get_profile_store
+from .services.question_bank import question_hash, reload_question_bank
+from .services.question_import import format_for, import_questions
 
 admin.site.site_header = "AI Interview Mocker Admin"
 admin.site.site_title = "AI Interview Mocker Portal"
@@ -13,3 +25,97 @@ class ProfileAdmin(admin.ModelAdmin):
 	list_display = ("user", "full_name", "role", "years_experience", "created_at")
 	search_fields = ("user__username", "full_name", "role")
 
+
+
+class QuestionImportForm(forms.Form):
+	file = forms.FileField(help_text="CSV with text, level and interview_type columns, or JSONL with the same keys.")
+
+
+class QuestionAdminForm(forms.ModelForm):
+	class Meta:
+		model = Question
+		fields = "__all__"
+
+	def clean(self):
+		# text_hash is read-only in the admin, so the model's unique constraint
+		# is not validated by the form; check for the duplicate here instead.
+		cleaned_data = super().clean()
+		text, level, interview_type = (cleaned_data.get(f) for f in ("text", "level", "interview_type"))
+		if text and level and interview_type:
+			duplicates = Question.objects.filter(
+				text_hash=question_hash(text), level=level, interview_type=interview_type,
+			).exclude(pk=self.instance.pk)
+			if duplicates.exists():
+				raise forms.ValidationError("This question is already in the bank for that level and interview type.")
+		return cleaned_data
+
+
+@admin.register(Question)
+class QuestionAdmin(admin.ModelAdmin):
+	form = QuestionAdminForm
+	list_display = ("text", "level", "interview_type", "source", "created_at")
+	list_filter = ("level", "interview_type", "source")
+	search_fields = ("text",)
+	readonly_fields = ("text_hash", "source", "created_at")
+	change_list_template = "admin/users/question/change_list.html"
+
+	def get_urls(self):
+		return [
+			path("import/", self.admin_site.admin_view(self.import_view), name="users_question_import"),
+		] + super().get_urls()
+
+	def import_view(self, request):
+		"""Upload a question file; it is streamed through the same importer as manage.py import_questions."""
+		if not self.has_add_permission(request):
+			raise PermissionDenied
+		form = QuestionImportForm(request.POST or None, request.FILES or None)
+		if request.method == "POST" and form.is_valid():
+			upload = form.cleaned_data["file"]
+			try:
+				# Large uploads are spooled to a temporary file by Django; read it as text, line by line.
+				text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+				report = import_questions(text, format_for(upload.name), source=upload.name)
+			except ValueError as e:
+				form.add_error("file", str(e))
+			else:
+				self.message_user(request, f"Questions: {report}.", messages.SUCCESS)
+				for error in report.errors[:10]:
+					self.message_user(request, error, messages.WARNING)
+				return redirect("admin:users_question_changelist")
+		context = {
+			**self.admin_site.each_context(request),
+			"opts": self.model._meta,
+			"form": form,
+			"title": "Import questions",
+		}
+		return TemplateResponse(request, "admin/users/question/import.html", context)
+
+	def save_model(self, request, obj, form, change):
+		obj.text_hash = question_hash(obj.text)
+		super().save_model(request, obj, form, change)
+		reload_question_bank()
+
+	def delete_model(self, request, obj):
+		super().delete_model(request, obj)
+		reload_question_bank()
+
+	def delete_queryset(self, request, queryset):
+		super().delete_queryset(request, queryset)
+		reload_question_bank()
+
+
+def request_profiles_view(request):
+	"""Staff page listing the profiles saved by ProfilingMiddleware."""
+	context = {
+		**admin.site.each_context(request),
+		"title": "Request profiles",
+		"profiles": get_profile_store().entries(),
+	}
+	return TemplateResponse(request, "admin/request_profiles.html", context)
+
+
+def request_profile_download(request, name):
+	path = get_profile_store().path(name)
+	if path is None:
+		raise Http404()
+	return FileResponse(open(path, "rb"), as_attachment=True, filename=name)
@@ -0,0 +1,43 @@
+"""Async support for Django REST framework views.
+
+DRF's APIView dispatches synchronously. AsyncAPIView keeps its request
+parsing, authentication, permissions and response rendering, but lets the
+handlers be coroutines so they can await inference without holding a thread.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import Throttled
+from rest_framework.views import APIView
+
+from .services.inference import InferenceBusy
+
+
+class AsyncAPIView(APIView):
+    """APIView whose ``get``/``post``/... handlers are ``async def``."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authentication may hit the session store and the database.
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except InferenceBusy as exc:
+            # Shed load as DRF does for throttling: 429 with Retry-After.
+            response = self.handle_exception(Throttled(wait=exc.retry_after))
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from users.services.embedding_service import get_embedding_model, get_question_index
+from users.services.question_bank import all_question_templates
+
+
+class Command(BaseCommand):
+    help = 'Precompute embeddings for every question template into the memory-mapped index.'
+
+    def handle(self, *args, **options):
+        index = get_question_index()
+        count = index.build(get_embedding_model(), all_question_templates())
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} questions into {index.matrix_path}'))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.services.question_import import BATCH_SIZE, FORMATS, format_for, import_questions
+
+
+class Command(BaseCommand):
+    help = 'Import interview questions from a CSV or JSONL file into the question bank.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (text, level, interview_type columns) or JSONL file.')
+        parser.add_argument('--format', choices=FORMATS, dest='file_format',
+                            help='File format; inferred from the extension by default.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='Questions inserted per bulk_create.')
+        parser.add_argument('--build-embeddings', action='store_true',
+                            help='Rebuild the question embedding index afterwards.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        try:
+            fmt = options['file_format'] or format_for(path)
+            # utf-8-sig: spreadsheets often save CSV with a byte order mark.
+            with open(path, encoding='utf-8-sig', newline='') as fh:
+                report = import_questions(fh, fmt, source=path, batch_size=options['batch_size'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in report.errors:
+            self.stderr.write(error)
+        self.stdout.write(self.style.SUCCESS(f'Questions: {report}.'))
+
+        if options['build_embeddings']:
+            from django.core.management import call_command
+            call_command('build_question_embeddings', stdout=self.stdout)
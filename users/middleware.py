@@ -0,0 +1,112 @@
+"""Request instrumentation middleware (see users/services/metrics.py and profiling.py)."""
+import sys
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import Resolver404, resolve
+
+from .services.metrics import finish_request, start_request, timed
+from .services.profiling import start_capture
+
+
+class RequestMetricsMiddleware:
+    """Records latency and database use per view, and times session writes.
+
+    Listed first in MIDDLEWARE so its timing includes the other middleware,
+    among them SessionMiddleware saving the session.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token, stats = start_request()
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.record(request, token, stats, status, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        token, stats = start_request()
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.record(request, token, stats, status, time.perf_counter() - started)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        session = getattr(request, 'session', None)
+        if session is not None:
+            # Every session backend writes through save(); time it wherever it is called.
+            session.save = timed('session.save')(session.save)
+        return None
+
+    @staticmethod
+    def record(request, token, stats, status, seconds):
+        match = getattr(request, 'resolver_match', None)
+        # View names rather than paths, so the number of series stays bounded.
+        view = match.view_name if match else '<unmatched>'
+        finish_request(token, stats, view, request.method, status, seconds)
+
+
+class ProfilingMiddleware:
+    """Profiles sampled and slow requests when PROFILING_ENABLED is set.
+
+    Otherwise it takes itself out of the middleware chain at startup.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        view, capture = self.start(request, sys._getframe())
+        if capture is None:
+            return self.get_response(request)
+        started = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            capture.finish(view, request.method, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        view, capture = self.start(request, sys._getframe())
+        if capture is None:
+            return await self.get_response(request)
+        started = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            capture.finish(view, request.method, time.perf_counter() - started)
+
+    @staticmethod
+    def start(request, frame):
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None, None
+        return match.view_name, start_capture(match.view_name, iscoroutinefunction(match.func), frame)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 14:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_remove_profile_experience_level_testimonial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Question',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField()),
+                ('text_hash', models.CharField(max_length=64)),
+                ('level', models.CharField(choices=[('fresher', 'Fresher'), ('mid', 'Mid'), ('senior', 'Senior')], max_length=10)),
+                ('interview_type', models.CharField(choices=[('technical', 'Technical'), ('behavioral', 'Behavioral'), ('mixed', 'Mixed')], max_length=20)),
+                ('source', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('text_hash', 'level', 'interview_type'), name='unique_question_per_group')],
+            },
+        ),
+    ]
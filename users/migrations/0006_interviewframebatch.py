@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_question'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewFrameBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('interview_id', models.CharField(db_index=True, max_length=32)),
+                ('metrics', models.JSONField()),
+                ('frame_count', models.PositiveIntegerField()),
+                ('last_thumb', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
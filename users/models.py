@@ -4,6 +4,7 @@
 # Create your models here.
 from django.db import models
 from django.contrib.auth.models import User
+from django.db.backends.signals import connection_created
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -30,8 +31,52 @@ class Testimonial(models.Model):
         return f"Testimonial by {self.user.first_name} {self.user.last_name}"
 
 
+class Question(models.Model):
+    """Interview question imported into the question bank (see users/services/question_bank.py)."""
+    LEVEL_CHOICES = [('fresher', 'Fresher'), ('mid', 'Mid'), ('senior', 'Senior')]
+    INTERVIEW_TYPE_CHOICES = [('technical', 'Technical'), ('behavioral', 'Behavioral'), ('mixed', 'Mixed')]
+
+    text = models.TextField()  # May contain a {role} placeholder
+    text_hash = models.CharField(max_length=64)  # sha256 of the normalised text, for de-duplication
+    level = models.CharField(max_length=10, choices=LEVEL_CHOICES)
+    interview_type = models.CharField(max_length=20, choices=INTERVIEW_TYPE_CHOICES)
+    source = models.CharField(max_length=255, blank=True)  # File the question was imported from
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['text_hash', 'level', 'interview_type'], name='unique_question_per_group'),
+        ]
+
+    def __str__(self):
+        return self.text
+
+
+class InterviewFrameBatch(models.Model):
+    """Metrics of one webcam frame upload during an interview.
+
+    Kept out of the session so frame uploads, which can overlap an answer
+    submission, never write it. Merged into the InterviewResult at final
+    submit and then deleted.
+    """
+    interview_id = models.CharField(max_length=32, db_index=True)
+    metrics = models.JSONField()  # One dict per frame (see users/services/frame_service.py)
+    frame_count = models.PositiveIntegerField()
+    last_thumb = models.TextField(blank=True)  # Thumbnail of the batch's last frame, for motion
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
 	if created:
 		Profile.objects.create(user=instance)
 
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+	"""Count each request's database queries (see users/services/metrics.py), and
+	sample the thread running them with a profiled request (see profiling.py)."""
+	from .services import metrics, profiling
+	for wrapper in (metrics.observe_query, profiling.observe_query):
+		if wrapper not in connection.execute_wrappers:
+			connection.execute_wrappers.append(wrapper)
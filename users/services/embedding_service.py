@@ -0,0 +1,197 @@
+"""Answer-to-question relevance using a small local sentence-embedding model.
+
+The model is loaded once per process and kept warm. Embeddings for every
+question template in the bank are precomputed into a ``.npy`` matrix that is
+memory-mapped at runtime, so scoring an interview only has to encode the
+candidate's answers, in a single batch.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from .metrics import span, timed
+
+DEFAULT_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+# Stand-in for the {role} placeholder when embedding templates.
+ROLE_STAND_IN = 'this role'
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def question_key(question, role=''):
+    """Role-independent lookup key: templates and generated questions agree."""
+    text = question or ''
+    if role:
+        text = text.replace(role, '{role}')
+    return _SPACE_RE.sub(' ', text).strip().lower()
+
+
+class EmbeddingModel:
+    """Mean-pooled, L2-normalised sentence embeddings from a transformers model."""
+
+    def __init__(self, model_name=None, batch_size=32):
+        import torch
+        from transformers import AutoTokenizer, AutoModel
+
+        self.torch = torch
+        self.model_name = model_name or getattr(settings, 'EMBEDDING_MODEL_NAME', DEFAULT_MODEL_NAME)
+        self.batch_size = batch_size
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self.model = AutoModel.from_pretrained(self.model_name)
+        self.model.eval()
+
+    @timed('embedding.encode')
+    def encode(self, texts):
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = [t or '' for t in texts[start:start + self.batch_size]]
+            inputs = self.tokenizer(batch, padding=True, truncation=True, max_length=256, return_tensors='pt')
+            with self.torch.no_grad():
+                hidden = self.model(**inputs).last_hidden_state
+            mask = inputs['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            vectors.append(pooled.numpy().astype(np.float32))
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return _normalize(np.concatenate(vectors))
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class QuestionEmbeddingIndex:
+    """Precomputed question embeddings stored as a memory-mapped matrix."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or getattr(
+            settings, 'EMBEDDING_INDEX_DIR', os.path.join(settings.BASE_DIR, 'embeddings')
+        )
+        self.matrix_path = os.path.join(self.directory, 'questions.npy')
+        self.keys_path = os.path.join(self.directory, 'questions.json')
+        self._matrix = None
+        self._rows = {}
+        self.model_name = None
+
+    def build(self, model, templates):
+        """Encode the templates and atomically replace the on-disk index."""
+        keys = list(dict.fromkeys(question_key(t) for t in templates))
+        matrix = model.encode([k.replace('{role}', ROLE_STAND_IN) for k in keys])
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_matrix = self.matrix_path + '.tmp.npy'
+        tmp_keys = self.keys_path + '.tmp'
+        np.save(tmp_matrix, matrix)
+        with open(tmp_keys, 'w', encoding='utf-8') as fh:
+            json.dump({'model': model.model_name, 'keys': keys}, fh)
+        os.replace(tmp_matrix, self.matrix_path)
+        os.replace(tmp_keys, self.keys_path)
+        self._matrix = None
+        return len(keys)
+
+    def load(self):
+        if self._matrix is None and os.path.exists(self.matrix_path):
+            with open(self.keys_path, encoding='utf-8') as fh:
+                meta = json.load(fh)
+            self._matrix = np.load(self.matrix_path, mmap_mode='r')
+            self._rows = {key: row for row, key in enumerate(meta['keys'])}
+            self.model_name = meta['model']
+        return self._matrix
+
+    def lookup(self, keys, model_name=None):
+        """Return (rows, hit_mask): precomputed vectors for the keys found."""
+        matrix = self.load()
+        # An index built with another model lives in a different vector space.
+        if matrix is None or (model_name and model_name != self.model_name):
+            return None, np.zeros(len(keys), dtype=bool)
+        positions = [self._rows.get(k, -1) for k in keys]
+        hits = np.array([p >= 0 for p in positions], dtype=bool)
+        return np.asarray(matrix[[p for p in positions if p >= 0]]), hits
+
+
+# After a failed load, seconds before loading is tried again.
+DEFAULT_RETRY_SECONDS = 300
+
+_model = None
+_index = None
+_lock = threading.Lock()
+# (monotonic time of the last failed load, its exception)
+_load_failure = None
+
+
+def get_embedding_model():
+    """Process-wide model instance, loaded on first use and then kept warm.
+
+    A failed load (e.g. no network to fetch the weights) is remembered for
+    ``EMBEDDING_RETRY_SECONDS``; until then calls fail straight away rather
+    than each waiting for the download to time out again.
+    """
+    global _model, _load_failure
+    if _model is None:
+        with _lock:
+            if _model is None:
+                retry = getattr(settings, 'EMBEDDING_RETRY_SECONDS', DEFAULT_RETRY_SECONDS)
+                if _load_failure is not None and time.monotonic() - _load_failure[0] < retry:
+                    raise RuntimeError(f'Embedding model unavailable: {_load_failure[1]}')
+                try:
+                    with span('embedding.load_model'):
+                        _model = EmbeddingModel()
+                except Exception as e:
+                    _load_failure = (time.monotonic(), e)
+                    raise
+                _load_failure = None
+    return _model
+
+
+def get_question_index():
+    global _index
+    if _index is None:
+        _index = QuestionEmbeddingIndex()
+    return _index
+
+
+def score_relevance(questions, answers, role='', model=None, index=None):
+    """Cosine relevance in [0, 1] of each answer to its question.
+
+    Answers and any questions missing from the precomputed index are encoded
+    together in one batch.
+    """
+    model = model or get_embedding_model()
+    index = index or get_question_index()
+    if not questions:
+        return []
+    answers = [answers[i] if i < len(answers) else '' for i in range(len(questions))]
+
+    keys = [question_key(q, role) for q in questions]
+    known, hits = index.lookup(keys, getattr(model, 'model_name', None))
+    missing = [q for q, hit in zip(questions, hits) if not hit]
+    encoded = model.encode(answers + missing)
+    answer_vecs = encoded[:len(answers)]
+
+    question_vecs = np.empty_like(answer_vecs)
+    if hits.any():
+        question_vecs[hits] = known
+    if missing:
+        question_vecs[~hits] = encoded[len(answers):]
+
+    relevance = np.clip(np.einsum('ij,ij->i', answer_vecs, question_vecs), 0, 1)
+    empty = np.array([not (a or '').strip() for a in answers])
+    relevance[empty] = 0
+    return [round(float(r), 3) for r in relevance]
+
+
+def add_relevance(feedback, role=''):
+    """Annotate each per-question item of a feedback payload with relevance."""
+    items = feedback.get('questions') or []
+    if not items or not getattr(settings, 'ANSWER_RELEVANCE_ENABLED', True):
+        return feedback
+    scores = score_relevance([i['question'] for i in items], [i.get('answer', '') for i in items], role)
+    for item, score in zip(items, scores):
+        item['relevance'] = score
+    feedback['answer_relevance'] = round(sum(scores) / len(scores), 3)
+    return feedback
@@ -0,0 +1,156 @@
+"""In-process publish/subscribe for server-sent events.
+
+Each interview has a channel. Background jobs (which run on worker threads)
+publish to it; SSE connections (coroutines on the event loop) subscribe. A
+short replay buffer per channel lets a client that connects late, or
+reconnects with ``Last-Event-ID``, catch up on what it missed.
+
+Subscribers only see events published in the same process, so deployments
+running several worker processes need sticky sessions for the SSE stream.
+"""
+import asyncio
+import itertools
+import json
+import threading
+from collections import OrderedDict, deque
+
+# Events kept per channel for late or reconnecting subscribers.
+REPLAY_SIZE = 50
+# Channels kept in memory; the least recently used are dropped first.
+MAX_CHANNELS = 1000
+# Undelivered events buffered per subscriber before new ones are dropped.
+SUBSCRIBER_QUEUE_SIZE = 100
+# A comment line is sent this often so proxies keep idle streams open.
+KEEPALIVE_SECONDS = 15
+# Streams are closed after this long; EventSource reconnects with Last-Event-ID.
+STREAM_MAX_SECONDS = 300
+RETRY_MILLISECONDS = 3000
+# Events after which the stream has nothing more to say.
+FINAL_EVENTS = frozenset(['interview_complete', 'feedback_ready', 'feedback_failed'])
+
+
+class Event:
+    __slots__ = ('id', 'name', 'data')
+
+    def __init__(self, id, name, data):
+        self.id = id
+        self.name = name
+        self.data = data
+
+    def encode(self):
+        """Serialise in the text/event-stream wire format."""
+        return f'id: {self.id}\nevent: {self.name}\ndata: {json.dumps(self.data)}\n\n'
+
+
+class Subscription:
+    """Events queued for one subscriber on its event loop."""
+
+    def __init__(self, broker, channel, backlog):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        for event in backlog:
+            self.queue.put_nowait(event)
+
+    def deliver(self, event):
+        """Called from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The subscriber's loop has gone away.
+            self.broker.unsubscribe(self)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self, timeout=None):
+        """Next event, or None if none arrives within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class _Channel:
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.replay = deque(maxlen=REPLAY_SIZE)
+        self.subscribers = set()
+
+
+class EventBroker:
+    def __init__(self):
+        self._channels = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _channel(self, name):
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = self._channels[name] = _Channel()
+            while len(self._channels) > MAX_CHANNELS:
+                self._channels.popitem(last=False)
+        self._channels.move_to_end(name)
+        return channel
+
+    def publish(self, channel_name, name, data=None):
+        """Publish an event; safe to call from any thread."""
+        with self._lock:
+            channel = self._channel(channel_name)
+            event = Event(next(channel.ids), name, data or {})
+            channel.replay.append(event)
+            subscribers = list(channel.subscribers)
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return event
+
+    def subscribe(self, channel_name, last_event_id=0):
+        """Subscribe from a coroutine; replays buffered events newer than ``last_event_id``."""
+        with self._lock:
+            channel = self._channel(channel_name)
+            backlog = [e for e in channel.replay if e.id > last_event_id]
+            subscription = Subscription(self, channel_name, backlog)
+            channel.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            channel = self._channels.get(subscription.channel)
+            if channel is not None:
+                channel.subscribers.discard(subscription)
+
+
+_broker = EventBroker()
+
+
+def get_event_broker():
+    return _broker
+
+
+def interview_channel(interview_id):
+    return f'interview:{interview_id}'
+
+
+async def event_stream(channel_name, last_event_id=0, broker=None):
+    """Yield text/event-stream chunks for a channel until it is finished."""
+    subscription = (broker or _broker).subscribe(channel_name, last_event_id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STREAM_MAX_SECONDS
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        while loop.time() < deadline:
+            event = await subscription.get(timeout=KEEPALIVE_SECONDS)
+            if event is None:
+                yield ': keepalive\n\n'
+                continue
+            yield event.encode()
+            if event.name in FINAL_EVENTS:
+                break
+    finally:
+        subscription.close()
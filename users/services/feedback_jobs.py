@@ -0,0 +1,111 @@
+"""Deferred feedback generation.
+
+The final answer submission saves its InterviewResult with
+``feedback_status='pending'`` and queues generate_feedback() on the
+inference pool once the row is committed, so completing an interview takes
+the same time however slow feedback generation is. The worker stores the
+rule-based scores first and the slower annotations after, publishing an
+event on the result's channel at each stage so the result page can fill in.
+
+The queue lives in this process only: a result whose worker died with it (a
+restart, crash or deploy) stays pending until the ``requeue_feedback``
+command, run periodically, picks it up again. The result page also polls
+the database, since events only reach subscribers in the same process.
+"""
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .embedding_service import add_relevance
+from .events import get_event_broker
+from .inference import get_inference_executor
+from .scoring_service import final_answers, score_interview
+
+FALLBACK_FEEDBACK = {
+    "overall_score": 70,
+    "grade_label": "C",
+    "summary": "Feedback generation encountered an error. Please review your responses manually.",
+    "strengths": ["Completed the interview"],
+    "weaknesses": ["Technical issues during feedback generation"],
+    "suggestions": ["Retry the interview if possible"],
+    "questions": []
+}
+
+
+def result_channel(result_pk):
+    return f'result:{result_pk}'
+
+
+def score_answers(questions, answers, voice_transcripts, delivery):
+    """Rule-based scores, with each question's delivery metrics attached."""
+    delivery = delivery or []
+    feedback_data = score_interview(
+        questions, final_answers(questions, answers, voice_transcripts),
+        durations=[(m or {}).get('speaking_seconds') for m in delivery]
+    )
+    for item, metrics in zip(feedback_data['questions'], delivery):
+        if metrics:
+            item['delivery'] = metrics
+    return feedback_data
+
+
+def _store(result, feedback_data, status):
+    result.ai_feedback = feedback_data
+    result.overall_score = feedback_data.get('overall_score')
+    result.grade_label = feedback_data.get('grade_label')
+    result.feedback_status = status
+    # save() rather than update() so the search index picks up the feedback.
+    result.save(update_fields=['ai_feedback', 'overall_score', 'grade_label', 'feedback_status'])
+
+
+def generate_feedback(result_pk):
+    """Worker: build and store feedback for a pending InterviewResult."""
+    from feedback.models import InterviewResult
+
+    broker = get_event_broker()
+    channel = result_channel(result_pk)
+    close_old_connections()
+    try:
+        result = InterviewResult.objects.get(pk=result_pk)
+        try:
+            feedback_data = score_answers(
+                result.questions, result.answers, result.voice_transcripts, result.voice_metrics
+            )
+        except Exception as e:
+            print(f"Error generating feedback: {e}")
+            feedback_data = dict(FALLBACK_FEEDBACK)
+        _store(result, feedback_data, InterviewResult.FEEDBACK_PENDING)
+        broker.publish(channel, 'feedback_progress', {'stage': 'scores'})
+
+        try:
+            add_relevance(feedback_data, result.role)
+        except Exception as e:
+            print(f"Relevance scoring unavailable: {e}")
+        _store(result, feedback_data, InterviewResult.FEEDBACK_READY)
+        broker.publish(channel, 'feedback_ready', {'result_id': result_pk})
+    except Exception as e:
+        print(f"Deferred feedback failed for result {result_pk}: {e}")
+        InterviewResult.objects.filter(pk=result_pk).update(feedback_status=InterviewResult.FEEDBACK_FAILED)
+        broker.publish(channel, 'feedback_failed', {'result_id': result_pk})
+    finally:
+        close_old_connections()
+
+
+def queue_feedback(result_pk):
+    """Generate feedback in the background once the current transaction commits."""
+    transaction.on_commit(lambda: get_inference_executor().submit(generate_feedback, result_pk))
+
+
+# Pending this long and the worker is presumed lost with its process.
+STALE_PENDING_SECONDS = 900
+
+
+def stale_pending_results(older_than=STALE_PENDING_SECONDS):
+    """Pks of results still pending feedback ``older_than`` seconds after they were saved."""
+    from feedback.models import InterviewResult
+
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    return list(InterviewResult.objects.filter(
+        feedback_status=InterviewResult.FEEDBACK_PENDING, created_at__lt=cutoff,
+    ).order_by('pk').values_list('pk', flat=True))
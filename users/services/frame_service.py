@@ -0,0 +1,196 @@
+"""Webcam frame ingestion and interaction analysis.
+
+Frames arrive as JPEG bytes, are decoded straight to a small grayscale
+thumbnail with Pillow and analysed in vectorized NumPy batches: presence,
+brightness, motion and where the subject sits in the frame. The pixels are
+dropped as soon as the metrics are computed; only the metrics (and a tiny
+thumbnail of the latest frame, for motion) are kept per interview.
+"""
+import base64
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+# Analysis resolution (width, height); enough for brightness and motion.
+THUMB_SIZE = (64, 48)
+# Uploads larger than this are rejected before decoding.
+MAX_FRAME_BYTES = 512 * 1024
+# Per-interview cap on stored frame metrics (one frame per 5s = 20 minutes).
+MAX_FRAMES_PER_INTERVIEW = 240
+
+
+class FrameError(ValueError):
+    """Raised for uploads that are not a decodable JPEG frame."""
+
+
+def decode_frame(data):
+    """Decode JPEG bytes to a THUMB_SIZE uint8 grayscale array."""
+    if not data:
+        raise FrameError('Empty frame.')
+    if len(data) > MAX_FRAME_BYTES:
+        raise FrameError('Frame too large.')
+    try:
+        with Image.open(BytesIO(data)) as image:
+            if image.format != 'JPEG':
+                raise FrameError('Frames must be JPEG.')
+            # draft() lets libjpeg decode at a reduced scale, skipping most of
+            # the full-resolution IDCT work.
+            image.draft('L', (THUMB_SIZE[0] * 2, THUMB_SIZE[1] * 2))
+            small = image.convert('L').resize(THUMB_SIZE, Image.BILINEAR)
+            return np.asarray(small, dtype=np.uint8)
+    except (UnidentifiedImageError, OSError) as e:
+        raise FrameError(f'Could not decode frame: {e}')
+
+
+def encode_thumb(frame):
+    return base64.b64encode(frame.tobytes()).decode('ascii')
+
+
+def decode_thumb(text):
+    if not text:
+        return None
+    try:
+        raw = base64.b64decode(text)
+    except ValueError:
+        return None
+    if len(raw) != THUMB_SIZE[0] * THUMB_SIZE[1]:
+        return None
+    return np.frombuffer(raw, dtype=np.uint8).reshape(THUMB_SIZE[1], THUMB_SIZE[0])
+
+
+def decode_frames(payloads):
+    """Decode a list of JPEG payloads into an (N, H, W) uint8 stack."""
+    return np.stack([decode_frame(p) for p in payloads]) if payloads else np.zeros(
+        (0, THUMB_SIZE[1], THUMB_SIZE[0]), dtype=np.uint8
+    )
+
+
+# A frame counts as "present" (someone in view) when it carries noticeably
+# more detail than a flat wall or a covered lens would.
+PRESENCE_MIN_DETAIL = 0.01
+PRESENCE_MIN_BRIGHTNESS = 0.08
+PRESENCE_MAX_BRIGHTNESS = 0.95
+# Mean absolute frame-to-frame change above which a frame counts as restless.
+RESTLESS_MOTION = 0.08
+# Lighting band considered comfortable for an on-camera interview.
+DARK_BRIGHTNESS = 0.25
+BRIGHT_BRIGHTNESS = 0.85
+
+def analyze_frames(stack, previous=None):
+    """Per-frame metrics for a batch of frames in one vectorized pass.
+
+    ``stack`` is (N, H, W) uint8; ``previous`` is the frame before the batch,
+    if any, so motion is continuous across uploads. Returns a list of dicts.
+    """
+    n = len(stack)
+    if not n:
+        return []
+    pixels = stack.astype(np.float32) / 255.0
+    brightness = pixels.mean(axis=(1, 2))
+    contrast = pixels.std(axis=(1, 2))
+
+    # Gradient energy: where the detail (a face, a person) is in each frame.
+    gx = np.abs(np.diff(pixels, axis=2))[:, :-1, :]
+    gy = np.abs(np.diff(pixels, axis=1))[:, :, :-1]
+    energy = gx + gy
+    sharpness = energy.mean(axis=(1, 2))
+    presence = (
+        (sharpness >= PRESENCE_MIN_DETAIL)
+        & (brightness >= PRESENCE_MIN_BRIGHTNESS)
+        & (brightness <= PRESENCE_MAX_BRIGHTNESS)
+    )
+
+    # Energy-weighted centroid, normalised to [0, 1] in each axis.
+    h, w = energy.shape[1:]
+    total = energy.sum(axis=(1, 2))
+    safe_total = np.where(total > 0, total, 1)
+    cx = np.where(total > 0, (energy.sum(axis=1) @ np.linspace(0, 1, w)) / safe_total, 0.5)
+    cy = np.where(total > 0, (energy.sum(axis=2) @ np.linspace(0, 1, h)) / safe_total, 0.5)
+
+    if previous is not None:
+        before = np.concatenate([previous[None].astype(np.float32) / 255.0, pixels[:-1]])
+        motion = np.abs(pixels - before).mean(axis=(1, 2))
+    else:
+        motion = np.full(n, np.nan)
+        motion[1:] = np.abs(np.diff(pixels, axis=0)).mean(axis=(1, 2))
+
+    columns = {
+        'brightness': brightness, 'contrast': contrast, 'sharpness': sharpness,
+        'motion': motion, 'center_x': cx, 'center_y': cy,
+    }
+    rounded = {k: np.round(v, 4).tolist() for k, v in columns.items()}
+    frames = []
+    for i in range(n):
+        metrics = {k: (None if v[i] != v[i] else v[i]) for k, v in rounded.items()}
+        metrics['presence'] = bool(presence[i])
+        frames.append(metrics)
+    return frames
+
+
+def _column(frames, key):
+    return np.array([np.nan if f.get(key) is None else f[key] for f in frames], dtype=np.float64)
+
+
+def _mean(values):
+    values = values[~np.isnan(values)]
+    return round(float(values.mean()), 4) if values.size else None
+
+
+def summarize(frames):
+    """Aggregate stored per-frame metrics into the per-interview interaction summary."""
+    if not frames:
+        return None
+    presence = np.array([bool(f.get('presence')) for f in frames])
+    brightness = _column(frames, 'brightness')
+    motion = _column(frames, 'motion')
+    cx, cy = _column(frames, 'center_x'), _column(frames, 'center_y')
+
+    present_cx, present_cy = cx[presence], cy[presence]
+    if present_cx.size:
+        offset = np.hypot(present_cx - 0.5, present_cy - 0.5)
+        spread = float(np.hypot(present_cx.std(), present_cy.std()))
+        framing_offset = round(float(offset.mean()), 4)
+        # 1.0 = subject held still in the frame; drops as the centroid wanders.
+        framing_stability = round(float(np.clip(1 - spread / 0.15, 0, 1)), 4)
+    else:
+        framing_offset = framing_stability = None
+
+    valid_motion = motion[~np.isnan(motion)]
+    summary = {
+        'frames_analyzed': len(frames),
+        'presence_rate': round(float(presence.mean()), 4),
+        'avg_brightness': _mean(brightness),
+        'avg_contrast': _mean(_column(frames, 'contrast')),
+        'avg_sharpness': _mean(_column(frames, 'sharpness')),
+        'avg_motion': _mean(motion),
+        'restless_rate': round(float((valid_motion > RESTLESS_MOTION).mean()), 4) if valid_motion.size else None,
+        'framing_offset': framing_offset,
+        'framing_stability': framing_stability,
+    }
+
+    # Per-question presence, grouped with bincount over the question index.
+    q_idx = np.array([int(f.get('question_idx') or 0) for f in frames])
+    counts = np.bincount(q_idx)
+    present = np.bincount(q_idx, weights=presence.astype(float), minlength=len(counts))
+    summary['presence_by_question'] = {
+        str(q): round(float(present[q] / counts[q]), 4) for q in np.flatnonzero(counts)
+    }
+
+    notes = []
+    if summary['presence_rate'] < 0.8:
+        notes.append('You were out of frame for part of the interview; stay centred in view of the camera.')
+    if summary['avg_brightness'] is not None and summary['avg_brightness'] < DARK_BRIGHTNESS:
+        notes.append('Your video was dark; add light in front of you.')
+    elif summary['avg_brightness'] is not None and summary['avg_brightness'] > BRIGHT_BRIGHTNESS:
+        notes.append('Your video was overexposed; reduce light behind or directly on the camera.')
+    if summary['restless_rate'] is not None and summary['restless_rate'] > 0.3:
+        notes.append('Frequent movement was detected; try to keep a steady posture.')
+    if framing_stability is not None and framing_stability < 0.5:
+        notes.append('Your position in the frame shifted a lot between captures.')
+    if framing_offset is not None and framing_offset > 0.2:
+        notes.append('You were off-centre in the frame; adjust the camera so you sit in the middle.')
+    if not notes:
+        notes.append('Good on-camera presence: well lit, centred and steady.')
+    summary['notes'] = notes
+    return summary
@@ -0,0 +1,46 @@
+"""Retry-safe interview steps.
+
+Every answer submission is identified by an idempotency token, the
+interview id plus the question index. The first request to claim a token
+does the work; any duplicate that arrives while it runs (a double click, a
+network retry) waits for the same outcome instead of appending the answer
+again or transcribing the audio a second time. Completed steps are also
+remembered in the session, so later retries are answered from there.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class StepRegistry:
+    """In-flight and recently finished steps, keyed by token. Bounded."""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._steps = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, token):
+        """Return ``(future, owner)``; only the owner should process the step."""
+        with self._lock:
+            future = self._steps.get(token)
+            if future is not None:
+                return future, False
+            future = self._steps[token] = Future()
+            while len(self._steps) > self.max_entries:
+                self._steps.popitem(last=False)
+            return future, True
+
+    def fail(self, token, exc):
+        """Release a step whose processing raised, so a retry can run it again."""
+        with self._lock:
+            future = self._steps.pop(token, None)
+        if future is not None and not future.done():
+            future.set_exception(exc)
+
+
+_registry = StepRegistry()
+
+
+def get_step_registry():
+    return _registry
@@ -0,0 +1,141 @@
+"""Bounded executor for model inference called from async views.
+
+Whisper, the embedding model and text generation are CPU-bound and release
+the GIL inside PyTorch, so they run on a small shared thread pool sized to
+the machine rather than one thread per request. Async views await the
+result; while a clip is being transcribed the event loop keeps serving
+every other in-flight interview.
+
+Work submitted from requests is admitted against a global cap
+(``INFERENCE_MAX_CONCURRENCY`` jobs running or queued). Past the cap,
+InferenceBusy is raised straight away so the view can answer 429 with a
+Retry-After rather than leave the client queueing until it times out.
+"""
+import asyncio
+import functools
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .profiling import follow
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+class InferenceBusy(Exception):
+    """The inference pool is at capacity; try again in ``retry_after`` seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__('Inference capacity exhausted')
+        self.retry_after = retry_after
+
+
+def inference_workers():
+    return getattr(settings, 'INFERENCE_WORKERS', None) or min(4, os.cpu_count() or 1)
+
+
+def get_inference_executor():
+    """Process-wide pool, created on first use."""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=inference_workers(), thread_name_prefix='inference'
+                )
+    return _executor
+
+
+def max_concurrency():
+    return getattr(settings, 'INFERENCE_MAX_CONCURRENCY', None) or inference_workers() * 4
+
+
+def admit():
+    """Take one of the pool's admission slots or raise InferenceBusy."""
+    global _slots
+    if _slots is None:
+        with _lock:
+            if _slots is None:
+                _slots = threading.BoundedSemaphore(max_concurrency())
+    if not _slots.acquire(blocking=False):
+        raise InferenceBusy(getattr(settings, 'INFERENCE_RETRY_AFTER', 5))
+    return _slots.release
+
+
+async def run_inference(func, *args, **kwargs):
+    """Run ``func`` on the inference pool and await its result; raises InferenceBusy when full."""
+    release = admit()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_inference_executor(), follow(functools.partial(func, *args, **kwargs))
+        )
+    finally:
+        release()
+
+
+class JobRegistry:
+    """Futures for background inference jobs, keyed by e.g. (interview, question).
+
+    Lets a later request pick up a job an earlier one started, whether it is
+    still running or already done. Bounded: the oldest entries are dropped.
+    """
+
+    def __init__(self, max_jobs=1000):
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key, func, *args, fingerprint=None, on_submit=None):
+        """Queue ``func(*args)`` under ``key``; returns ``(future, created)``.
+
+        With a ``fingerprint`` (e.g. a hash of the input), resubmitting the
+        same input under the same key returns the existing job unless it failed.
+        A new job needs an admission slot (see admit()) until it finishes.
+        ``on_submit()`` is called for a new job just before it is queued, so
+        anything it announces precedes whatever the job itself announces.
+        """
+        with self._lock:
+            existing = self._jobs.get(key)
+            if (existing is not None and fingerprint is not None
+                    and getattr(existing, 'fingerprint', None) == fingerprint
+                    and not (existing.done() and existing.exception() is not None)):
+                return existing, False
+            release = admit()
+            if on_submit is not None:
+                try:
+                    on_submit()
+                except BaseException:
+                    release()
+                    raise
+            future = get_inference_executor().submit(follow(func), *args)
+            future.add_done_callback(lambda _: release())
+            future.fingerprint = fingerprint
+            self._jobs[key] = future
+            self._jobs.move_to_end(key)
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        return future, True
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def discard(self, prefix):
+        """Forget every job whose key begins with ``prefix`` (e.g. an interview id)."""
+        with self._lock:
+            for key in [k for k in self._jobs if k[0] == prefix]:
+                del self._jobs[key]
+
+
+_clip_jobs = JobRegistry()
+
+
+def get_clip_jobs():
+    """Per-question transcription jobs, keyed by (interview_id, question_idx)."""
+    return _clip_jobs
@@ -0,0 +1,203 @@
+"""In-process metrics: request latency, database use and named spans.
+
+RequestMetricsMiddleware times every request and counts the database queries
+it makes; ``span()`` and ``timed()`` time any other block or function (model
+loading, transcription, generation, session writes). Everything is held in
+this process's memory and rendered in the Prometheus text format by the
+staff-only ``metrics`` view, so each worker process is scraped separately.
+"""
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction
+
+# Seconds; suits both quick views and multi-second inference.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f'{self.name}_bucket', _labels(self.labelnames, labels, [('le', _number(bound))]), cumulative
+            yield f'{self.name}_sum', _labels(self.labelnames, labels), total
+            yield f'{self.name}_count', _labels(self.labelnames, labels), cumulative
+
+
+class Counter:
+    """Name it with the ``_total`` suffix; HELP, TYPE and samples all use the name."""
+    kind = 'counter'
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name, _labels(self.labelnames, labels), value
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def counter(self, name, help, labelnames=()):
+        return self.register(Counter(name, help, labelnames))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Time to produce a response, by view.', ('view', 'method', 'status'))
+REQUEST_QUERIES = REGISTRY.histogram(
+    'http_request_db_queries', 'Database queries made while handling a request, by view.',
+    ('view',), QUERY_COUNT_BUCKETS)
+REQUEST_DB_SECONDS = REGISTRY.histogram(
+    'http_request_db_seconds', 'Time spent in database queries per request, by view.', ('view',))
+SPAN_SECONDS = REGISTRY.histogram(
+    'span_duration_seconds', 'Time spent in instrumented blocks, by span name.', ('span',))
+SPAN_ERRORS = REGISTRY.counter(
+    'span_errors_total', 'Instrumented blocks that raised, by span name.', ('span',))
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_seconds')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Set for the duration of a request; copied into sync_to_async threads with the context.
+_request_stats = contextvars.ContextVar('request_stats', default=None)
+
+
+def start_request():
+    stats = RequestStats()
+    return _request_stats.set(stats), stats
+
+
+def finish_request(token, stats, view, method, status, seconds):
+    _request_stats.reset(token)
+    REQUEST_SECONDS.observe(seconds, view, method, str(status))
+    REQUEST_QUERIES.observe(stats.queries, view)
+    REQUEST_DB_SECONDS.observe(stats.db_seconds, view)
+
+
+def observe_query(execute, sql, params, many, context):
+    """Database execute wrapper; counts queries made for the current request."""
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+@contextmanager
+def span(name):
+    """Time a block under ``span_duration_seconds{span=name}``."""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        SPAN_ERRORS.inc(1, name)
+        raise
+    finally:
+        SPAN_SECONDS.observe(time.perf_counter() - started, name)
+
+
+def timed(name):
+    """Decorator form of span(), for sync and async functions."""
+    def decorator(func):
+        if iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with span(name):
+                    return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,33 +1,51 @@
+import threading
+
 import torch
 from transformers import AutoTokenizer, AutoModelForCausalLM
+from .metrics import span, timed
+from .scoring_service import score_interview
 
 class MistralService:
     def __init__(self):
         self.model_name = "distilgpt2"
-        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
+        with span('mistral.load_model'):
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
         if self.tokenizer.pad_token is None:
             self.tokenizer.pad_token = self.tokenizer.eos_token
+        # Decoder-only models continue from the right, so batches pad on the left.
+        self.tokenizer.padding_side = "left"
 
     def generate_response(self, prompt):
-        inputs = self.tokenizer(prompt, return_tensors="pt")
-        with torch.no_grad():
-            outputs = self.model.generate(
-                **inputs,
-                max_new_tokens=200,
-                temperature=0.7,
-                do_sample=True,
-                pad_token_id=self.tokenizer.eos_token_id
-            )
-        response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-        # Remove the prompt from response
-        if response.startswith(prompt):
-            response = response[len(prompt):].strip()
-        return response
+        return self.generate_responses([prompt])[0]
 
-    def generate_questions(self, role, experience, interview_type):
-        prompt = f"Generate 5 interview questions for {role} position with {experience} year experience generate question of {interview_type} type :\n1."
-        response = self.generate_response(prompt)
+    @timed('mistral.generate')
+    def generate_responses(self, prompts, batch_size=8):
+        """Generate a completion for each prompt, batch_size prompts per model call."""
+        responses = []
+        for start in range(0, len(prompts), batch_size):
+            batch = prompts[start:start + batch_size]
+            inputs = self.tokenizer(batch, return_tensors="pt", padding=True)
+            with torch.no_grad():
+                outputs = self.model.generate(
+                    **inputs,
+                    max_new_tokens=200,
+                    temperature=0.7,
+                    do_sample=True,
+                    pad_token_id=self.tokenizer.eos_token_id
+                )
+            # Keep only the generated continuation of each prompt
+            generated = outputs[:, inputs["input_ids"].shape[1]:]
+            for tokens in generated:
+                responses.append(self.tokenizer.decode(tokens, skip_special_tokens=True).strip())
+        return responses
+
+    @staticmethod
+    def question_prompt(role, experience, interview_type):
+        return f"Generate 5 interview questions for {role} position with {experience} year experience generate question of {interview_type} type :\n1."
+
+    @staticmethod
+    def parse_questions(response, role):
         if not response:
             return []
         # Parse response into list of questions
@@ -43,19 +61,42 @@ class MistralService:
             questions.append(f"Can you describe your experience in {role}?")
         return questions[:5]
 
+    def generate_questions(self, role, experience, interview_type):
+        return self.generate_questions_batch([(role, experience, interview_type)])[0]
+
+    def generate_questions_batch(self, specs):
+        """Questions for each (role, experience, interview_type), in one batched pass."""
+        responses = self.generate_responses([self.question_prompt(*spec) for spec in specs])
+        return [self.parse_questions(response, spec[0]) for spec, response in zip(specs, responses)]
+
+    @staticmethod
+    def feedback_prompt(role, interview_type, questions, candidate_answers):
+        return f"Provide feedback for a {role} interview ({interview_type}). Questions: {questions}. Answers: {candidate_answers}."
+
     def generate_feedback(self, role, interview_type, questions, candidate_answers):
-        prompt = f"Provide feedback for a {role} interview ({interview_type}). Questions: {questions}. Answers: {candidate_answers}."
-        response = self.generate_response(prompt)
-        # Parse into feedback dict
-        return {
-            "overall_score": 75,
-            "grade_label": "B",
-            "summary": response or "Feedback generated.",
-            "strengths": ["Good effort"],
-            "weaknesses": ["Needs improvement"],
-            "suggestions": ["Practice more"],
-            "questions": []
-        }
+        return self.generate_feedback_batch([(role, interview_type, questions, candidate_answers)])[0]
+
+    def generate_feedback_batch(self, items):
+        """Feedback for each (role, interview_type, questions, answers), in one batched pass."""
+        responses = self.generate_responses([self.feedback_prompt(*item) for item in items])
+        feedbacks = []
+        for (role, interview_type, questions, candidate_answers), response in zip(items, responses):
+            # Scores and itemised feedback come from the local scoring engine;
+            # the model only contributes the narrative summary.
+            feedback = score_interview(questions, candidate_answers)
+            if response:
+                feedback["summary"] = response
+            feedbacks.append(feedback)
+        return feedbacks
+
+_service = None
+_lock = threading.Lock()
 
 def get_mistral_service():
-    return MistralService()
+    """Process-wide service; the model is loaded once and then kept warm."""
+    global _service
+    if _service is None:
+        with _lock:
+            if _service is None:
+                _service = MistralService()
+    return _service
@@ -0,0 +1,306 @@
+"""Opt-in request profiling.
+
+With ``PROFILING_ENABLED`` on, ProfilingMiddleware profiles a random
+``PROFILING_SAMPLE_RATE`` fraction of requests to the views named in
+``PROFILING_VIEWS`` (all views when empty), and, when
+``PROFILING_SLOW_SECONDS`` is set, captures every such request and keeps the
+profile of any that turn out slower than the threshold.
+
+Two profilers are available (``PROFILING_MODE``):
+
+* ``sample`` - a background thread samples Python stacks every
+  ``PROFILING_INTERVAL`` seconds and writes folded stacks (``.folded``, the
+  input format of flamegraph.pl and speedscope). Cheap enough to leave on for
+  a slow-request threshold. Only the request's own stack is kept (on a shared
+  event loop, only while it is the one running) plus threads lent to it: the
+  inference pool, for work queued through follow(), and any thread while it
+  runs one of the request's database queries. Other concurrent requests stay
+  out of the profile.
+* ``cprofile`` - deterministic cProfile of the request's own thread, saved as
+  pstats (``.prof``, for snakeviz or ``python -m pstats``). Exact call counts,
+  but it slows the request down and does not follow work to other threads.
+  Async views are always sampled instead: their thread is an event loop (or
+  async_to_sync's) shared with other work, where cProfile would see only
+  waiting or everyone's code.
+
+Profiles are written to ``PROFILING_DIR``; once it holds more than
+``PROFILING_MAX_FILES`` the oldest are deleted. When profiling is disabled
+the middleware removes itself at startup, so requests pay nothing.
+"""
+import contextvars
+import cProfile
+import functools
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+MODES = ('sample', 'cprofile')
+EXTENSIONS = {'sample': '.folded', 'cprofile': '.prof'}
+# Profiles captured at once; requests beyond this run unprofiled.
+MAX_CONCURRENT_CAPTURES = 2
+# A leaf frame in one of these files is a thread waiting rather than working.
+IDLE_FILES = frozenset(['threading.py', 'queue.py', 'selectors.py', 'thread.py'])
+FILENAME_RE = re.compile(
+    r'^(?P<stamp>\d{8}T\d{12})-(?P<view>[\w.-]+)-(?P<method>[A-Z]+)-(?P<ms>\d+)ms-(?P<reason>sampled|slow)'
+    r'(?P<ext>\.folded|\.prof)$'
+)
+
+_captures = threading.BoundedSemaphore(MAX_CONCURRENT_CAPTURES)
+# The Capture of the request being handled, if it is profiled.
+_active = contextvars.ContextVar('profiling_capture', default=None)
+
+
+def profiling_setting(name, default=None):
+    return getattr(settings, f'PROFILING_{name}', default)
+
+
+def profile_dir():
+    return profiling_setting('DIR') or os.path.join(settings.BASE_DIR, 'profiles')
+
+
+class StackSampler:
+    """Samples other threads' stacks into folded-stack counts.
+
+    With an ``anchor`` frame, only stacks running inside it and threads
+    attach()ed for the time being are kept; without one, every thread.
+    """
+
+    def __init__(self, interval=0.005, anchor=None):
+        self.interval = interval
+        self.anchor = anchor
+        self.samples = Counter()
+        self.threads = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+
+    def attach(self, ident):
+        with self._lock:
+            self.threads[ident] += 1
+
+    def detach(self, ident):
+        with self._lock:
+            self.threads[ident] -= 1
+            if not self.threads[ident]:
+                del self.threads[ident]
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            with self._lock:
+                attached = set(self.threads)
+            for ident, frame in sys._current_frames().items():
+                if ident == own or os.path.basename(frame.f_code.co_filename) in IDLE_FILES:
+                    continue
+                stack = []
+                keep = self.anchor is None or ident in attached
+                while frame is not None:
+                    keep = keep or frame is self.anchor
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                if not keep:
+                    continue
+                stack.append(names.get(ident, str(ident)))
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as fh:
+            for stack, count in self.samples.most_common():
+                fh.write(f'{stack} {count}\n')
+
+
+class CProfileCapture:
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def dump(self, path):
+        self.profile.dump_stats(path)
+
+
+class Capture:
+    """One request being profiled; call finish() once it has responded.
+
+    ``anchor`` is the frame handling the request, which the sampler uses to
+    tell this request's stack from others on the same thread.
+    """
+
+    def __init__(self, mode, sampled, anchor=None):
+        self.mode = mode
+        self.sampled = sampled
+        if mode == 'cprofile':
+            self.profiler = CProfileCapture()
+        else:
+            self.profiler = StackSampler(profiling_setting('INTERVAL', 0.005), anchor)
+        self.profiler.start()
+        self.token = _active.set(self)
+
+    @contextmanager
+    def attached(self):
+        """Sample the current thread with this request while the block runs."""
+        if self.mode != 'sample':
+            yield
+            return
+        ident = threading.get_ident()
+        self.profiler.attach(ident)
+        try:
+            yield
+        finally:
+            self.profiler.detach(ident)
+
+    def finish(self, view, method, seconds):
+        """Stop profiling; returns the saved profile's path, or None if it was not kept."""
+        _active.reset(self.token)
+        try:
+            self.profiler.stop()
+        finally:
+            _captures.release()
+        if self.mode == 'sample':
+            # Work queued through follow() may outlive the request; let its frames go.
+            self.profiler.anchor = None
+        slow = profiling_setting('SLOW_SECONDS')
+        if slow is not None and seconds >= slow:
+            reason = 'slow'
+        elif self.sampled:
+            reason = 'sampled'
+        else:
+            return None
+        return get_profile_store().save(self.profiler, view, method, seconds, reason, EXTENSIONS[self.mode])
+
+
+def start_capture(view_name, is_async=False, anchor=None):
+    """A Capture if this request to ``view_name`` should be profiled, else None.
+
+    Call it in the context (and frame) the request is handled in.
+    """
+    views = profiling_setting('VIEWS')
+    if views and view_name not in views:
+        return None
+    sampled = random.random() < profiling_setting('SAMPLE_RATE', 0.0)
+    if not sampled and profiling_setting('SLOW_SECONDS') is None:
+        return None
+    if not _captures.acquire(blocking=False):
+        return None
+    try:
+        mode = profiling_setting('MODE', 'sample')
+        return Capture('sample' if is_async else mode, sampled, anchor)
+    except BaseException:
+        _captures.release()
+        raise
+
+
+def follow(func):
+    """Wrap ``func`` so that, run on another thread, it is sampled with the current request."""
+    capture = _active.get()
+    if capture is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with capture.attached():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def observe_query(execute, sql, params, many, context):
+    """Database execute wrapper; samples the query's thread with the request making it."""
+    capture = _active.get()
+    if capture is None:
+        return execute(sql, params, many, context)
+    with capture.attached():
+        return execute(sql, params, many, context)
+
+
+class ProfileStore:
+    """Profiles in a directory, named by when, what and how long; oldest pruned first."""
+
+    def __init__(self, directory, max_files=100):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def save(self, profiler, view, method, seconds, reason, extension):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        view = re.sub(r'[^\w.-]', '_', view)
+        name = f'{stamp}-{view}-{method}-{round(seconds * 1000)}ms-{reason}{extension}'
+        # Write under a temporary name so the listing never shows a partial file.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            profiler.dump(tmp)
+            os.replace(tmp, os.path.join(self.directory, name))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.prune()
+        return os.path.join(self.directory, name)
+
+    def prune(self):
+        with self._lock:
+            names = sorted(self.names())
+            for name in names[:max(len(names) - self.max_files, 0)]:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def names(self):
+        try:
+            return [name for name in os.listdir(self.directory) if FILENAME_RE.match(name)]
+        except FileNotFoundError:
+            return []
+
+    def entries(self):
+        """Saved profiles, newest first, with the details encoded in their names."""
+        entries = []
+        for name in sorted(self.names(), reverse=True):
+            match = FILENAME_RE.match(name)
+            path = os.path.join(self.directory, name)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            entries.append({
+                'name': name,
+                'created': datetime.strptime(match['stamp'], '%Y%m%dT%H%M%S%f').replace(tzinfo=timezone.utc),
+                'view': match['view'],
+                'method': match['method'],
+                'duration_ms': int(match['ms']),
+                'reason': match['reason'],
+                'format': 'folded stacks' if match['ext'] == '.folded' else 'cProfile',
+                'size': size,
+            })
+        return entries
+
+    def path(self, name):
+        """Path of a saved profile; None for anything that is not one."""
+        if not FILENAME_RE.match(name) or name not in self.names():
+            return None
+        return os.path.join(self.directory, name)
+
+
+def get_profile_store():
+    return ProfileStore(profile_dir(), profiling_setting('MAX_FILES', 100))
@@ -0,0 +1,195 @@
+"""Interview question bank.
+
+Questions are grouped by experience level and interview type. Templates use a
+``{role}`` placeholder that is filled in when an interview is generated.
+
+The static questions below are merged with those imported into the Question
+table (``manage.py import_questions``). The merged bank is an immutable
+snapshot held per process: a reload builds a complete new snapshot and then
+swaps it in with one assignment, so a request never sees a half-built bank.
+Snapshots older than ``QUESTION_BANK_TTL`` seconds are reloaded on next use,
+which is how other processes pick up an import.
+"""
+import hashlib
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from .embedding_service import question_key
+
+LEVELS = ('fresher', 'mid', 'senior')
+INTERVIEW_TYPES = ('technical', 'behavioral', 'mixed')
+DEFAULT_TTL = 300
+QUESTIONS_PER_INTERVIEW = 5
+
+FALLBACK_QUESTIONS = {
+    ('fresher', 'technical'): [
+        "Can you explain the basic concepts of {role} that you've learned?",
+        "What programming languages are you familiar with and why?",
+        "Can you walk us through a simple project you've built?",
+        "How do you approach learning new technologies?",
+        "What are the fundamentals you consider important in this field?",
+    ],
+    ('fresher', 'behavioral'): [
+        "Tell us about yourself and your background.",
+        "What motivated you to pursue a career in {role}?",
+        "Describe a time when you learned something new quickly.",
+        "How do you handle feedback or criticism?",
+        "Why are you interested in this position?",
+    ],
+    ('fresher', 'mixed'): [
+        "Can you tell us about your interest in becoming a {role}?",
+        "What are the key skills you've developed so far?",
+        "Describe a project or assignment you worked on in college/learning.",
+        "How do you approach problem-solving?",
+        "Where do you see yourself in your career in the next 2-3 years?",
+    ],
+    ('mid', 'technical'): [
+        "Can you explain your experience with {role}-related technologies?",
+        "Describe a challenging technical problem you've solved.",
+        "How do you stay updated with the latest developments in your field?",
+        "What tools and frameworks are you proficient in for this role?",
+        "How would you approach debugging a complex issue?",
+    ],
+    ('mid', 'behavioral'): [
+        "Tell me about a time you worked in a team to achieve a goal.",
+        "Describe a situation where you had to learn something new quickly.",
+        "How do you handle constructive criticism?",
+        "Give an example of how you've handled a difficult stakeholder.",
+        "What motivates you in your work?",
+    ],
+    ('mid', 'mixed'): [
+        "What are your key strengths as a {role}?",
+        "Describe your experience level and how it aligns with this role.",
+        "How do you approach complex problem-solving in your work?",
+        "Tell me about a significant project you're proud of and why.",
+        "How do you balance technical depth with broader business understanding?",
+    ],
+    ('senior', 'technical'): [
+        "How have you architected solutions as a {role}?",
+        "Describe your approach to designing scalable systems.",
+        "How do you mentor junior developers in technical skills?",
+        "What's your philosophy on code quality and technical debt?",
+        "How do you stay ahead of industry trends and emerging technologies?",
+    ],
+    ('senior', 'behavioral'): [
+        "Tell me about your leadership experience and approach.",
+        "Describe a situation where you drove significant change.",
+        "How do you balance technical and people management?",
+        "Give an example of how you've influenced organization-wide decisions.",
+        "What's your approach to building and maintaining high-performing teams?",
+    ],
+    ('senior', 'mixed'): [
+        "How have you grown as a {role} over your career?",
+        "Describe your approach to strategic technical decisions.",
+        "How do you contribute to company vision and strategy?",
+        "Tell me about your most significant impact on a project.",
+        "Where do you want to take your career in the next 5 years?",
+    ],
+}
+
+
+# Experience labels used by the forms and the API, as years.
+EXPERIENCE_YEARS = {'fresher': 0, 'junior': 1, 'mid': 3, 'senior': 5}
+
+
+def experience_level(experience):
+    """Map years of experience (or a label such as 'Mid') onto a question bank level."""
+    if isinstance(experience, str):
+        experience = EXPERIENCE_YEARS.get(experience.lower(), 0)
+    if experience <= 1:
+        return 'fresher'
+    if experience <= 3:
+        return 'mid'
+    return 'senior'
+
+
+def question_hash(text):
+    """De-duplication key: whitespace and case differences hash the same."""
+    return hashlib.sha256(question_key(text).encode('utf-8')).hexdigest()
+
+
+class QuestionBank:
+    """Immutable snapshot of the templates per (level, interview_type)."""
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.loaded_at = time.monotonic()
+
+    def templates(self, level, interview_type):
+        return self.groups[(level, interview_type)]
+
+    def __len__(self):
+        return sum(len(templates) for templates in self.groups.values())
+
+
+def load_question_bank(include_imported=True):
+    """Build a new snapshot: the static questions, then imported ones in import order."""
+    groups = {key: list(templates) for key, templates in FALLBACK_QUESTIONS.items()}
+    if include_imported:
+        from users.models import Question
+
+        seen = {key: {question_hash(t) for t in templates} for key, templates in groups.items()}
+        rows = Question.objects.order_by('pk').values_list('text', 'text_hash', 'level', 'interview_type')
+        for text, text_hash, level, interview_type in rows.iterator(chunk_size=2000):
+            key = (level, interview_type)
+            if key in groups and text_hash not in seen[key]:
+                seen[key].add(text_hash)
+                groups[key].append(text)
+    return QuestionBank({key: tuple(templates) for key, templates in groups.items()})
+
+
+_bank = None
+_lock = threading.Lock()
+
+
+def reload_question_bank():
+    """Rebuild the bank and publish it atomically; returns the new snapshot."""
+    global _bank
+    try:
+        bank = load_question_bank()
+    except DatabaseError as e:
+        # e.g. before migrations have run: serve the static questions.
+        print(f"Imported questions unavailable: {e}")
+        bank = load_question_bank(include_imported=False)
+    _bank = bank
+    return bank
+
+
+def get_question_bank():
+    """Current snapshot, reloaded when older than QUESTION_BANK_TTL seconds."""
+    bank = _bank
+    ttl = getattr(settings, 'QUESTION_BANK_TTL', DEFAULT_TTL)
+    if bank is None or time.monotonic() - bank.loaded_at > ttl:
+        with _lock:
+            if _bank is bank:
+                return reload_question_bank()
+            return _bank
+    return bank
+
+
+def question_templates(level, interview_type):
+    """Return the templates for a level, defaulting unknown types to mixed."""
+    if interview_type not in ('technical', 'behavioral'):
+        interview_type = 'mixed'
+    return get_question_bank().templates(level, interview_type)
+
+
+def interview_templates(level, interview_type, count=QUESTIONS_PER_INTERVIEW):
+    """``count`` templates for one interview, sampled once imports have grown the group."""
+    templates = question_templates(level, interview_type)
+    if len(templates) <= count:
+        return list(templates)
+    return [templates[i] for i in sorted(random.sample(range(len(templates)), count))]
+
+
+def all_question_templates():
+    """Every distinct template in the bank, in a stable order."""
+    seen = {}
+    for templates in get_question_bank().groups.values():
+        for template in templates:
+            seen.setdefault(template, None)
+    return list(seen)
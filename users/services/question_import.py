@@ -0,0 +1,150 @@
+"""Bulk import of interview questions from CSV or JSONL.
+
+Files are read a line at a time and written in ``bulk_create`` batches, so
+imports of any size run in constant memory. Each row needs ``text``, a
+``level`` (fresher/mid/senior, an experience label such as 'junior', or
+years) and an ``interview_type``. Question text is normalised and hashed;
+rows already in the bank, or repeated within the file, are skipped.
+"""
+import csv
+import json
+
+from django.db import transaction
+
+from .question_bank import (
+    EXPERIENCE_YEARS,
+    INTERVIEW_TYPES,
+    LEVELS,
+    experience_level,
+    question_hash,
+    reload_question_bank,
+)
+
+FORMATS = ('csv', 'jsonl')
+BATCH_SIZE = 1000
+MAX_TEXT_LENGTH = 1000
+# Invalid rows reported individually; the rest are only counted.
+MAX_REPORTED_ERRORS = 50
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors = []
+
+    def error(self, line, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f'line {line}: {message}')
+
+    def __str__(self):
+        return f'{self.created} imported, {self.duplicates} duplicates skipped, {self.invalid} invalid'
+
+
+def format_for(filename):
+    """'csv' or 'jsonl' from a file name (``.ndjson`` counts as JSONL)."""
+    extension = filename.rsplit('.', 1)[-1].lower()
+    if extension == 'ndjson':
+        return 'jsonl'
+    if extension not in FORMATS:
+        raise ValueError(f'Unsupported file type: {filename!r} (expected .csv or .jsonl)')
+    return extension
+
+
+def read_rows(fh, fmt):
+    """Yield (line_number, row) from a text stream; unparseable lines yield an error string."""
+    if fmt == 'csv':
+        reader = csv.DictReader(fh)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(fh, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, f'invalid JSON ({e})'
+            continue
+        yield line_number, row if isinstance(row, dict) else 'expected a JSON object'
+
+
+def _level(value):
+    value = str(value if value is not None else '').strip().lower()
+    if value in LEVELS:
+        return value
+    if value in EXPERIENCE_YEARS:
+        return experience_level(value)
+    if value.isdigit():
+        return experience_level(int(value))
+    raise ValueError(f'unknown level {value!r}')
+
+
+def clean_row(row):
+    """Validated (text, text_hash, level, interview_type); raises ValueError."""
+    text = ' '.join(str(row.get('text') or row.get('question') or '').split())
+    if not text:
+        raise ValueError('missing question text')
+    if len(text) > MAX_TEXT_LENGTH:
+        raise ValueError(f'question longer than {MAX_TEXT_LENGTH} characters')
+    level = _level(row.get('level', row.get('experience')))
+    interview_type = str(row.get('interview_type') or 'mixed').strip().lower()
+    if interview_type not in INTERVIEW_TYPES:
+        raise ValueError(f'unknown interview_type {interview_type!r}')
+    return text, question_hash(text), level, interview_type
+
+
+def _stored_keys(Question, unique):
+    stored = (
+        Question.objects.filter(text_hash__in={key[0] for key in unique})
+        .values_list('text_hash', 'level', 'interview_type')
+    )
+    return {key for key in stored if key in unique}
+
+
+def _write_batch(batch, source, report):
+    from users.models import Question
+
+    # Drop repeats within the batch, then anything already stored.
+    unique = {}
+    for text, text_hash, level, interview_type in batch:
+        unique.setdefault((text_hash, level, interview_type), text)
+    with transaction.atomic():
+        existing = _stored_keys(Question, unique)
+        Question.objects.bulk_create([
+            Question(text=text, text_hash=key[0], level=key[1], interview_type=key[2], source=source)
+            for key, text in unique.items() if key not in existing
+        ], ignore_conflicts=True)
+        # ignore_conflicts skips rows a concurrent import inserted first, so
+        # count what this batch added rather than what it tried to insert.
+        created = len(_stored_keys(Question, unique)) - len(existing)
+    report.created += created
+    report.duplicates += len(batch) - created
+
+
+def import_questions(fh, fmt, source='', batch_size=BATCH_SIZE):
+    """Stream questions from ``fh`` into the bank; returns an ImportReport.
+
+    The in-process bank is rebuilt once the import finishes.
+    """
+    report = ImportReport()
+    batch = []
+    for line_number, row in read_rows(fh, fmt):
+        if isinstance(row, str):
+            report.error(line_number, row)
+            continue
+        try:
+            batch.append(clean_row(row))
+        except ValueError as e:
+            report.error(line_number, e)
+            continue
+        if len(batch) >= batch_size:
+            _write_batch(batch, source, report)
+            batch = []
+    if batch:
+        _write_batch(batch, source, report)
+    if report.created:
+        reload_question_bank()
+    return report
@@ -0,0 +1,164 @@
+"""Per-client token-bucket rate limits.
+
+Each scope in ``settings.RATE_LIMITS`` ("<requests>/<second|minute|hour>")
+gives every client a bucket of that many tokens, refilled continuously at
+the same rate, so short bursts pass and sustained floods are turned away
+with 429 and a Retry-After telling the client when a token will be free.
+Clients are identified by user when logged in and by IP address otherwise.
+
+Buckets live in the ``default`` cache (see interview_mocker/cache.py). With
+the local-memory cache each process keeps its own buckets, so the effective
+limit is per process; use the file or Redis cache to share them.
+"""
+import functools
+import math
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from rest_framework.throttling import BaseThrottle
+
+DEFAULT_RATE_LIMITS = {
+    'inference_api': '30/min',
+    'clip_upload': '30/min',
+    'frame_upload': '30/min',
+    'stats': '60/min',
+}
+PERIODS = {'s': 1, 'sec': 1, 'second': 1, 'm': 60, 'min': 60, 'minute': 60, 'h': 3600, 'hour': 3600}
+
+
+def parse_rate(rate):
+    """'30/min' -> (capacity, tokens per second)."""
+    count, _, period = rate.partition('/')
+    seconds = PERIODS[period.strip().lower()]
+    capacity = int(count)
+    return capacity, capacity / seconds
+
+
+class TokenBucketLimiter:
+    """A token bucket per client for one scope."""
+
+    def __init__(self, scope, rate, cache_alias='default'):
+        self.scope = scope
+        self.capacity, self.refill_rate = parse_rate(rate)
+        self.cache_alias = cache_alias
+        # Makes read-modify-write atomic within a process.
+        self._lock = threading.Lock()
+
+    def consume(self, ident, tokens=1, now=None):
+        """Take ``tokens`` from ``ident``'s bucket; returns 0, or seconds until they are available."""
+        cache = caches[self.cache_alias]
+        key = f'ratelimit:{self.scope}:{ident}'
+        now = time.time() if now is None else now
+        with self._lock:
+            level, updated = cache.get(key) or (self.capacity, now)
+            level = min(self.capacity, level + (now - updated) * self.refill_rate)
+            if level < tokens:
+                return (tokens - level) / self.refill_rate
+            # Expire once the bucket would be full again anyway.
+            cache.set(key, (level - tokens, now), timeout=math.ceil(self.capacity / self.refill_rate) + 1)
+        return 0.0
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(scope):
+    rate = getattr(settings, 'RATE_LIMITS', DEFAULT_RATE_LIMITS).get(scope)
+    if rate is None:
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get(scope)
+        if limiter is None or (limiter.capacity, limiter.refill_rate) != parse_rate(rate):
+            limiter = _limiters[scope] = TokenBucketLimiter(scope, rate)
+    return limiter
+
+
+def client_ident(user, remote_addr):
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{remote_addr}'
+
+
+def retry_after_seconds(wait):
+    return max(1, math.ceil(wait))
+
+
+def too_many_requests(wait, message='Too many requests. Please slow down.'):
+    response = JsonResponse({'error': message, 'retry_after': retry_after_seconds(wait)}, status=429)
+    response['Retry-After'] = str(retry_after_seconds(wait))
+    return response
+
+
+def rate_limit(scope):
+    """Decorator for function views (sync or async): 429 once the client's bucket is empty."""
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                limiter = get_limiter(scope)
+                if limiter:
+                    ident = client_ident(await request.auser(), request.META.get('REMOTE_ADDR'))
+                    wait = limiter.consume(ident)
+                    if wait:
+                        return too_many_requests(wait)
+                return await view(request, *args, **kwargs)
+        else:
+            @functools.wraps(view)
+            def wrapper(request, *args, **kwargs):
+                limiter = get_limiter(scope)
+                if limiter:
+                    wait = limiter.consume(client_ident(request.user, request.META.get('REMOTE_ADDR')))
+                    if wait:
+                        return too_many_requests(wait)
+                return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """DRF throttle backed by the same buckets; set ``scope`` on a subclass."""
+    scope = None
+
+    def cost(self, request, view):
+        return 1
+
+    def allow_request(self, request, view):
+        limiter = get_limiter(self.scope)
+        if limiter is None:
+            return True
+        user = request.user if request.user.is_authenticated else None
+        self.wait_seconds = limiter.consume(client_ident(user, self.get_ident(request)), self.cost(request, view))
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class InferenceAPIThrottle(TokenBucketThrottle):
+    scope = 'inference_api'
+
+
+class InferenceBatchThrottle(InferenceAPIThrottle):
+    """A batch costs one token per item.
+
+    Batch views accept at most ``batch_limit(view)`` items, never more than a
+    full bucket, so every item of an admitted batch is charged. Anything else
+    fails validation without reaching inference, so it costs one token.
+    """
+
+    @classmethod
+    def batch_limit(cls, view):
+        """The view's ``max_batch_size``, lowered to a full bucket: a larger batch could never be admitted."""
+        limiter = get_limiter(cls.scope)
+        return min(view.max_batch_size, limiter.capacity) if limiter else view.max_batch_size
+
+    def cost(self, request, view):
+        data = request.data
+        if isinstance(data, list) and len(data) <= self.batch_limit(view):
+            return max(len(data), 1)
+        return 1
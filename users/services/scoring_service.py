@@ -0,0 +1,274 @@
+"""Rule-based interview scoring.
+
+Every answer in an interview is scored in one vectorized NumPy pass over a
+shared token-count matrix: answer length, keyword coverage against its
+question, filler-word rate and (when clip durations are known) speaking
+rate. The sub-scores are combined into per-question scores, an overall
+score and a grade label without calling the language model.
+"""
+import re
+
+import numpy as np
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+STOP_WORDS = frozenset("""
+a about above after again all am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from
+further had has have having he her here hers him his how i if in into is it its
+itself just me more most my no nor not of off on once only or other our ours out
+over own same she should so some such than that the their theirs them then there
+these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your yours yourself tell
+describe explain give example walk us time
+""".split())
+
+FILLER_WORDS = frozenset(
+    ['um', 'uh', 'uhm', 'umm', 'er', 'erm', 'ah', 'hmm', 'like', 'basically',
+     'actually', 'literally', 'kinda', 'sorta', 'anyway']
+)
+
+# Answers shorter than this many words lose length credit; longer than the
+# maximum start to be penalised for rambling.
+IDEAL_MIN_WORDS = 60
+IDEAL_MAX_WORDS = 250
+# Fraction of the question's content words an answer must echo for full credit.
+FULL_COVERAGE = 0.5
+# Filler rate (fillers / words) at which the filler score reaches zero.
+MAX_FILLER_RATE = 0.10
+# Conversational pace in words per minute and the tolerated deviation.
+IDEAL_WPM = 140.0
+WPM_TOLERANCE = 80.0
+
+WEIGHTS = {'length': 0.35, 'coverage': 0.35, 'fillers': 0.15, 'pace': 0.15}
+
+GRADE_THRESHOLDS = ((85, 'A'), (70, 'B'), (55, 'C'), (40, 'D'))
+
+# (sub-score, strength at or above, weakness below, strength, weakness, suggestion)
+ASSESSMENTS = (
+    ('coverage', 0.7, 0.4,
+     'Answers stayed focused on what each question asked.',
+     'Several answers drifted away from the question asked.',
+     'Restate the key point of each question before answering it.'),
+    ('length', 0.8, 0.5,
+     'Answers were developed in appropriate depth.',
+     'Answers were brief and lacked supporting detail.',
+     'Use the STAR method (Situation, Task, Action, Result) to structure answers.'),
+    ('fillers', 0.8, 0.5,
+     'Delivery was clear with few filler words.',
+     'Frequent filler words weakened delivery.',
+     'Pause briefly instead of using filler words while you think.'),
+    ('pace', 0.8, 0.5,
+     'Speaking pace was comfortable to follow.',
+     'Speaking pace was noticeably too fast or too slow.',
+     'Practice answering aloud at a steady, conversational pace.'),
+)
+
+
+def grade_for(score):
+    for threshold, label in GRADE_THRESHOLDS:
+        if score >= threshold:
+            return label
+    return 'F'
+
+
+def tokenize(text):
+    return _WORD_RE.findall((text or '').lower())
+
+
+def _count_matrix(token_lists, vocab):
+    """Build an (n_texts, len(vocab)) count matrix, growing vocab as needed."""
+    lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+    ids = np.fromiter(
+        (vocab.setdefault(tok, len(vocab)) for toks in token_lists for tok in toks),
+        dtype=np.int64,
+        count=int(lengths.sum()),
+    )
+    rows = np.repeat(np.arange(len(token_lists)), lengths)
+    return rows, ids
+
+
+def compute_features(questions, answers, durations=None):
+    """Return a dict of per-answer feature arrays, all of length len(answers)."""
+    n = len(answers)
+    vocab = {}
+    q_rows, q_ids = _count_matrix([tokenize(q) for q in questions], vocab)
+    a_rows, a_ids = _count_matrix([tokenize(a) for a in answers], vocab)
+
+    words = list(vocab)
+    is_filler = np.fromiter((w in FILLER_WORDS for w in words), dtype=bool, count=len(words))
+    is_content = np.fromiter(
+        (w not in STOP_WORDS and len(w) > 2 for w in words), dtype=bool, count=len(words)
+    )
+
+    answer_counts = np.zeros((n, len(words)), dtype=np.int32)
+    np.add.at(answer_counts, (a_rows, a_ids), 1)
+    question_terms = np.zeros((n, len(words)), dtype=bool)
+    question_terms[q_rows, q_ids] = True
+    question_terms &= is_content
+
+    word_count = answer_counts.sum(axis=1)
+    q_term_count = question_terms.sum(axis=1)
+    covered = ((answer_counts > 0) & question_terms).sum(axis=1)
+    coverage = np.divide(covered, q_term_count, out=np.zeros(n), where=q_term_count > 0)
+    filler_count = answer_counts[:, is_filler].sum(axis=1)
+    filler_rate = np.divide(filler_count, word_count, out=np.zeros(n), where=word_count > 0)
+
+    seconds = np.full(n, np.nan)
+    if durations is not None:
+        seconds[:] = [(durations[i] if i < len(durations) else None) or np.nan for i in range(n)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        wpm = np.where(seconds > 0, word_count / (seconds / 60.0), np.nan)
+
+    return {
+        'word_count': word_count,
+        'keyword_coverage': coverage,
+        'filler_rate': filler_rate,
+        'words_per_minute': wpm,
+    }
+
+
+def score_features(features):
+    """Combine feature arrays into 0-100 per-answer scores."""
+    words = features['word_count'].astype(float)
+    length = np.clip(words / IDEAL_MIN_WORDS, 0, 1)
+    length *= np.clip(IDEAL_MAX_WORDS / np.maximum(words, 1), 0.6, 1)
+    coverage = np.clip(features['keyword_coverage'] / FULL_COVERAGE, 0, 1)
+    fillers = np.clip(1 - features['filler_rate'] / MAX_FILLER_RATE, 0, 1)
+    wpm = features['words_per_minute']
+    pace = 1 - np.clip(np.abs(wpm - IDEAL_WPM) / WPM_TOLERANCE, 0, 1)
+
+    parts = {'length': length, 'coverage': coverage, 'fillers': fillers, 'pace': pace}
+    stacked = np.stack([parts[k] for k in WEIGHTS])
+    weights = np.array(list(WEIGHTS.values()))[:, None] * ~np.isnan(stacked)
+    combined = np.nansum(stacked * weights, axis=0) / weights.sum(axis=0)
+    scores = np.rint(combined * 100).astype(int)
+    scores[words == 0] = 0
+    return scores, parts
+
+
+def _question_feedback(parts, i):
+    if parts['length'][i] == 0:
+        return 'No answer was captured for this question.'
+    hints = {
+        'length': 'Expand this answer with a concrete example and its outcome.',
+        'coverage': 'Address the question more directly; reuse its key terms in your answer.',
+        'fillers': 'Cut down on filler words such as "um" and "like".',
+        'pace': 'Adjust your pace; aim for a steady, conversational speed.',
+    }
+    values = {k: parts[k][i] for k in hints if not np.isnan(parts[k][i])}
+    weakest = min(values, key=values.get)
+    if values[weakest] >= 0.8:
+        return 'Well-structured, relevant answer.'
+    return hints[weakest]
+
+
+def _finite(value, digits=3):
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+TRANSCRIPTION_FAILED = '[Audio transcription failed]'
+
+
+def final_answers(questions, answers, transcripts=None):
+    """The text to score per question: the transcript when usable, else the typed answer."""
+    answers = answers or []
+    transcripts = transcripts or []
+    selected = []
+    for i in range(len(questions)):
+        typed = answers[i] if i < len(answers) else ''
+        spoken = transcripts[i] if i < len(transcripts) else ''
+        selected.append(spoken if spoken and spoken != TRANSCRIPTION_FAILED else typed)
+    return selected
+
+
+def merge_feedback(existing, scored):
+    """Overlay freshly scored fields onto a stored payload, keeping extra keys."""
+    merged = dict(existing or {})
+    old_items = merged.get('questions') or []
+    merged.update({k: v for k, v in scored.items() if k != 'questions'})
+    items = []
+    for i, item in enumerate(scored.get('questions') or []):
+        previous = old_items[i] if i < len(old_items) and isinstance(old_items[i], dict) else {}
+        items.append({**previous, **item})
+    merged['questions'] = items
+    return merged
+
+
+def score_batch(rows):
+    """Score ``(pk, questions, answers, transcripts, durations)`` rows.
+
+    Pure function so it can run in a worker process without Django.
+    """
+    scored = []
+    for pk, questions, answers, transcripts, durations in rows:
+        questions = questions or []
+        scored.append((pk, score_interview(questions, final_answers(questions, answers, transcripts), durations)))
+    return scored
+
+
+def score_interview(questions, answers, durations=None):
+    """Score an interview and return a feedback payload.
+
+    ``answers`` should hold the final text for each question (the transcript
+    in voice mode). ``durations`` optionally gives each clip's length in
+    seconds so speaking rate can be scored.
+    """
+    answers = [answers[i] if i < len(answers) else '' for i in range(len(questions))]
+    if not questions:
+        return {
+            'overall_score': 0, 'grade_label': grade_for(0), 'summary': 'No questions were answered.',
+            'strengths': [], 'weaknesses': [], 'suggestions': [], 'questions': [],
+        }
+
+    features = compute_features(questions, answers, durations)
+    scores, parts = score_features(features)
+    overall = int(round(float(scores.mean())))
+
+    strengths, weaknesses, suggestions = [], [], []
+    # Judge the interview on the questions that were actually answered.
+    answered = features['word_count'] > 0
+    means = {}
+    for name, values in parts.items():
+        values = values[answered]
+        values = values[~np.isnan(values)]
+        means[name] = float(values.mean()) if values.size else None
+    for name, good, poor, strength, weakness, suggestion in ASSESSMENTS:
+        if means[name] is None:
+            continue
+        if means[name] >= good:
+            strengths.append(strength)
+        elif means[name] < poor:
+            weaknesses.append(weakness)
+            suggestions.append(suggestion)
+    unanswered = int((features['word_count'] == 0).sum())
+    if unanswered:
+        weaknesses.append(f'{unanswered} question(s) had no captured answer.')
+
+    best = int(np.argmax(scores))
+    summary = (
+        f'Overall score {overall}/100 across {len(questions)} questions. '
+        f'Your strongest answer was to question {best + 1}.'
+    )
+
+    question_items = []
+    for i, question in enumerate(questions):
+        question_items.append({
+            'question': question,
+            'answer': answers[i],
+            'score': int(scores[i]),
+            'feedback': _question_feedback(parts, i),
+            'metrics': {name: _finite(values[i]) for name, values in features.items()},
+        })
+        question_items[-1]['metrics']['word_count'] = int(features['word_count'][i])
+
+    return {
+        'overall_score': overall,
+        'grade_label': grade_for(overall),
+        'summary': summary,
+        'strengths': strengths,
+        'weaknesses': weaknesses,
+        'suggestions': suggestions,
+        'questions': question_items,
+    }
@@ -0,0 +1,192 @@
+"""Speech-to-text with Whisper, plus delivery metrics from its segment timings.
+
+A clip is decoded once and transcribed once; the segment timestamps Whisper
+already produces are reused to measure pace, pauses, fillers and how long
+the candidate took to start speaking. Results are cached by a hash of the
+audio bytes, so a retried upload or a final submit carrying a clip that was
+already transcribed costs a dictionary lookup rather than a Whisper pass.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+from .metrics import span
+from .scoring_service import FILLER_WORDS, tokenize
+
+# Whisper resamples everything to 16 kHz mono.
+SAMPLE_RATE = 16000
+# Gaps between segments shorter than this are ordinary breathing room.
+MIN_PAUSE_SECONDS = 0.25
+LONG_PAUSE_SECONDS = 2.0
+
+_model = None
+_lock = threading.Lock()
+
+
+def whisper_model_name():
+    return getattr(settings, 'WHISPER_MODEL_NAME', 'base')
+
+
+def get_whisper_model():
+    """Process-wide Whisper model, loaded on first use."""
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                import whisper
+                with span('whisper.load_model'):
+                    _model = whisper.load_model(whisper_model_name())
+    return _model
+
+
+class TranscriptCache:
+    """Transcripts keyed by audio content hash, model and language.
+
+    A bounded in-memory LRU, optionally backed by a directory of JSON files
+    so entries survive restarts and are shared between worker processes.
+    """
+
+    def __init__(self, max_entries=128, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(audio_bytes, model_name, language=None):
+        digest = hashlib.sha256(audio_bytes).hexdigest()
+        return f'{digest}-{model_name}-{language or "auto"}'
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.json')
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), encoding='utf-8') as fh:
+                value = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        self._remember(key, value)
+        return value
+
+    def set(self, key, value):
+        self._remember(key, value)
+        if self.directory:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                json.dump(value, fh)
+            os.replace(tmp, path)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = None
+
+
+def get_transcript_cache():
+    global _cache
+    if _cache is None:
+        _cache = TranscriptCache(
+            max_entries=getattr(settings, 'TRANSCRIPT_CACHE_SIZE', 128),
+            directory=getattr(settings, 'TRANSCRIPT_CACHE_DIR', None),
+        )
+    return _cache
+
+
+def transcribe(audio_bytes, language=None, suffix='.webm'):
+    """Transcribe a clip; returns ``{'text', 'segments', 'duration'}``.
+
+    Identical audio is only ever transcribed once per model and language.
+    """
+    if language is None:
+        language = getattr(settings, 'WHISPER_LANGUAGE', None)
+    cache = get_transcript_cache()
+    key = cache.key_for(audio_bytes, whisper_model_name(), language)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    import whisper
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tf:
+        tf.write(audio_bytes)
+        temp_name = tf.name
+    try:
+        audio = whisper.load_audio(temp_name)
+    finally:
+        try:
+            os.remove(temp_name)
+        except OSError:
+            pass
+
+    model = get_whisper_model()
+    with span('whisper.transcribe'):
+        result = model.transcribe(audio, language=language)
+    segments = [
+        {'start': float(seg['start']), 'end': float(seg['end']), 'text': seg.get('text', '')}
+        for seg in result.get('segments') or []
+    ]
+    spoken = {
+        'text': (result.get('text') or '').strip(),
+        'segments': segments,
+        'duration': len(audio) / SAMPLE_RATE,
+    }
+    cache.set(key, spoken)
+    return spoken
+
+
+def delivery_metrics(segments, duration=None):
+    """Pace, pause distribution, filler rate and time-to-first-word for a clip."""
+    if not segments:
+        return None
+    starts = np.array([s['start'] for s in segments], dtype=float)
+    ends = np.array([s['end'] for s in segments], dtype=float)
+    order = np.argsort(starts)
+    starts, ends = starts[order], ends[order]
+    words = [tokenize(segments[i]['text']) for i in order]
+    word_count = sum(len(w) for w in words)
+    fillers = sum(1 for ws in words for w in ws if w in FILLER_WORDS)
+
+    speaking_seconds = float(max(ends[-1] - starts[0], 0.0))
+    gaps = starts[1:] - ends[:-1]
+    pauses = gaps[gaps >= MIN_PAUSE_SECONDS]
+
+    def rounded(value):
+        return round(float(value), 2)
+
+    return {
+        'duration_seconds': rounded(duration if duration is not None else ends[-1]),
+        'speaking_seconds': rounded(speaking_seconds),
+        'word_count': word_count,
+        'words_per_minute': rounded(word_count / (speaking_seconds / 60.0)) if speaking_seconds > 0 else None,
+        'time_to_first_word': rounded(starts[0]),
+        'pause_count': int(pauses.size),
+        'long_pause_count': int((pauses >= LONG_PAUSE_SECONDS).sum()),
+        'mean_pause': rounded(pauses.mean()) if pauses.size else 0.0,
+        'p90_pause': rounded(np.percentile(pauses, 90)) if pauses.size else 0.0,
+        'max_pause': rounded(pauses.max()) if pauses.size else 0.0,
+        'filler_rate': round(fillers / word_count, 4) if word_count else 0.0,
+    }
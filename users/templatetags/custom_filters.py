@@ -1,3 +1,4 @@
+import json
 from django import template
 
 register = template.Library()
@@ -12,3 +13,14 @@ def index(value, arg):
         return value[arg]
     except (IndexError, TypeError):
         return None
+
+@register.filter
+def pretty_json(value):
+    """
+    Renders a JSON-serializable value as indented JSON text.
+    Usage: {{ result.ai_feedback|pretty_json }}
+    """
+    try:
+        return json.dumps(value, indent=2, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return value
@@ -1,3 +1,915 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from feedback.models import InterviewResult
+from users.services.feedback_jobs import generate_feedback
+from users.services.scoring_service import score_interview
+
+
+class ResultViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='cand@example.com', password='pw')
+        self.client.force_login(self.user)
+
+    def make_result(self, **overrides):
+        fields = {
+            'user': self.user, 'name': 'Candidate', 'role': 'Developer', 'experience': 1,
+            'mode': 'voice', 'questions': ['Q1'], 'answers': ['A1'],
+        }
+        fields.update(overrides)
+        return InterviewResult.objects.create(**fields)
+
+    def test_result_detail_renders_structured_feedback(self):
+        result = self.make_result(ai_feedback={'summary': 'Well done', 'strengths': ['Concise answers']})
+        response = self.client.get(reverse('result_detail', args=[result.pk]))
+        self.assertContains(response, 'Concise answers')
+        self.assertEqual(response.context['feedback']['summary'], 'Well done')
+
+    def test_stats_counts_results_with_feedback(self):
+        self.make_result(ai_feedback={'summary': 'Done'})
+        self.make_result()
+        data = self.client.get(reverse('stats')).json()
+        self.assertEqual(data['total_interviews'], 2)
+        self.assertEqual(data['total_feedbacks'], 1)
+
+
+class ScoringServiceTests(TestCase):
+    QUESTIONS = [
+        'Describe a challenging technical problem you have solved.',
+        'How do you handle constructive criticism?',
+    ]
+
+    def test_relevant_detailed_answer_outscores_short_one(self):
+        detailed = ('We had a challenging memory leak in a technical service that I solved by profiling '
+                    'the heap, bounding an unbounded cache and load testing the fix before release. ') * 3
+        feedback = score_interview(self.QUESTIONS, [detailed, 'Um, like, fine.'])
+        first, second = feedback['questions']
+        self.assertGreater(first['score'], second['score'])
+        self.assertGreater(second['metrics']['filler_rate'], 0)
+        self.assertEqual(feedback['overall_score'], round((first['score'] + second['score']) / 2))
+
+    def test_missing_answers_score_zero(self):
+        feedback = score_interview(self.QUESTIONS, [])
+        self.assertEqual([q['score'] for q in feedback['questions']], [0, 0])
+        self.assertEqual(feedback['grade_label'], 'F')
+
+    def test_speaking_rate_uses_durations(self):
+        feedback = score_interview(self.QUESTIONS[:1], ['word ' * 70], durations=[30])
+        self.assertEqual(feedback['questions'][0]['metrics']['words_per_minute'], 140.0)
+
+
+class HashingEncoder:
+    """Tiny bag-of-words stand-in for the sentence-embedding model."""
+    model_name = 'test-hashing'
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        import zlib
+        import numpy as np
+
+        self.encoded.extend(texts)
+        matrix = np.zeros((len(texts), 1024), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().replace('?', '').split():
+                matrix[row, zlib.crc32(word.encode()) % 1024] += 1
+        norms = np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        return matrix / norms
+
+
+class EmbeddingServiceTests(TestCase):
+    def test_index_hits_skip_question_encoding(self):
+        import tempfile
+        from users.services.embedding_service import QuestionEmbeddingIndex, score_relevance
+        from users.views import generate_fallback_questions
+
+        questions = generate_fallback_questions('Data Engineer', 3, 'technical')
+        with tempfile.TemporaryDirectory() as directory:
+            index = QuestionEmbeddingIndex(directory)
+            index.build(HashingEncoder(), ["Can you explain your experience with {role}-related technologies?"])
+            encoder = HashingEncoder()
+            answers = ['my experience with related technologies', 'pizza', '', '', '']
+            scores = score_relevance(questions, answers, role='Data Engineer', model=encoder, index=index)
+
+        # Only the answers and the four questions missing from the index were encoded.
+        self.assertEqual(len(encoder.encoded), len(answers) + 4)
+        self.assertNotIn(questions[0], encoder.encoded)
+        self.assertGreater(scores[0], scores[1])
+        self.assertEqual(scores[2], 0)
+
+    def test_failed_model_load_backs_off(self):
+        from users.services import embedding_service
+
+        self.addCleanup(setattr, embedding_service, '_load_failure', None)
+        with mock.patch.object(embedding_service, 'EmbeddingModel', side_effect=OSError('offline')) as load:
+            for _ in range(3):
+                with self.assertRaises(Exception):
+                    embedding_service.get_embedding_model()
+            self.assertEqual(load.call_count, 1)
+            with override_settings(EMBEDDING_RETRY_SECONDS=0), self.assertRaises(OSError):
+                embedding_service.get_embedding_model()
+            self.assertEqual(load.call_count, 2)
+
+
+def jpeg_bytes(color=128, size=(640, 480)):
+    from io import BytesIO
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new('RGB', size, (color, color, color)).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+class InterviewFlowMixin:
+    interview_form = {'name': 'Candidate', 'role': 'Developer', 'experience': 'Mid',
+                      'interview_type': 'technical', 'mode': 'voice'}
+
+    def start_interview(self, **overrides):
+        return self.client.post(reverse('mock_interview'), {**self.interview_form, **overrides})
+
+    async def astart_interview(self, **overrides):
+        """Start an interview with the async client; returns its interview id."""
+        await self.async_client.post(reverse('mock_interview'), {**self.interview_form, **overrides})
+        return (await self.async_client.session.aget('interview_data'))['interview_id']
+
+
+@override_settings(ANSWER_RELEVANCE_ENABLED=False)
+class WebcamFrameUploadTests(InterviewFlowMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='cand@example.com', password='pw')
+        self.client.force_login(self.user)
+        self.url = reverse('upload_webcam_frame')
+
+    def test_requires_active_interview(self):
+        response = self.client.post(self.url, jpeg_bytes(), content_type='image/jpeg')
+        self.assertEqual(response.status_code, 400)
+
+    def test_binary_frames_are_reduced_to_metrics(self):
+        self.start_interview()
+        self.client.post(self.url, jpeg_bytes(40), content_type='image/jpeg')
+        response = self.client.post(self.url, jpeg_bytes(200), content_type='image/jpeg')
+        self.assertEqual(response.json()['total'], 2)
+
+        from users.models import InterviewFrameBatch
+
+        first, second = [m for b in InterviewFrameBatch.objects.order_by('pk') for m in b.metrics]
+        self.assertLess(first['brightness'], second['brightness'])
+        self.assertIsNone(first['motion'])
+        self.assertGreater(second['motion'], 0.5)
+
+    def test_frame_upload_never_saves_the_session(self):
+        # A frame upload overlapping an answer submission must not write back
+        # the session it loaded before the answer was recorded.
+        self.start_interview()
+        store = type(self.client.session)
+        with mock.patch.object(store, 'save') as save:
+            response = self.client.post(self.url, jpeg_bytes(), content_type='image/jpeg')
+        self.assertEqual(response.status_code, 200)
+        save.assert_not_called()
+        self.assertNotIn('interaction_feedbacks', self.client.session)
+
+    def test_rejects_non_jpeg(self):
+        self.start_interview()
+        response = self.client.post(self.url, b'not an image', content_type='image/jpeg')
+        self.assertEqual(response.status_code, 400)
+
+    def test_final_submit_stores_interaction_summary(self):
+        self.start_interview()
+        for color in (100, 110, 120):
+            self.client.post(self.url, jpeg_bytes(color), content_type='image/jpeg')
+        for _ in range(5):
+            response = self.client.post(reverse('interview_run'), {'answer': 'An answer.'})
+        result = InterviewResult.objects.get(user=self.user)
+        self.assertRedirects(response, reverse('result_detail', args=[result.pk]))
+        self.assertEqual(result.interaction_feedback['frames_analyzed'], 3)
+        from users.models import InterviewFrameBatch
+        self.assertFalse(InterviewFrameBatch.objects.exists())
+
+
+class InteractionAnalysisTests(TestCase):
+    @staticmethod
+    def subject_frame(cx=32, cy=24):
+        import numpy as np
+
+        yy, xx = np.mgrid[0:48, 0:64]
+        frame = np.full((48, 64), 60, dtype=np.uint8)
+        frame[((xx - cx) ** 2 / 10 ** 2 + (yy - cy) ** 2 / 14 ** 2) < 1] = 210
+        return frame
+
+    def test_presence_and_framing(self):
+        import numpy as np
+        from users.services.frame_service import analyze_frames, summarize
+
+        blank = np.full((48, 64), 60, dtype=np.uint8)
+        stack = np.stack([self.subject_frame(), self.subject_frame(), blank])
+        frames = analyze_frames(stack)
+        self.assertEqual([f['presence'] for f in frames], [True, True, False])
+        self.assertIsNone(frames[0]['motion'])
+        self.assertEqual(frames[1]['motion'], 0)
+
+        summary = summarize(frames)
+        self.assertAlmostEqual(summary['presence_rate'], 2 / 3, places=3)
+        self.assertEqual(summary['framing_stability'], 1)
+        self.assertLess(summary['framing_offset'], 0.05)
+
+    def test_off_centre_subject_is_noted(self):
+        import numpy as np
+        from users.services.frame_service import analyze_frames, summarize
+
+        summary = summarize(analyze_frames(np.stack([self.subject_frame(cx=12, cy=12)] * 3)))
+        self.assertGreater(summary['framing_offset'], 0.2)
+        self.assertTrue(any('off-centre' in note for note in summary['notes']))
+
+
+SEGMENTS = [
+    {'start': 1.5, 'end': 4.0, 'text': ' Um I built the billing service'},
+    {'start': 4.2, 'end': 7.0, 'text': ' and I owned its deployment pipeline.'},
+    {'start': 9.5, 'end': 12.0, 'text': ' It basically cut release time in half.'},
+]
+
+
+class DeliveryMetricsTests(InterviewFlowMixin, TestCase):
+    def test_metrics_from_segments(self):
+        from users.services.transcription_service import delivery_metrics
+
+        metrics = delivery_metrics(SEGMENTS, duration=13.0)
+        self.assertEqual(metrics['time_to_first_word'], 1.5)
+        self.assertEqual(metrics['speaking_seconds'], 10.5)
+        self.assertEqual(metrics['word_count'], 19)
+        self.assertAlmostEqual(metrics['words_per_minute'], 19 / 10.5 * 60, places=1)
+        self.assertEqual(metrics['pause_count'], 1)
+        self.assertEqual(metrics['long_pause_count'], 1)
+        self.assertEqual(metrics['max_pause'], 2.5)
+        self.assertAlmostEqual(metrics['filler_rate'], 2 / 19, places=3)
+        self.assertIsNone(delivery_metrics([]))
+
+    @override_settings(ANSWER_RELEVANCE_ENABLED=False)
+    def test_final_submit_stores_delivery_metrics(self):
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        user = User.objects.create_user(username='voice@example.com', password='pw')
+        self.client.force_login(user)
+        self.start_interview()
+        spoken = {'text': 'I built the billing service.', 'segments': SEGMENTS, 'duration': 13.0}
+        with mock.patch('users.views.transcribe', return_value=spoken) as transcribe:
+            for _ in range(5):
+                self.client.post(reverse('interview_run'), {
+                    'answer': '', 'audio_file': SimpleUploadedFile('a.webm', b'audio', 'audio/webm'),
+                })
+        self.assertEqual(transcribe.call_count, 5)
+
+        result = InterviewResult.objects.get(user=user)
+        self.assertEqual(len(result.voice_metrics), 5)
+        generate_feedback(result.pk)
+        result.refresh_from_db()
+        item = result.ai_feedback['questions'][0]
+        self.assertEqual(item['delivery']['pause_count'], 1)
+        self.assertIsNotNone(item['metrics']['words_per_minute'])
+        self.assertNotIn('voice_metrics', self.client.session)
+
+    @override_settings(ANSWER_RELEVANCE_ENABLED=False)
+    def test_run_reuses_clip_transcripts(self):
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        user = User.objects.create_user(username='clips@example.com', password='pw')
+        self.client.force_login(user)
+        self.start_interview()
+        spoken = {'text': 'From the clip upload.', 'segments': SEGMENTS, 'duration': 13.0}
+        with mock.patch('users.views.transcribe', return_value=spoken) as transcribe:
+            for idx in range(5):
+                audio = SimpleUploadedFile('a.webm', b'audio', 'audio/webm')
+                self.client.post(reverse('upload_question_clip'), {
+                    'question_idx': idx, 'audio_file': audio,
+                })
+                self.client.post(reverse('interview_run'), {
+                    'answer': '', 'audio_file': SimpleUploadedFile('a.webm', b'audio', 'audio/webm'),
+                })
+        # One pass per clip; the answer submissions reuse the clip results.
+        self.assertEqual(transcribe.call_count, 5)
+        result = InterviewResult.objects.get(user=user)
+        self.assertEqual(result.voice_transcripts, ['From the clip upload.'] * 5)
+        self.assertEqual(result.voice_metrics[0]['pause_count'], 1)
+
+
+class TranscriptCacheTests(TestCase):
+    def test_lru_eviction_and_disk_tier(self):
+        import tempfile
+        from users.services.transcription_service import TranscriptCache
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TranscriptCache(max_entries=2, directory=directory)
+            keys = [TranscriptCache.key_for(bytes([i]), 'base', 'en') for i in range(3)]
+            for i, key in enumerate(keys):
+                cache.set(key, {'text': str(i)})
+            self.assertEqual(list(cache._entries), keys[1:])
+
+            # Evicted from memory but still on disk; a fresh process finds it too.
+            self.assertEqual(cache.get(keys[0]), {'text': '0'})
+            self.assertEqual(TranscriptCache(directory=directory).get(keys[2]), {'text': '2'})
+
+    def test_key_depends_on_model_and_language(self):
+        from users.services.transcription_service import TranscriptCache
+
+        key = TranscriptCache.key_for(b'audio', 'base', 'en')
+        self.assertEqual(key, TranscriptCache.key_for(b'audio', 'base', 'en'))
+        self.assertNotEqual(key, TranscriptCache.key_for(b'audio', 'small', 'en'))
+        self.assertNotEqual(key, TranscriptCache.key_for(b'audio', 'base', None))
+
+    def test_cached_audio_skips_whisper(self):
+        from users.services import transcription_service as ts
+
+        cache = ts.get_transcript_cache()
+        spoken = {'text': 'cached', 'segments': [], 'duration': 1.0}
+        cache.set(cache.key_for(b'clip', ts.whisper_model_name(), 'en'), spoken)
+        # A hit returns before Whisper is imported or the audio decoded.
+        self.assertEqual(ts.transcribe(b'clip', language='en'), spoken)
+
+
+class AsyncInterviewViewTests(InterviewFlowMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='async@example.com', password='pw')
+        self.client.force_login(self.user)
+
+    def test_run_page_renders(self):
+        self.start_interview()
+        response = self.client.get(reverse('interview_run'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total'], 5)
+
+    async def test_clip_upload_transcribes_in_background(self):
+        import asyncio
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from users.services.events import get_event_broker, interview_channel
+        from users.services.inference import get_clip_jobs
+
+        await self.async_client.aforce_login(self.user)
+        interview_id = await self.astart_interview()
+
+        spoken = {'text': 'Async clip.', 'segments': SEGMENTS, 'duration': 13.0}
+        with mock.patch('users.views.transcribe', return_value=spoken):
+            response = await self.async_client.post(reverse('upload_question_clip'), {
+                'question_idx': 0, 'audio_file': SimpleUploadedFile('a.webm', b'audio', 'audio/webm'),
+            })
+            self.assertEqual(response.status_code, 202)
+            clip = await asyncio.wrap_future(get_clip_jobs().get((interview_id, 0)))
+        self.assertEqual(clip['text'], 'Async clip.')
+
+        subscription = get_event_broker().subscribe(interview_channel(interview_id))
+        names = [(await subscription.get(timeout=1)).name for _ in range(2)]
+        subscription.close()
+        self.assertEqual(names, ['transcription_queued', 'transcript'])
+
+    async def test_event_stream(self):
+        from users.services.events import get_event_broker, interview_channel
+
+        await self.async_client.aforce_login(self.user)
+        interview_id = await self.astart_interview()
+        broker = get_event_broker()
+        broker.publish(interview_channel(interview_id), 'transcript', {'question_idx': 0, 'text': 'Hi'})
+        broker.publish(interview_channel(interview_id), 'feedback_ready', {'result_id': 1})
+
+        url = reverse('interview_events', args=[interview_id])
+        response = await self.async_client.get(url, headers={'Last-Event-ID': '1'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = ''.join([chunk.decode() async for chunk in response.streaming_content])
+        self.assertNotIn('event: transcript', body)
+        self.assertIn('id: 2\nevent: feedback_ready\ndata: {"result_id": 1}', body)
+
+        other = reverse('interview_events', args=['not-this-interview'])
+        self.assertEqual((await self.async_client.get(other)).status_code, 404)
+
+    def test_event_stream_refused_under_wsgi(self):
+        self.client.force_login(self.user)
+        self.start_interview()
+        interview_id = self.client.session['interview_data']['interview_id']
+        response = self.client.get(reverse('interview_events', args=[interview_id]))
+        self.assertEqual(response.status_code, 204)
+
+    async def test_api_view_offloads_generation(self):
+        from unittest import mock
+
+        questions = ['Question one?', 'Question two?']
+        with mock.patch('users.views.generate_interview_questions', return_value=questions):
+            response = await self.async_client.post(
+                reverse('interview_start'),
+                {'name': 'Candidate', 'role': 'Developer', 'experience': 'Mid', 'interview_type': 'technical'},
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['questions'], questions)
+
+
+@override_settings(ANSWER_RELEVANCE_ENABLED=False)
+class DeferredFeedbackTests(InterviewFlowMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='deferred@example.com', password='pw')
+        self.client.force_login(self.user)
+
+    def finish_interview(self):
+        self.start_interview()
+        with self.captureOnCommitCallbacks() as callbacks:
+            for _ in range(5):
+                response = self.client.post(reverse('interview_run'), {'answer': 'I design services.'})
+        self.assertEqual(len(callbacks), 1)
+        return response, InterviewResult.objects.get(user=self.user)
+
+    def test_final_submit_saves_pending_result(self):
+        response, result = self.finish_interview()
+        self.assertRedirects(response, reverse('result_detail', args=[result.pk]))
+        self.assertEqual(result.feedback_status, InterviewResult.FEEDBACK_PENDING)
+        self.assertEqual(result.ai_feedback, {})
+
+        page = self.client.get(reverse('result_detail', args=[result.pk]))
+        self.assertContains(page, 'Your feedback is being generated')
+        self.assertContains(page, reverse('result_events', args=[result.pk]))
+
+    def test_worker_completes_feedback(self):
+        from users.services.events import get_event_broker
+        from users.services.feedback_jobs import result_channel
+
+        _, result = self.finish_interview()
+        generate_feedback(result.pk)
+        result.refresh_from_db()
+        self.assertEqual(result.feedback_status, InterviewResult.FEEDBACK_READY)
+        self.assertEqual(len(result.ai_feedback['questions']), 5)
+        self.assertEqual(result.overall_score, result.ai_feedback['overall_score'])
+
+        channel = get_event_broker()._channels[result_channel(result.pk)]
+        self.assertEqual([e.name for e in channel.replay], ['feedback_progress', 'feedback_ready'])
+
+        fragment = self.client.get(reverse('result_detail', args=[result.pk]), {'fragment': 1})
+        self.assertNotContains(fragment, '<html')
+        self.assertContains(fragment, 'Question-by-Question Analysis')
+        events = self.client.get(reverse('result_events', args=[result.pk]))
+        self.assertEqual(events.status_code, 204)
+
+
+@override_settings(ANSWER_RELEVANCE_ENABLED=False)
+class IdempotentStepTests(InterviewFlowMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='retry@example.com', password='pw')
+        self.client.force_login(self.user)
+        self.start_interview()
+        self.interview_id = self.client.session['interview_data']['interview_id']
+
+    def submit(self, idx, answer='An answer.'):
+        return self.client.post(reverse('interview_run'), {
+            'answer': answer, 'interview_id': self.interview_id, 'question_idx': idx,
+        })
+
+    def test_repeated_step_is_not_reprocessed(self):
+        self.submit(0, 'first')
+        response = self.submit(0, 'retry')
+        self.assertRedirects(response, reverse('interview_run'), fetch_redirect_response=False)
+        self.assertEqual(self.client.session['interview_answers'], ['first'])
+        self.assertEqual(self.client.session['current_question_idx'], 1)
+
+    def test_retried_final_submit_returns_same_result(self):
+        for idx in range(5):
+            self.submit(idx)
+        result = InterviewResult.objects.get(user=self.user)
+        self.assertEqual(result.interview_id, self.interview_id)
+        retry = self.submit(4)
+        self.assertRedirects(retry, reverse('result_detail', args=[result.pk]))
+        self.assertEqual(InterviewResult.objects.filter(user=self.user).count(), 1)
+
+    def test_restarted_interview_is_not_answered_from_old_steps(self):
+        self.submit(0, 'abandoned')
+        self.start_interview()
+        self.interview_id = self.client.session['interview_data']['interview_id']
+        self.submit(0, 'fresh')
+        self.assertEqual(self.client.session['interview_answers'], ['fresh'])
+        self.assertEqual(self.client.session['current_question_idx'], 1)
+
+    def test_duplicate_of_failed_step_can_retry(self):
+        from users.services.idempotency import get_step_registry
+
+        # Another request owns the step and fails while this one waits on it.
+        future, _ = get_step_registry().claim((self.interview_id, 0))
+        future.set_exception(RuntimeError('owner crashed'))
+        response = self.submit(0)
+        self.assertRedirects(response, reverse('interview_run'), fetch_redirect_response=False)
+        self.assertEqual(self.client.session['interview_answers'], [])
+
+    def test_concurrent_duplicate_waits_for_owner(self):
+        from users.services.idempotency import StepRegistry
+
+        steps = StepRegistry()
+        future, owner = steps.claim(('abc', 0))
+        duplicate, duplicate_owner = steps.claim(('abc', 0))
+        self.assertTrue(owner)
+        self.assertFalse(duplicate_owner)
+        future.set_result('/interview-run/')
+        self.assertEqual(duplicate.result(), '/interview-run/')
+
+        # A step whose processing failed can be retried for real.
+        failed, _ = steps.claim(('abc', 1))
+        steps.fail(('abc', 1), ValueError())
+        self.assertIsInstance(failed.exception(), ValueError)
+        _, owner = steps.claim(('abc', 1))
+        self.assertTrue(owner)
+
+
+@mock.patch('users.views.get_mistral_service', side_effect=RuntimeError('model unavailable'))
+class BatchAPITests(TestCase):
+    start = {'name': 'Ada', 'role': 'Developer', 'experience': 'Mid', 'interview_type': 'technical'}
+    feedback = {'role': 'Developer', 'interview_type': 'technical',
+                'questions': ['Describe a system you designed.'],
+                'candidate_answers': ['I designed a billing system with queues and retries.']}
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()  # Rate-limit buckets
+
+    def test_start_batch_reports_items_together(self, service):
+        items = [self.start, {**self.start, 'experience': 'Guru'}, {**self.start, 'name': 'Grace'}]
+        response = self.client.post(reverse('interview_start_batch'), items, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([r['success'] for r in results], [True, False, True])
+        self.assertIn('experience', results[1]['errors'])
+        self.assertEqual(results[2]['data']['candidate_name'], 'Grace')
+        self.assertEqual(len(results[0]['data']['questions']), 5)
+        # Identical specs are generated once, in a single dispatch.
+        self.assertEqual(service.call_count, 1)
+
+    def test_feedback_batch(self, service):
+        items = [self.feedback, {**self.feedback, 'questions': 'not a list'}]
+        response = self.client.post(reverse('interview_feedback_batch'), items, content_type='application/json')
+        results = response.json()['results']
+        self.assertTrue(results[0]['success'])
+        self.assertIn('overall_score', results[0]['data'])
+        self.assertFalse(results[1]['success'])
+
+    def test_batch_must_be_a_bounded_list(self, service):
+        url = reverse('interview_start_batch')
+        self.assertEqual(self.client.post(url, self.start, content_type='application/json').status_code, 400)
+        too_many = [self.start] * 101
+        self.assertEqual(self.client.post(url, too_many, content_type='application/json').status_code, 400)
+
+    def test_single_feedback_endpoint_matches_payload(self, service):
+        response = self.client.post(reverse('interview_feedback'), self.feedback, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['questions']), 1)
+
+
+class QuestionImportTests(TestCase):
+    def setUp(self):
+        from users.services.question_bank import reload_question_bank
+        # The bank is process-wide; drop this test's questions from it afterwards.
+        self.addCleanup(reload_question_bank)
+
+    def write(self, directory, name, content):
+        path = f'{directory}/{name}'
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write(content)
+        return path
+
+    def test_command_dedupes_and_reloads_bank(self):
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        from users.models import Question
+        from users.services.question_bank import question_templates
+
+        csv_rows = (
+            'text,level,interview_type\n'
+            'How do you design an idempotent {role} API?,senior,technical\n'
+            'how do you  design an idempotent {role} API? ,5,technical\n'
+            'Describe a time you disagreed with your manager.,mid,behavioral\n'
+            ',mid,behavioral\n'
+            'Explain caching.,principal,technical\n'
+        )
+        jsonl_rows = (
+            '{"text": "Describe a time you disagreed with your manager.", "level": "mid", "interview_type": "behavioral"}\n'
+            '{"text": "What is a race condition?", "level": "junior", "interview_type": "technical"}\n'
+            'not json\n'
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            out, err = StringIO(), StringIO()
+            call_command('import_questions', self.write(directory, 'bank.csv', csv_rows),
+                         '--batch-size', '2', stdout=out, stderr=err)
+            self.assertIn('2 imported, 1 duplicates skipped, 2 invalid', out.getvalue())
+            self.assertIn("unknown level 'principal'", err.getvalue())
+            out = StringIO()
+            call_command('import_questions', self.write(directory, 'more.jsonl', jsonl_rows),
+                         stdout=out, stderr=StringIO())
+            self.assertIn('1 imported, 1 duplicates skipped, 1 invalid', out.getvalue())
+
+        self.assertEqual(Question.objects.count(), 3)
+        self.assertIn('How do you design an idempotent {role} API?', question_templates('senior', 'technical'))
+        self.assertIn('What is a race condition?', question_templates('fresher', 'technical'))
+
+    def test_rows_skipped_by_the_insert_are_not_counted(self):
+        from io import StringIO
+        from users.models import Question
+        from users.services.question_import import import_questions
+
+        bulk_create = Question.objects.bulk_create
+
+        def conflicting_bulk_create(objs, **kwargs):
+            # As when a concurrent import stored the first row: ignore_conflicts drops it silently.
+            return bulk_create(objs[1:], **kwargs)
+
+        rows = '{"text": "What is a deadlock?", "level": "mid", "interview_type": "technical"}\n' \
+               '{"text": "What is a livelock?", "level": "mid", "interview_type": "technical"}\n'
+        with mock.patch.object(Question.objects, 'bulk_create', side_effect=conflicting_bulk_create):
+            report = import_questions(StringIO(rows), 'jsonl')
+        self.assertEqual((report.created, report.duplicates), (1, 1))
+        self.assertEqual(Question.objects.count(), 1)
+
+    def test_fallback_interviews_sample_grown_groups(self):
+        from users.models import Question
+        from users.services.question_bank import question_hash, reload_question_bank
+        from users.views import generate_fallback_questions
+
+        Question.objects.bulk_create([
+            Question(text=f'Extra question {i} for a {{role}}?', text_hash=question_hash(f'extra {i}'),
+                     level='mid', interview_type='technical')
+            for i in range(20)
+        ])
+        reload_question_bank()
+        questions = generate_fallback_questions('Data Engineer', 3, 'technical')
+        self.assertEqual(len(questions), 5)
+        self.assertTrue(all('{role}' not in q for q in questions))
+
+    def test_admin_upload(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from users.models import Question
+
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        upload = SimpleUploadedFile('bank.jsonl', b'{"text": "What is a deadlock?", "level": "mid"}\n')
+        response = self.client.post(reverse('admin:users_question_import'), {'file': upload})
+        self.assertRedirects(response, reverse('admin:users_question_changelist'))
+        self.assertEqual(Question.objects.get().interview_type, 'mixed')
+        bad = SimpleUploadedFile('bank.xlsx', b'PK')
+        response = self.client.post(reverse('admin:users_question_import'), {'file': bad})
+        self.assertContains(response, 'Unsupported file type')
+
+    def test_admin_add_rejects_duplicate(self):
+        from users.models import Question
+
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        data = {'text': 'What is a deadlock?', 'level': 'mid', 'interview_type': 'technical'}
+        response = self.client.post(reverse('admin:users_question_add'), data)
+        self.assertRedirects(response, reverse('admin:users_question_changelist'))
+        response = self.client.post(reverse('admin:users_question_add'), {**data, 'text': ' what is a DEADLOCK? '})
+        self.assertContains(response, 'already in the bank')
+        self.assertEqual(Question.objects.count(), 1)
+
+
+class RateLimitTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_token_bucket_refills(self):
+        from users.services.rate_limit import TokenBucketLimiter
+
+        limiter = TokenBucketLimiter('test', '2/min')
+        self.assertEqual(limiter.consume('ip:1', now=0), 0)
+        self.assertEqual(limiter.consume('ip:1', now=0), 0)
+        self.assertAlmostEqual(limiter.consume('ip:1', now=0), 30)
+        self.assertAlmostEqual(limiter.consume('ip:1', now=20), 10)
+        self.assertEqual(limiter.consume('ip:1', now=30), 0)
+        self.assertEqual(limiter.consume('ip:2', now=30), 0)
+
+    @override_settings(RATE_LIMITS={'stats': '2/min', 'inference_api': '1/min'})
+    def test_views_answer_429_with_retry_after(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse('stats')).status_code, 200)
+        response = self.client.get(reverse('stats'))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+
+        payload = {'role': 'Developer', 'interview_type': 'technical', 'questions': ['Q?'], 'candidate_answers': ['A.']}
+        with mock.patch('users.views.get_mistral_service', side_effect=RuntimeError):
+            self.client.post(reverse('interview_feedback'), payload, content_type='application/json')
+        response = self.client.post(reverse('interview_feedback'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+
+    @override_settings(RATE_LIMITS={'inference_api': '3/min'})
+    def test_batches_are_charged_per_item(self):
+        payload = {'name': 'Ada', 'role': 'Developer', 'experience': 'Mid', 'interview_type': 'technical'}
+        url = reverse('interview_start_batch')
+        with mock.patch('users.views.get_mistral_service', side_effect=RuntimeError):
+            # Larger than a full bucket: rejected, not admitted for fewer tokens.
+            response = self.client.post(url, [payload] * 4, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(self.client.post(url, [payload] * 2, content_type='application/json').status_code, 200)
+            response = self.client.post(url, [payload] * 2, content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(INFERENCE_RETRY_AFTER=7)
+    def test_full_inference_pool_sheds_load(self):
+        from users.services.inference import InferenceBusy
+
+        payload = {'name': 'Ada', 'role': 'Developer', 'experience': 'Mid', 'interview_type': 'technical'}
+        with mock.patch('users.services.inference.admit', side_effect=InferenceBusy(7)):
+            response = self.client.post(reverse('interview_start'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '7')
+
+
+@override_settings(ANSWER_RELEVANCE_ENABLED=False, INFERENCE_RETRY_AFTER=7)
+class BusyTranscriptionTests(InterviewFlowMixin, TestCase):
+    def test_busy_transcription_keeps_the_step(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        from users.services.inference import InferenceBusy
+
+        self.client.force_login(User.objects.create_user(username='busy@example.com', password='pw'))
+        self.start_interview(mode='voice')
+        clip = SimpleUploadedFile('answer.webm', b'audio', content_type='audio/webm')
+        with mock.patch('users.services.inference.admit', side_effect=InferenceBusy(7)):
+            response = self.client.post(reverse('interview_run'), {'answer': '', 'question_idx': 0, 'audio_file': clip})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '7')
+        self.assertContains(response, 'Transcription is busy', status_code=429)
+        session = self.client.session
+        self.assertEqual(session['current_question_idx'], 0)
+        self.assertEqual(session['voice_transcripts'], [])
+        self.assertEqual(session['interview_answers'], [])
+
+    def test_resubmit_after_busy_reuses_the_recording(self):
+        import base64
+
+        from users.services.inference import InferenceBusy
+
+        self.client.force_login(User.objects.create_user(username='busy@example.com', password='pw'))
+        self.start_interview(mode='voice')
+        blob = 'data:audio/webm;base64,' + base64.b64encode(b'spoken answer').decode()
+        with mock.patch('users.services.inference.admit', side_effect=InferenceBusy(3)):
+            response = self.client.post(reverse('interview_run'), {'answer': '', 'question_idx': 0, 'audio_blob': blob})
+        self.assertEqual(response.status_code, 429)
+
+        spoken = {'text': 'I built the billing service.', 'segments': [], 'duration': 2.0}
+        with mock.patch('users.views.transcribe', return_value=spoken) as transcribe:
+            self.client.post(reverse('interview_run'), {'answer': '', 'question_idx': 0})
+        transcribe.assert_called_once_with(b'spoken answer')
+        session = self.client.session
+        self.assertEqual(session['current_question_idx'], 1)
+        self.assertEqual(session['voice_transcripts'], ['I built the billing service.'])
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()  # Rate-limit buckets
+
+    @staticmethod
+    def sample(text, prefix):
+        for line in text.splitlines():
+            if line.startswith(prefix):
+                return float(line.rsplit(' ', 1)[1])
+        return None
+
+    def test_span_and_histogram_rendering(self):
+        from users.services.metrics import Histogram, span, timed
+
+        histogram = Histogram('demo_seconds', 'Demo.', ('kind',), buckets=(0.1, 1))
+        histogram.observe(0.05, 'a')
+        histogram.observe(0.5, 'a')
+        lines = list(histogram.samples())
+        self.assertIn(('demo_seconds_bucket', '{kind="a",le="0.1"}', 1), lines)
+        self.assertIn(('demo_seconds_bucket', '{kind="a",le="+Inf"}', 2), lines)
+        self.assertIn(('demo_seconds_count', '{kind="a"}', 2), lines)
+
+        @timed('tests.decorated')
+        def work():
+            return 42
+
+        self.assertEqual(work(), 42)
+        with self.assertRaises(ValueError), span('tests.failing'):
+            raise ValueError
+        self.client.force_login(User.objects.create_user(username='staff@example.com', password='pw', is_staff=True))
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertGreaterEqual(self.sample(body, 'span_duration_seconds_count{span="tests.decorated"}'), 1)
+        self.assertGreaterEqual(self.sample(body, 'span_errors_total{span="tests.failing"}'), 1)
+        self.assertIn('# TYPE span_errors_total counter', body)
+
+    def test_requests_are_timed_with_their_queries(self):
+        staff = User.objects.create_user(username='staff@example.com', password='pw', is_staff=True)
+        self.client.get(reverse('stats'))
+        self.client.force_login(staff)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        body = response.content.decode()
+        self.assertGreaterEqual(
+            self.sample(body, 'http_request_duration_seconds_count{view="stats",method="GET",status="200"}'), 1)
+        # stats_view runs three count queries.
+        self.assertGreaterEqual(self.sample(body, 'http_request_db_queries_sum{view="stats"}'), 3)
+
+    @override_settings(METRICS_TOKEN='scrape-me')
+    def test_staff_or_token_only(self):
+        self.client.force_login(User.objects.create_user(username='cand@example.com', password='pw'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-me')
+        self.assertEqual(response.status_code, 200)
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        import tempfile
+        from django.core.cache import cache
+
+        cache.clear()  # Rate-limit buckets
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def profiles(self):
+        import os
+        return sorted(os.listdir(self.directory))
+
+    def test_disabled_by_default(self):
+        with override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_DIR=self.directory):
+            self.client.get(reverse('stats'))
+        self.assertEqual(self.profiles(), [])
+
+    def test_sampled_requests_rotate(self):
+        with override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1.0, PROFILING_VIEWS=['stats'],
+                               PROFILING_DIR=self.directory, PROFILING_MAX_FILES=2):
+            for _ in range(3):
+                self.client.get(reverse('stats'))
+            self.client.get(reverse('faq'))
+        profiles = self.profiles()
+        self.assertEqual(len(profiles), 2)
+        self.assertRegex(profiles[0], r'-stats-GET-\d+ms-sampled\.folded$')
+
+    def test_slow_requests_with_cprofile_and_staff_page(self):
+        import pstats
+
+        with override_settings(PROFILING_ENABLED=True, PROFILING_MODE='cprofile', PROFILING_SLOW_SECONDS=0.0,
+                               PROFILING_VIEWS=[], PROFILING_DIR=self.directory):
+            self.client.get(reverse('stats'))
+            [name] = self.profiles()
+            self.assertTrue(name.endswith('-slow.prof'))
+            pstats.Stats(f'{self.directory}/{name}')
+
+            self.client.force_login(User.objects.create_user(username='cand@example.com', password='pw'))
+            self.assertEqual(self.client.get(reverse('request_profiles')).status_code, 302)
+            self.client.force_login(User.objects.create_user(username='staff@example.com', password='pw', is_staff=True))
+            self.assertContains(self.client.get(reverse('request_profiles')), name)
+            download = self.client.get(reverse('request_profile_download', args=[name]))
+            self.assertEqual(download.status_code, 200)
+            download.close()
+            self.assertEqual(self.client.get(reverse('request_profile_download', args=['..'])).status_code, 404)
+
+    def test_async_views_are_sampled_not_cprofiled(self):
+        from users.services.profiling import start_capture
+
+        with override_settings(PROFILING_MODE='cprofile', PROFILING_SAMPLE_RATE=1.0, PROFILING_VIEWS=[],
+                               PROFILING_DIR=self.directory):
+            capture = start_capture('interview_run', is_async=True)
+            self.assertEqual(capture.mode, 'sample')
+            self.assertTrue(capture.finish('interview_run', 'GET', 0.01).endswith('.folded'))
+
+    def test_sampler_keeps_only_the_request_and_lent_threads(self):
+        import sys
+        import threading
+        import time
+        from users.services.profiling import StackSampler
+
+        stop, anchored = threading.Event(), threading.Event()
+        frames = {}
+
+        def spin():
+            while not stop.is_set():
+                sum(range(1000))
+
+        def handle_request():
+            frames['anchor'] = sys._getframe()
+            anchored.set()
+            spin()
+
+        def other_request():
+            spin()
+
+        def lent_worker():
+            spin()
+
+        threads = [threading.Thread(target=f) for f in (handle_request, other_request, lent_worker)]
+        for thread in threads:
+            thread.start()
+        anchored.wait()
+        sampler = StackSampler(0.001, frames['anchor'])
+        sampler.attach(threads[2].ident)
+        sampler.start()
+        time.sleep(0.2)
+        sampler.stop()
+        stop.set()
+        for thread in threads:
+            thread.join()
+        stacks = ' '.join(sampler.samples)
+        self.assertIn('handle_request', stacks)
+        self.assertIn('lent_worker', stacks)
+        self.assertNotIn('other_request', stacks)
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import home, login_view, signup_view, logout_view, dashboard, faq, testimonial, profile_view, profile_edit, mock_interview_view, interview_run_view, results_view, stats_view, feature_mock_interviews, feature_feedback, feature_tips, result_detail_view, download_interview_media, upload_question_clip, InterviewStartAPIView, InterviewFeedbackAPIView
+from .views import home, login_view, signup_view, logout_view, dashboard, faq, testimonial, profile_view, profile_edit, mock_interview_view, interview_run_view, results_view, stats_view, metrics_view, feature_mock_interviews, feature_feedback, feature_tips, result_detail_view, result_events, download_interview_media, upload_question_clip, upload_webcam_frame, interview_events, InterviewStartAPIView, InterviewFeedbackAPIView, InterviewStartBatchAPIView, InterviewFeedbackBatchAPIView
 
 urlpatterns = [
     path('', home, name='home'),
@@ -14,13 +14,19 @@ urlpatterns = [
     path('mock-interview/', mock_interview_view, name='mock_interview'),
     path('interview-run/', interview_run_view, name='interview_run'),
     path('interview-run/upload-clip/', upload_question_clip, name='upload_question_clip'),
+    path('interview-run/upload-frame/', upload_webcam_frame, name='upload_webcam_frame'),
+    path('interview-run/<str:interview_id>/events/', interview_events, name='interview_events'),
     path('results/', results_view, name='results'),
     path('results/<int:pk>/', result_detail_view, name='result_detail'),
+    path('results/<int:pk>/events/', result_events, name='result_events'),
 
     path('stats/', stats_view, name='stats'),
+    path('metrics/', metrics_view, name='metrics'),
     path('features/mock-interviews/', feature_mock_interviews, name='feature_mock_interviews'),
     path('features/feedback/', feature_feedback, name='feature_feedback'),
     path('features/tips/', feature_tips, name='feature_tips'),
     path('api/interview-start/', InterviewStartAPIView.as_view(), name='interview_start'),
     path('api/interview-feedback/', InterviewFeedbackAPIView.as_view(), name='interview_feedback'),
+    path('api/interview-start/batch/', InterviewStartBatchAPIView.as_view(), name='interview_start_batch'),
+    path('api/interview-feedback/batch/', InterviewFeedbackBatchAPIView.as_view(), name='interview_feedback_batch'),
 ]
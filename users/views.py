@@ -1,23 +1,49 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import Http404, FileResponse, JsonResponse
+from django.urls import reverse
+from django.http import Http404, FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
 from django.contrib.auth.models import User
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
 from django.conf import settings
-from rest_framework.views import APIView
+from django.db.models import Sum
+from asgiref.sync import sync_to_async
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Profile
+from .async_api import AsyncAPIView
+from .models import InterviewFrameBatch, Profile
 from .serializers_clean import (
     InterviewStartSerializer,
     InterviewStartResponseSerializer,
     InterviewFeedbackSerializer,
-    InterviewFeedbackResponseSerializer
+    AIFeedbackSerializer
 )
 from .services.mistral_service import get_mistral_service
-import json
+from .services.scoring_service import score_interview
+from .services.transcription_service import delivery_metrics, transcribe
+from .services.question_bank import experience_level, interview_templates
+from .services.feedback_jobs import queue_feedback, result_channel
+from .services.idempotency import get_step_registry
+from .services.inference import InferenceBusy, get_clip_jobs, run_inference
+from .services.rate_limit import (
+    InferenceAPIThrottle, InferenceBatchThrottle, rate_limit, retry_after_seconds, too_many_requests,
+)
+from .services.events import event_stream, get_event_broker, interview_channel
+from .services.frame_service import (
+    FrameError,
+    MAX_FRAMES_PER_INTERVIEW,
+    analyze_frames,
+    decode_frames,
+    decode_thumb,
+    encode_thumb,
+    summarize as summarize_frames
+)
+import asyncio
 import base64
+import hashlib
+import hmac
+import uuid
 
 def home(request):
     context = {}
@@ -183,7 +209,15 @@ def mock_interview_view(request):
         request.session['current_question_idx'] = 0
         request.session['interview_answers'] = []
         request.session['voice_transcripts'] = []
-        request.session['interaction_feedbacks'] = []
+        request.session['voice_metrics'] = []
+        request.session.pop('completed_interview_id', None)
+        # Leftovers of an abandoned interview must not leak into this one.
+        abandoned = request.session.get('interview_data', {}).get('interview_id')
+        if abandoned:
+            InterviewFrameBatch.objects.filter(interview_id=abandoned).delete()
+        for key in ('interaction_feedbacks', 'last_frame_thumb', 'step_outcomes', 'question_audios',
+                    'question_transcripts', 'question_audio_clips'):
+            request.session.pop(key, None)
         request.session['interview_data'] = {
             'name': name,
             'role': role,
@@ -191,30 +225,31 @@ def mock_interview_view(request):
             'interview_type': interview_type,
             'mode': mode,
             'webcam_enabled': webcam_enabled,
-            'pure_voice': mode == 'voice'
+            'pure_voice': mode == 'voice',
+            'interview_id': uuid.uuid4().hex
         }
         return redirect('interview_run')
 
     return redirect('dashboard')
 
 @login_required
-def interview_run_view(request):
+async def interview_run_view(request):
     from feedback.models import InterviewResult
 
-    questions = request.session.get('interview_questions', [])
+    # Load the session through the async API; later reads are served from memory.
+    questions = await request.session.aget('interview_questions', [])
     idx = request.session.get('current_question_idx', 0)
     answers = request.session.get('interview_answers', [])
     interview_data = request.session.get('interview_data', {})
-    mode = interview_data.get('mode', 'text')
-    webcam_enabled = interview_data.get('webcam_enabled', False)
-    question_audios = request.session.get('question_audios', {})
-
-    # Map experience levels to numeric values
-    experience_mapping = {
-        "Junior": 1,
-        "Mid": 3,
-        "Senior": 5
-    }
+    interview_id = interview_data.get('interview_id')
+
+    # A retried final submit arrives after the session was cleared
+    completed_id = request.session.get('completed_interview_id')
+    if request.method == 'POST' and not interview_data and completed_id \
+            and request.POST.get('interview_id') == completed_id:
+        result = await InterviewResult.objects.filter(interview_id=completed_id).only('pk').afirst()
+        if result:
+            return redirect('result_detail', pk=result.pk)
 
     # Check if interview data exists
     if not interview_data or not questions:
@@ -222,145 +257,194 @@ def interview_run_view(request):
         return redirect('dashboard')
 
     if request.method == 'POST':
-        result_id = request.POST.get('result_id', '')
-        audio_blob = request.POST.get('audio_blob', '')
-        uploaded_files = request.FILES if hasattr(request, 'FILES') else {}
-        uploaded_main_audio = uploaded_files.get('audio_file') if uploaded_files else None
-        webcam_frames = request.POST.get('webcam_frames', '[]')
-        answer = request.POST.get('answer', '')
-        voice_transcripts = request.session.get('voice_transcripts', [])
-        interaction_feedbacks = request.session.get('interaction_feedbacks', [])
-
-        # Convert experience to numeric value
-        experience_str = interview_data.get('experience', '0')
-        experience = experience_mapping.get(experience_str, 0)
+        # Each step is keyed by (interview id, question index): a retried or
+        # double-clicked submission gets the original outcome and redoes nothing.
+        step_idx = _posted_step(request, idx)
+        outcome = request.session.get('step_outcomes', {}).get(f'{interview_id}:{step_idx}')
+        if outcome:
+            return redirect(outcome)
+        if step_idx != idx:
+            return redirect('interview_run')
+
+        steps = get_step_registry()
+        token = (interview_id, step_idx)
+        future, owner = steps.claim(token)
+        if not owner:
+            try:
+                return redirect(await asyncio.wrap_future(future))
+            except Exception:
+                # The request doing the step failed; let the client retry it.
+                return redirect('interview_run')
+        try:
+            outcome = await _submit_step(request, interview_data, questions, idx, answers)
+        except InferenceBusy as e:
+            # Shed the load without moving on, so the spoken answer is not lost.
+            steps.fail(token, e)
+            response = await _question_page(
+                request, questions, idx, answers, interview_data, status=429,
+                busy_message='Transcription is busy right now. Your recording was kept; please submit again in a few seconds.',
+            )
+            response['Retry-After'] = str(retry_after_seconds(e.retry_after))
+            return response
+        except BaseException as e:
+            steps.fail(token, e)
+            raise
+        future.set_result(outcome)
+        return redirect(outcome)
+
+    return await _question_page(request, questions, idx, answers, interview_data)
+
+async def _question_page(request, questions, idx, answers, interview_data, status=200, **extra):
+    # Rendering may touch request.user and other sync-only lazy objects.
+    return await sync_to_async(render)(request, 'interview_run.html', {
+        'questions': questions,
+        'question': questions[idx] if idx < len(questions) else None,
+        'answers': answers,
+        'mode': interview_data.get('mode', 'text'),
+        'webcam_enabled': interview_data.get('webcam_enabled', False),
+        'total': len(questions),
+        'current_idx': idx,
+        'interview_data': interview_data,
+        **extra,
+    }, status=status)
 
-        # Capture per-question audio
-        if audio_blob and idx < len(questions):
-            question_audios[str(idx)] = audio_blob
-            request.session['question_audios'] = question_audios
+def _posted_step(request, current_idx):
+    """Question index the client was answering; older pages do not send one."""
+    try:
+        return int(request.POST['question_idx'])
+    except (KeyError, ValueError):
+        return current_idx
 
-        # Transcribe audio if provided
-        transcript = ""
-        if audio_blob or uploaded_main_audio:
-            try:
-                if uploaded_main_audio:
-                    audio_bytes = uploaded_main_audio.read()
-                else:
-                    audio_bytes = base64.b64decode(audio_blob.split(',')[1])
+async def _submit_step(request, interview_data, questions, idx, answers):
+    """Record the answer to question ``idx``; returns the URL to go to next."""
+    from feedback.models import InterviewResult
 
-                # Try Whisper first
-                try:
-                    import whisper
-                    import tempfile, os
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as tf:
-                        tf.write(audio_bytes)
-                        temp_name = tf.name
-                    try:
-                        model = whisper.load_model('base')
-                        wres = model.transcribe(temp_name)
-                        transcript = (wres.get('text') or '').strip()
-                    finally:
-                        try:
-                            os.remove(temp_name)
-                        except OSError:
-                            pass
-                except Exception as e:
-                    print(f"Whisper transcription failed: {e}")
-                    transcript = "[Audio transcription failed]"
+    mode = interview_data.get('mode', 'text')
+    webcam_enabled = interview_data.get('webcam_enabled', False)
+    interview_id = interview_data.get('interview_id')
+    question_audios = request.session.get('question_audios', {})
 
-            except Exception as e:
-                print(f"Audio transcription error: {e}")
-                transcript = "[Audio transcription failed]"
+    # Map experience levels to numeric values
+    experience_mapping = {
+        "Junior": 1,
+        "Mid": 3,
+        "Senior": 5
+    }
 
-        # Store the transcript and answer
-        if idx < len(questions):
-            voice_transcripts.append(transcript)
-            answers.append(answer)
-            request.session['voice_transcripts'] = voice_transcripts
-            request.session['interview_answers'] = answers
-
-        # Check if this is the final submission
-        if result_id == 'final_submit' or idx + 1 >= len(questions):
-            # Generate AI feedback
-            questions_answers = []
-            for i, q in enumerate(questions):
-                ans = answers[i] if i < len(answers) else ""
-                trans = voice_transcripts[i] if i < len(voice_transcripts) else ""
-                final_answer = trans if trans and trans != "[Audio transcription failed]" else ans
-                questions_answers.append({
-                    'question': q,
-                    'answer': final_answer
-                })
+    result_id = request.POST.get('result_id', '')
+    audio_blob = request.POST.get('audio_blob', '')
+    uploaded_files = request.FILES if hasattr(request, 'FILES') else {}
+    uploaded_main_audio = uploaded_files.get('audio_file') if uploaded_files else None
+    answer = request.POST.get('answer', '')
+    voice_transcripts = request.session.get('voice_transcripts', [])
+    voice_metrics = request.session.get('voice_metrics', [])
+
+    # Convert experience to numeric value
+    experience_str = interview_data.get('experience', '0')
+    experience = experience_mapping.get(experience_str, 0)
+
+    # Capture per-question audio
+    if audio_blob and idx < len(questions):
+        question_audios[str(idx)] = audio_blob
+        request.session['question_audios'] = question_audios
+    elif not uploaded_main_audio:
+        # Resubmitting after a busy (429) page sends no recording; use the one kept then.
+        audio_blob = question_audios.get(str(idx), '')
+
+    # Reuse the background transcription of this question's clip (waiting
+    # for it if it is still running); only transcribe here if there was none
+    transcript = ""
+    metrics = None
+    clip = await _clip_result(interview_id, idx)
+    if clip:
+        transcript, metrics = clip['text'], clip['delivery']
+    elif audio_blob or uploaded_main_audio:
+        try:
+            if uploaded_main_audio:
+                audio_bytes = uploaded_main_audio.read()
+            else:
+                audio_bytes = base64.b64decode(audio_blob.split(',')[1])
 
+            # Try Whisper first; its segment timings feed the delivery metrics
             try:
-                # Use static feedback instead of AI generation
-                feedback_data = {
-                    "overall_score": 75,
-                    "grade_label": "B",
-                    "summary": "Interview completed successfully. You demonstrated good communication skills and provided thoughtful responses.",
-                    "strengths": ["Clear communication", "Relevant examples provided", "Good problem-solving approach"],
-                    "weaknesses": ["Could elaborate more on technical details", "Some responses could be more concise"],
-                    "suggestions": ["Practice explaining technical concepts in simpler terms", "Focus on quantifying achievements"],
-                    "questions": questions_answers
-                }
-                ai_feedback_json = json.dumps(feedback_data)
+                spoken = await run_inference(transcribe, audio_bytes)
+                transcript = spoken['text']
+                metrics = delivery_metrics(spoken['segments'], spoken['duration'])
+            except InferenceBusy:
+                raise
             except Exception as e:
-                print(f"Error generating feedback: {e}")
-                feedback_data = {
-                    "overall_score": 70,
-                    "grade_label": "C",
-                    "summary": "Feedback generation encountered an error. Please review your responses manually.",
-                    "strengths": ["Completed the interview"],
-                    "weaknesses": ["Technical issues during feedback generation"],
-                    "suggestions": ["Retry the interview if possible"],
-                    "questions": []
-                }
-                ai_feedback_json = json.dumps(feedback_data)
-
-            # Save InterviewResult
-            result = InterviewResult.objects.create(
-                user=request.user,
-                name=interview_data.get('name', ''),
-                role=interview_data.get('role', ''),
-                experience=experience,
-                interview_type=interview_data.get('interview_type', 'mixed'),
-                mode=mode,
-                webcam_enabled=webcam_enabled,
-                questions=questions,
-                answers=answers,
-                voice_transcripts=voice_transcripts,
-                ai_feedback=ai_feedback_json,
-                overall_score=feedback_data.get('overall_score'),
-                grade_label=feedback_data.get('grade_label')
-            )
+                print(f"Whisper transcription failed: {e}")
+                transcript = "[Audio transcription failed]"
 
-            # Clear session data
-            keys_to_clear = [
-                'interview_questions', 'current_question_idx', 'interview_answers',
-                'voice_transcripts', 'interaction_feedbacks', 'interview_data',
-                'question_audios', 'question_transcripts', 'question_audio_clips'
-            ]
-            for key in keys_to_clear:
-                request.session.pop(key, None)
+        except InferenceBusy:
+            raise
+        except Exception as e:
+            print(f"Audio transcription error: {e}")
+            transcript = "[Audio transcription failed]"
+
+    # Store the transcript and answer
+    if idx < len(questions):
+        voice_transcripts.append(transcript)
+        voice_metrics.append(metrics)
+        answers.append(answer)
+        request.session['voice_transcripts'] = voice_transcripts
+        request.session['voice_metrics'] = voice_metrics
+        request.session['interview_answers'] = answers
+
+    # Check if this is the final submission
+    if result_id == 'final_submit' or idx + 1 >= len(questions):
+        delivery = [voice_metrics[i] if i < len(voice_metrics) else None for i in range(len(questions))]
+        frame_batches = InterviewFrameBatch.objects.filter(interview_id=interview_id)
+        interaction_feedbacks = [
+            metrics async for batch in frame_batches.order_by('pk').values_list('metrics', flat=True)
+            for metrics in batch
+        ]
+
+        # Save InterviewResult; feedback is generated in the background. The
+        # unique interview_id also stops a retry in another process saving twice.
+        result, created = await InterviewResult.objects.aget_or_create(interview_id=interview_id, defaults=dict(
+            user=await request.auser(),
+            name=interview_data.get('name', ''),
+            role=interview_data.get('role', ''),
+            experience=experience,
+            interview_type=interview_data.get('interview_type', 'mixed'),
+            mode=mode,
+            webcam_enabled=webcam_enabled,
+            questions=questions,
+            answers=answers,
+            voice_transcripts=voice_transcripts,
+            voice_metrics=delivery if any(delivery) else None,
+            interaction_feedback=summarize_frames(interaction_feedbacks),
+            feedback_status=InterviewResult.FEEDBACK_PENDING
+        ))
+        if created:
+            await sync_to_async(queue_feedback)(result.pk)
+        await frame_batches.adelete()
+
+        # Clear session data
+        keys_to_clear = [
+            'interview_questions', 'current_question_idx', 'interview_answers',
+            'voice_transcripts', 'voice_metrics', 'interaction_feedbacks', 'interview_data',
+            'question_audios', 'question_transcripts', 'question_audio_clips',
+            'last_frame_thumb', 'step_outcomes'
+        ]
+        for key in keys_to_clear:
+            request.session.pop(key, None)
+        # The event stream stays readable until the next interview starts.
+        request.session['completed_interview_id'] = interview_id
+        get_clip_jobs().discard(interview_id)
+        get_event_broker().publish(interview_channel(interview_id), 'interview_complete', {
+            'result_id': result.pk, 'url': reverse('result_detail', args=[result.pk]),
+        })
 
-            messages.success(request, 'Interview completed! View your feedback below.')
-            return redirect('result_detail', pk=result.pk)
+        messages.success(request, 'Interview completed! Your feedback is being prepared below.')
+        return reverse('result_detail', args=[result.pk])
 
-        # Move to the next question
-        request.session['current_question_idx'] = idx + 1
-        return redirect('interview_run')
-
-    return render(request, 'interview_run.html', {
-        'questions': questions,
-        'question': questions[idx] if idx < len(questions) else None,
-        'answers': answers,
-        'mode': mode,
-        'webcam_enabled': webcam_enabled,
-        'total': len(questions),
-        'current_idx': idx,
-        'interview_data': interview_data
-    })
+    # Move to the next question
+    request.session['current_question_idx'] = idx + 1
+    outcome = reverse('interview_run')
+    request.session.setdefault('step_outcomes', {})[f'{interview_id}:{idx}'] = outcome
+    return outcome
 
 @login_required
 def results_view(request):
@@ -372,7 +456,6 @@ def results_view(request):
 def result_detail_view(request, pk):
     """Show detailed feedback for a single InterviewResult."""
     from feedback.models import InterviewResult
-    import json
 
     try:
         result = InterviewResult.objects.get(pk=pk, user=request.user)
@@ -383,27 +466,85 @@ def result_detail_view(request, pk):
             messages.error(request, 'Requested feedback not found.')
             return redirect('results')
 
-    # Parse AI feedback JSON
-    feedback = None
-    if result.ai_feedback:
-        try:
-            feedback = json.loads(result.ai_feedback)
-        except json.JSONDecodeError:
-            feedback = {'error': 'Failed to parse feedback data'}
-
     context = {
         'result': result,
-        'feedback': feedback,
+        'feedback': result.ai_feedback or None,
+        'pending': result.feedback_status == InterviewResult.FEEDBACK_PENDING,
     }
+    # The page re-fetches just its body as deferred feedback arrives.
+    if request.GET.get('fragment'):
+        response = render(request, 'result_detail_body.html', context)
+        # Lets the page's poll know when to stop.
+        response['X-Feedback-Status'] = result.feedback_status
+        return response
     return render(request, 'result_detail.html', context)
 
+def _can_stream(request):
+    """Event streams need an ASGI server: under WSGI each would hold a worker thread."""
+    return isinstance(request, ASGIRequest)
+
+@login_required
+async def result_events(request, pk):
+    """Server-sent events announcing progress of a result's deferred feedback."""
+    from feedback.models import InterviewResult
+
+    user = await request.auser()
+    results = InterviewResult.objects.filter(pk=pk)
+    if not user.is_staff:
+        results = results.filter(user=user)
+    status = await results.values_list('feedback_status', flat=True).afirst()
+    if status is None:
+        return JsonResponse({'error': 'Not found'}, status=404)
+    if status != InterviewResult.FEEDBACK_PENDING or not _can_stream(request):
+        # Nothing left to announce (or no way to stream it; the page polls);
+        # 204 also stops EventSource reconnecting.
+        return HttpResponse(status=204)
+
+    response = StreamingHttpResponse(event_stream(result_channel(pk)), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+async def _clip_result(interview_id, question_idx):
+    """Result of the background transcription of a question's clip, if one ran."""
+    job = get_clip_jobs().get((interview_id, question_idx))
+    if job is None:
+        return None
+    try:
+        return await asyncio.wrap_future(job)
+    except Exception:
+        return None
+
+def _transcribe_clip(channel, question_idx, audio_bytes):
+    """Background job: transcribe one clip and announce the result."""
+    broker = get_event_broker()
+    try:
+        spoken = transcribe(audio_bytes)
+    except Exception as e:
+        print(f"Whisper transcription failed: {e}")
+        broker.publish(channel, 'transcription_failed', {'question_idx': question_idx})
+        raise
+    clip = {'text': spoken['text'], 'delivery': delivery_metrics(spoken['segments'], spoken['duration'])}
+    broker.publish(channel, 'transcript', {'question_idx': question_idx, **clip})
+    return clip
+
 @login_required
-def upload_question_clip(request):
-    """Accept per-question audio clip."""
+@rate_limit('clip_upload')
+async def upload_question_clip(request):
+    """Accept a per-question audio clip and transcribe it in the background.
+
+    Responds straight away; the transcript is pushed over the interview's
+    event stream and picked up again when the answer is submitted.
+    """
     if request.method != 'POST':
         return JsonResponse({'error': 'POST required'}, status=405)
 
     try:
+        interview_data = await request.session.aget('interview_data', {})
+        interview_id = interview_data.get('interview_id')
+        if not interview_id:
+            return JsonResponse({'error': 'No active interview'}, status=400)
+
         question_idx = int(request.POST.get('question_idx', -1))
         audio_file = request.FILES.get('audio_file')
 
@@ -421,46 +562,97 @@ def upload_question_clip(request):
             'filename': audio_file.name,
             'content_type': audio_file.content_type
         }
-
-        # Attempt transcription
-        transcript = "Audio received"
-        try:
-            import whisper
-            import tempfile, os
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as tf:
-                tf.write(audio_bytes)
-                temp_name = tf.name
-
-            try:
-                model = whisper.load_model('base')
-                result_whisper = model.transcribe(temp_name, language='en')
-                transcript = (result_whisper.get('text') or '').strip()
-            finally:
-                try:
-                    os.unlink(temp_name)
-                except:
-                    pass
-        except Exception as e:
-            print(f"Whisper transcription failed: {e}")
-            transcript = "Audio received but transcription failed."
-
-        # Store transcription in session
-        if 'question_transcripts' not in request.session:
-            request.session['question_transcripts'] = {}
-        request.session['question_transcripts'][str(question_idx)] = transcript
         request.session.modified = True
 
+        # A retried upload of the same clip reuses the job already queued for it
+        channel = interview_channel(interview_id)
+        job, created = get_clip_jobs().submit(
+            (interview_id, question_idx), _transcribe_clip, channel, question_idx, audio_bytes,
+            fingerprint=hashlib.sha256(audio_bytes).hexdigest(),
+            on_submit=lambda: get_event_broker().publish(
+                channel, 'transcription_queued', {'question_idx': question_idx}),
+        )
+
         return JsonResponse({
             'success': True,
             'question_idx': question_idx,
-            'transcript': transcript
-        })
+            'status': 'queued' if created else 'duplicate'
+        }, status=202)
 
+    except InferenceBusy as e:
+        return too_many_requests(e.retry_after, 'Transcription is busy. Please retry shortly.')
     except Exception as e:
         print(f"upload_question_clip error: {e}")
         return JsonResponse({'error': str(e)}, status=500)
 
+@login_required
+async def interview_events(request, interview_id):
+    """Server-sent events for one interview: transcripts and feedback readiness."""
+    interview_data = await request.session.aget('interview_data', {})
+    allowed = (interview_data.get('interview_id'), request.session.get('completed_interview_id'))
+    if interview_id not in allowed:
+        return JsonResponse({'error': 'Unknown interview'}, status=404)
+    if not _can_stream(request):
+        return HttpResponse(status=204)
+
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_event_id = 0
+    response = StreamingHttpResponse(
+        event_stream(interview_channel(interview_id), last_event_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx and similar proxies from buffering the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@login_required
+@rate_limit('frame_upload')
+async def upload_webcam_frame(request):
+    """Accept webcam JPEG frames as they are captured and keep only their metrics."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+    interview_data = await request.session.aget('interview_data')
+    if not interview_data:
+        return JsonResponse({'error': 'No active interview'}, status=400)
+
+    # Either a raw image/jpeg body (one frame) or multipart "frame" parts.
+    if request.content_type == 'image/jpeg':
+        payloads = [request.body]
+    else:
+        payloads = [f.read() for f in request.FILES.getlist('frame')]
+    if not payloads:
+        return JsonResponse({'error': 'No frame provided'}, status=400)
+
+    # Metrics go to their own rows, never the session: this request can overlap
+    # an answer submission, and saving a session loaded before it would undo it.
+    batches = InterviewFrameBatch.objects.filter(interview_id=interview_data.get('interview_id'))
+    received = (await batches.aaggregate(total=Sum('frame_count')))['total'] or 0
+    payloads = payloads[:max(MAX_FRAMES_PER_INTERVIEW - received, 0)]
+    previous = decode_thumb(await batches.order_by('-pk').values_list('last_thumb', flat=True).afirst())
+    try:
+        stack, batch = await run_inference(_analyze_upload, payloads, previous)
+    except FrameError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except InferenceBusy as e:
+        return too_many_requests(e.retry_after, 'Frame analysis is busy. Please retry shortly.')
+
+    question_idx = request.session.get('current_question_idx', 0)
+    for metrics in batch:
+        metrics['question_idx'] = question_idx
+    if batch:
+        await InterviewFrameBatch.objects.acreate(
+            interview_id=interview_data.get('interview_id'), metrics=batch, frame_count=len(batch),
+            last_thumb=encode_thumb(stack[-1]) if len(stack) else '',
+        )
+    return JsonResponse({'success': True, 'accepted': len(batch), 'total': received + len(batch)})
+
+def _analyze_upload(payloads, previous):
+    stack = decode_frames(payloads)
+    return stack, analyze_frames(stack, previous)
+
 @login_required
 def download_interview_media(request, pk, kind):
     """Protected media download."""
@@ -475,11 +667,26 @@ def download_interview_media(request, pk, kind):
         return FileResponse(result.video_frames_zip.open('rb'), as_attachment=True, filename=result.video_frames_zip.name.split('/')[-1])
     raise Http404()
 
+def metrics_view(request):
+    """Staff-only Prometheus metrics for this process.
+
+    Scrapers that cannot log in may send ``Authorization: Bearer <METRICS_TOKEN>``.
+    """
+    from .services.metrics import REGISTRY
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    authorized = request.user.is_authenticated and request.user.is_staff
+    if not authorized and token:
+        authorized = hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not authorized:
+        raise Http404()
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@rate_limit('stats')
 def stats_view(request):
     from feedback.models import InterviewResult
     total_users = User.objects.count()
     total_interviews = InterviewResult.objects.count()
-    total_feedbacks = InterviewResult.objects.exclude(ai_feedback='').count()
+    total_feedbacks = InterviewResult.objects.exclude(ai_feedback={}).count()
     return JsonResponse({
         'total_users': total_users,
         'total_interviews': total_interviews,
@@ -553,113 +760,30 @@ def generate_interview_questions(role, experience, interview_type):
         return generate_fallback_questions(role, experience, interview_type)
 
 
+def generate_interview_questions_batch(specs):
+    """Questions for each (role, experience, interview_type), generated in one pass.
+
+    Identical specs are generated once; any that come back short fall back to
+    the question bank, as in generate_interview_questions.
+    """
+    unique = list(dict.fromkeys(specs))
+    try:
+        generated = get_mistral_service().generate_questions_batch(unique)
+    except Exception as e:
+        print(f"Error generating questions: {e}")
+        generated = [[] for _ in unique]
+    by_spec = {
+        spec: questions if questions and len(questions) >= 5 else generate_fallback_questions(*spec)
+        for spec, questions in zip(unique, generated)
+    }
+    return [by_spec[spec] for spec in specs]
+
+
 def generate_fallback_questions(role, experience, interview_type):
     """Generate fallback questions based on role, experience, and type."""
-    
-    # Fresher/Junior level questions
-    fresher_technical = [
-        f"Can you explain the basic concepts of {role} that you've learned?",
-        "What programming languages are you familiar with and why?",
-        "Can you walk us through a simple project you've built?",
-        "How do you approach learning new technologies?",
-        "What are the fundamentals you consider important in this field?"
-    ]
-    
-    fresher_behavioral = [
-        "Tell us about yourself and your background.",
-        "What motivated you to pursue a career in {role}?",
-        "Describe a time when you learned something new quickly.",
-        "How do you handle feedback or criticism?",
-        "Why are you interested in this position?"
-    ]
-    
-    fresher_mixed = [
-        f"Can you tell us about your interest in becoming a {role}?",
-        "What are the key skills you've developed so far?",
-        "Describe a project or assignment you worked on in college/learning.",
-        "How do you approach problem-solving?",
-        "Where do you see yourself in your career in the next 2-3 years?"
-    ]
-    
-    # Mid-level questions
-    mid_technical = [
-        f"Can you explain your experience with {role}-related technologies?",
-        "Describe a challenging technical problem you've solved.",
-        "How do you stay updated with the latest developments in your field?",
-        "What tools and frameworks are you proficient in for this role?",
-        "How would you approach debugging a complex issue?"
-    ]
-    
-    mid_behavioral = [
-        "Tell me about a time you worked in a team to achieve a goal.",
-        "Describe a situation where you had to learn something new quickly.",
-        "How do you handle constructive criticism?",
-        "Give an example of how you've handled a difficult stakeholder.",
-        "What motivates you in your work?"
-    ]
-    
-    mid_mixed = [
-        f"What are your key strengths as a {role}?",
-        "Describe your experience level and how it aligns with this role.",
-        "How do you approach complex problem-solving in your work?",
-        "Tell me about a significant project you're proud of and why.",
-        "How do you balance technical depth with broader business understanding?"
-    ]
-    
-    # Senior-level questions
-    senior_technical = [
-        f"How have you architected solutions as a {role}?",
-        "Describe your approach to designing scalable systems.",
-        "How do you mentor junior developers in technical skills?",
-        "What's your philosophy on code quality and technical debt?",
-        "How do you stay ahead of industry trends and emerging technologies?"
-    ]
-    
-    senior_behavioral = [
-        "Tell me about your leadership experience and approach.",
-        "Describe a situation where you drove significant change.",
-        "How do you balance technical and people management?",
-        "Give an example of how you've influenced organization-wide decisions.",
-        "What's your approach to building and maintaining high-performing teams?"
-    ]
-    
-    senior_mixed = [
-        f"How have you grown as a {role} over your career?",
-        "Describe your approach to strategic technical decisions.",
-        "How do you contribute to company vision and strategy?",
-        "Tell me about your most significant impact on a project.",
-        "Where do you want to take your career in the next 5 years?"
-    ]
-    
-    # Determine experience level
-    if experience <= 1:
-        if interview_type == 'technical':
-            questions = fresher_technical
-        elif interview_type == 'behavioral':
-            questions = fresher_behavioral
-        else:  # mixed
-            questions = fresher_mixed
-    elif experience <= 3:
-        if interview_type == 'technical':
-            questions = mid_technical
-        elif interview_type == 'behavioral':
-            questions = mid_behavioral
-        else:  # mixed
-            questions = mid_mixed
-    else:  # Senior (experience > 3)
-        if interview_type == 'technical':
-            questions = senior_technical
-        elif interview_type == 'behavioral':
-            questions = senior_behavioral
-        else:  # mixed
-            questions = senior_mixed
-    
+    templates = interview_templates(experience_level(experience), interview_type)
     # Customize questions with role
-    customized_questions = []
-    for q in questions:
-        customized_questions.append(q.replace("{role}", role))
-    
-    return customized_questions
+    return [q.replace("{role}", role) for q in templates]
 
 
 def generate_ai_feedback(questions_answers, role, experience, interview_type):
@@ -668,31 +792,78 @@ def generate_ai_feedback(questions_answers, role, experience, interview_type):
         mistral_service = get_mistral_service()
         questions = [qa['question'] for qa in questions_answers]
         candidate_answers = [qa['answer'] for qa in questions_answers]
-        feedback = mistral_service.generate_feedback(role, interview_type, questions, candidate_answers)
-        return json.dumps(feedback)
+        return mistral_service.generate_feedback(role, interview_type, questions, candidate_answers)
     except Exception as e:
         print(f"Error generating feedback: {e}")
-        return json.dumps({
-            "overall_score": 70,
-            "grade_label": "C",
-            "summary": "Feedback generation failed.",
-            "strengths": [],
-            "weaknesses": [],
-            "suggestions": [],
-            "questions": []
-        })
+        return score_interview(
+            [qa['question'] for qa in questions_answers],
+            [qa['answer'] for qa in questions_answers]
+        )
+
 
+def generate_ai_feedback_batch(items):
+    """Feedback for each (questions_answers, role, experience, interview_type), in one pass."""
+    try:
+        return get_mistral_service().generate_feedback_batch([
+            (role, interview_type, [qa['question'] for qa in qas], [qa['answer'] for qa in qas])
+            for qas, role, experience, interview_type in items
+        ])
+    except Exception as e:
+        print(f"Error generating feedback: {e}")
+        return [
+            score_interview([qa['question'] for qa in qas], [qa['answer'] for qa in qas])
+            for qas, role, experience, interview_type in items
+        ]
+
+
+# Largest number of items accepted by the batch API endpoints.
+MAX_BATCH_SIZE = 100
+
+
+def validate_batch(serializer):
+    """Validate a ``many=True`` serializer item by item.
+
+    Returns ``(items, errors)``: the validated data (None for invalid items)
+    and each item's errors, or ``(None, None)`` if the payload itself is not
+    an acceptable list.
+    """
+    if serializer.is_valid():
+        return list(serializer.validated_data), [{} for _ in serializer.validated_data]
+    errors = serializer.errors
+    if not isinstance(errors, list):
+        return None, None
+    items = [
+        None if error else serializer.child.run_validation(data)
+        for data, error in zip(serializer.initial_data, errors)
+    ]
+    return items, errors
 
-class InterviewStartAPIView(APIView):
-    def post(self, request):
+
+def batch_response(items, errors, outputs):
+    """Pair each item with its output or errors, in request order."""
+    outputs = iter(outputs)
+    results = []
+    for item, error in zip(items, errors):
+        if item is None:
+            results.append({'success': False, 'errors': error})
+        else:
+            results.append({'success': True, 'data': next(outputs)})
+    return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+class InterviewStartAPIView(AsyncAPIView):
+    throttle_classes = [InferenceAPIThrottle]
+
+    async def post(self, request):
         serializer = InterviewStartSerializer(data=request.data)
         if serializer.is_valid():
             data = serializer.validated_data
-            questions = generate_interview_questions(
+            questions = await run_inference(
+                generate_interview_questions,
                 data['role'], data['experience'], data['interview_type']
             )
             response_serializer = InterviewStartResponseSerializer({
-                'candidate_name': 'Candidate',  # Placeholder
+                'candidate_name': data['name'],
                 'role': data['role'],
                 'experience': data['experience'],
                 'interview_type': data['interview_type'],
@@ -702,16 +873,72 @@ class InterviewStartAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class InterviewFeedbackAPIView(APIView):
-    def post(self, request):
+class InterviewFeedbackAPIView(AsyncAPIView):
+    throttle_classes = [InferenceAPIThrottle]
+
+    async def post(self, request):
         serializer = InterviewFeedbackSerializer(data=request.data)
         if serializer.is_valid():
             data = serializer.validated_data
-            feedback = generate_ai_feedback(
+            feedback_data = await run_inference(
+                generate_ai_feedback,
                 [{'question': q, 'answer': a} for q, a in zip(data['questions'], data['candidate_answers'])],
                 data['role'], 3, data['interview_type']  # Default experience
             )
-            feedback_data = json.loads(feedback)
-            response_serializer = InterviewFeedbackResponseSerializer(feedback_data)
+            response_serializer = AIFeedbackSerializer(feedback_data)
             return Response(response_serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class InterviewStartBatchAPIView(AsyncAPIView):
+    """Start many interviews in one request; questions are generated as one batch."""
+    throttle_classes = [InferenceBatchThrottle]
+    max_batch_size = MAX_BATCH_SIZE
+
+    async def post(self, request):
+        serializer = InterviewStartSerializer(
+            data=request.data, many=True, max_length=InferenceBatchThrottle.batch_limit(self),
+        )
+        items, errors = validate_batch(serializer)
+        if items is None:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        valid = [data for data in items if data is not None]
+        question_sets = await run_inference(
+            generate_interview_questions_batch,
+            [(data['role'], data['experience'], data['interview_type']) for data in valid]
+        )
+        outputs = [
+            InterviewStartResponseSerializer({
+                'candidate_name': data['name'],
+                'role': data['role'],
+                'experience': data['experience'],
+                'interview_type': data['interview_type'],
+                'questions': questions
+            }).data
+            for data, questions in zip(valid, question_sets)
+        ]
+        return batch_response(items, errors, outputs)
+
+
+class InterviewFeedbackBatchAPIView(AsyncAPIView):
+    """Feedback for many interviews in one request, generated as one batch."""
+    throttle_classes = [InferenceBatchThrottle]
+    max_batch_size = MAX_BATCH_SIZE
+
+    async def post(self, request):
+        serializer = InterviewFeedbackSerializer(
+            data=request.data, many=True, max_length=InferenceBatchThrottle.batch_limit(self),
+        )
+        items, errors = validate_batch(serializer)
+        if items is None:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        valid = [data for data in items if data is not None]
+        feedbacks = await run_inference(generate_ai_feedback_batch, [
+            (
+                [{'question': q, 'answer': a} for q, a in zip(data['questions'], data['candidate_answers'])],
+                data['role'], 3, data['interview_type']  # Default experience
+            )
+            for data in valid
+        ])
+        outputs = [AIFeedbackSerializer(feedback).data for feedback in feedbacks]
+        return batch_response(items, errors, outputs)